@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test for asset allocation.
+
+Fires 200 parallel POST /api/asset-allocations requests at a small pool of available
+assets and approved requisitions, then checks that no asset and no requisition was
+allocated more than once.
+
+Usage: python allocation_concurrency_stress_test.py [base_url] [attempts]
+"""
+
+import requests
+import sys
+import threading
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AllocationConcurrencyStressTest:
+    def __init__(self, base_url="http://localhost:8001", attempts=200, assets=10, requisitions=20):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.attempts = attempts
+        self.asset_count = assets
+        self.requisition_count = requisitions
+        self.headers = {}
+        self.asset_ids = []
+        self.requisition_ids = []
+
+    def login_admin(self):
+        """Login as administrator"""
+        print("🔐 Logging in as Administrator...")
+        response = requests.post(
+            f"{self.api_url}/auth/login",
+            json={"email": "admin@company.com", "password": "password123"},
+            timeout=10
+        )
+        if response.status_code != 200:
+            print(f"❌ Administrator login failed: {response.status_code}")
+            return False
+        self.headers = {'Authorization': f"Bearer {response.json()['session_token']}"}
+        print("✅ Administrator login successful")
+        return True
+
+    def setup_data(self):
+        """Create an asset type, available assets and approved requisitions for this run"""
+        run_id = uuid.uuid4().hex[:8]
+        print(f"\n🔍 Creating {self.asset_count} assets and {self.requisition_count} approved requisitions...")
+
+        response = requests.post(
+            f"{self.api_url}/asset-types",
+            json={"code": f"STRESS-{run_id}", "name": f"Stress Test Asset {run_id}", "depreciation_applicable": False},
+            headers=self.headers,
+            timeout=10
+        )
+        if response.status_code != 200:
+            print(f"❌ Asset type creation failed: {response.status_code} {response.text}")
+            return False
+        asset_type_id = response.json()["id"]
+
+        for i in range(self.asset_count):
+            response = requests.post(
+                f"{self.api_url}/asset-definitions",
+                json={
+                    "asset_type_id": asset_type_id,
+                    "asset_code": f"STRESS-{run_id}-{i}",
+                    "asset_description": "Stress test laptop",
+                    "asset_details": "Dell Latitude 5420",
+                    "asset_value": 50000
+                },
+                headers=self.headers,
+                timeout=10
+            )
+            if response.status_code != 200:
+                print(f"❌ Asset creation failed: {response.status_code} {response.text}")
+                return False
+            self.asset_ids.append(response.json()["id"])
+
+        for i in range(self.requisition_count):
+            response = requests.post(
+                f"{self.api_url}/asset-requisitions",
+                json={"asset_type_id": asset_type_id, "justification": f"Stress test requisition {i}"},
+                headers=self.headers,
+                timeout=10
+            )
+            if response.status_code != 200:
+                print(f"❌ Requisition creation failed: {response.status_code} {response.text}")
+                return False
+            requisition_id = response.json()["id"]
+            response = requests.post(
+                f"{self.api_url}/asset-requisitions/{requisition_id}/manager-action",
+                json={"action": "approve", "reason": "Stress test"},
+                headers=self.headers,
+                timeout=10
+            )
+            if response.status_code != 200:
+                print(f"❌ Requisition approval failed: {response.status_code} {response.text}")
+                return False
+            self.requisition_ids.append(requisition_id)
+
+        print("✅ Test data created")
+        return True
+
+    def run(self):
+        if not self.login_admin() or not self.setup_data():
+            return False
+
+        # Every asset and every requisition is contended by several attempts at once
+        pairs = [
+            (self.requisition_ids[i % self.requisition_count], self.asset_ids[i % self.asset_count])
+            for i in range(self.attempts)
+        ]
+        barrier = threading.Barrier(self.attempts)
+
+        def attempt(pair):
+            requisition_id, asset_id = pair
+            session = requests.Session()
+            barrier.wait()
+            response = session.post(
+                f"{self.api_url}/asset-allocations",
+                json={"requisition_id": requisition_id, "asset_definition_id": asset_id},
+                headers=self.headers,
+                timeout=120
+            )
+            return pair, response.status_code, response.text
+
+        print(f"\n🔍 Firing {self.attempts} parallel allocation attempts...")
+        with ThreadPoolExecutor(max_workers=self.attempts) as executor:
+            results = list(executor.map(attempt, pairs))
+
+        status_counts = Counter(status_code for _, status_code, _ in results)
+        successes = [pair for pair, status_code, _ in results if status_code == 200]
+        unexpected = [(status_code, text) for _, status_code, text in results if status_code not in (200, 400)]
+        print(f"   Responses: {dict(status_counts)}")
+
+        # Check the responses and the stored state for double allocations
+        allocations = requests.get(f"{self.api_url}/asset-allocations", headers=self.headers, timeout=30).json()
+        allocations = [a for a in allocations if a["asset_definition_id"] in self.asset_ids]
+        assets = requests.get(f"{self.api_url}/asset-definitions", headers=self.headers, timeout=30).json()
+        allocated_assets = [a for a in assets if a["id"] in self.asset_ids and a["status"] == "Allocated"]
+
+        asset_counts = Counter(a["asset_definition_id"] for a in allocations)
+        requisition_counts = Counter(a["requisition_id"] for a in allocations)
+        checks = [
+            ("no unexpected error responses", not unexpected),
+            ("successful responses match stored allocations", len(successes) == len(allocations)),
+            ("no asset allocated twice", all(count == 1 for count in asset_counts.values())),
+            ("no requisition allocated twice", all(count == 1 for count in requisition_counts.values())),
+            ("allocated assets match allocations", len(allocated_assets) == len(allocations)),
+            ("at most one allocation per asset", len(allocations) <= self.asset_count),
+        ]
+
+        print("\n📊 Results")
+        print(f"   {len(successes)} allocations succeeded out of {self.attempts} attempts")
+        for name, passed in checks:
+            print(f"   {'✅' if passed else '❌'} {name}")
+        for status_code, text in unexpected[:5]:
+            print(f"   Unexpected response {status_code}: {text}")
+        return all(passed for _, passed in checks)
+
+
+if __name__ == "__main__":
+    base_url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8001"
+    attempts = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    test = AllocationConcurrencyStressTest(base_url, attempts)
+    sys.exit(0 if test.run() else 1)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark the requisition-to-asset auto-match solver.
+
+Generates synthetic requisitions and available assets spread over asset types and
+locations and times match_requisitions_to_assets, the engine behind
+GET /api/asset-allocations/auto-match. The solver does not touch the database, so no
+server or MongoDB is needed.
+
+Usage: python auto_match_benchmark.py [requisitions] [assets] [asset_types] [locations]
+"""
+
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "auto_match_benchmark")
+
+from server import match_requisitions_to_assets  # noqa: E402
+
+
+class AutoMatchBenchmark:
+    def __init__(self, requisitions=5000, assets=20000, asset_types=10, locations=20, seed=42):
+        self.requisition_count = requisitions
+        self.asset_count = assets
+        self.asset_type_count = asset_types
+        self.location_count = locations
+        self.random = random.Random(seed)
+
+    def generate(self, asset_types):
+        """Build requisitions and assets grouped by asset type"""
+        now = datetime.now(timezone.utc)
+        locations = [f"LOC-{i}" for i in range(self.location_count)]
+        requisitions = defaultdict(list)
+        assets = defaultdict(list)
+
+        for i in range(self.requisition_count):
+            asset_type = self.random.randrange(asset_types)
+            requisitions[asset_type].append({
+                "id": f"REQ-{i}",
+                "location_id": self.random.choice(locations),
+                "sort_key": (
+                    (now + timedelta(days=self.random.randint(0, 60))).replace(tzinfo=None),
+                    (now - timedelta(days=self.random.randint(0, 30))).replace(tzinfo=None),
+                ),
+            })
+        for j in range(self.asset_count):
+            asset_type = self.random.randrange(asset_types)
+            value = self.random.uniform(20000, 120000)
+            assets[asset_type].append({
+                "id": f"ASSET-{j}",
+                "asset_code": f"ASSET-{j}",
+                "location_id": self.random.choice(locations),
+                "asset_value": value,
+                "current_depreciation_value": value * self.random.uniform(0.3, 1.0),
+                "created_at": now - timedelta(days=self.random.randint(0, 1500)),
+            })
+        return requisitions, assets
+
+    def run_scenario(self, label, asset_types):
+        requisitions, assets = self.generate(asset_types)
+        start = time.perf_counter()
+        matched = unmatched = same_location = 0
+        for asset_type, type_requisitions in requisitions.items():
+            matches, type_unmatched = match_requisitions_to_assets(type_requisitions, assets[asset_type])
+            matched += len(matches)
+            unmatched += len(type_unmatched)
+            same_location += sum(1 for req, asset, _ in matches if req["location_id"] == asset["location_id"])
+        seconds = time.perf_counter() - start
+        print(
+            f"   {label:<28} {seconds:8.2f}s  matched={matched:<6} unmatched={unmatched:<6} "
+            f"same_location={same_location}"
+        )
+        return seconds
+
+    def run(self):
+        print(
+            f"🔍 Matching {self.requisition_count} requisitions against {self.asset_count} assets "
+            f"across {self.location_count} locations..."
+        )
+        self.run_scenario(f"{self.asset_type_count} asset types", self.asset_type_count)
+        self.run_scenario("single asset type", 1)
+        return True
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    benchmark = AutoMatchBenchmark(*args)
+    sys.exit(0 if benchmark.run() else 1)
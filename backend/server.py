@@ -1,20 +1,35 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, BackgroundTasks, UploadFile, File
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, status, BackgroundTasks, UploadFile, File, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse, Response
+from fastapi.encoders import jsonable_encoder
 from motor.motor_asyncio import AsyncIOMotorClient
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any
+from pymongo import ReturnDocument, UpdateOne, UpdateMany, InsertOne
+from pymongo.collation import Collation, CollationStrength
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pydantic import BaseModel, Field, EmailStr, ValidationError
+from typing import List, Optional, Dict, Any, Union, Tuple
 from datetime import datetime, timezone, timedelta
 from enum import Enum
 import os
 import logging
 import uuid
 import hashlib
+import re
 import requests
 import pandas as pd
+import numpy as np
+from openpyxl import load_workbook
 import io
 import csv
+import json
+import gzip
+import base64
+import itertools
+import collections
+import contextlib
+import multiprocessing
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 # Email imports
@@ -23,6 +38,7 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from jinja2 import Template
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -148,8 +164,10 @@ class AssetDefinition(BaseModel):
     assigned_asset_manager_name: Optional[str] = None  # Asset Manager name for display
     location_id: Optional[str] = None  # Location where asset is deployed
     location_name: Optional[str] = None  # Location name for display
+    allocation_id: Optional[str] = None  # Allocation that claimed this asset
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     created_by: Optional[str] = None
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class AssetDefinitionCreate(BaseModel):
     asset_type_id: str
@@ -225,8 +243,16 @@ class AssetRequisition(BaseModel):
     assigned_to_name: Optional[str] = None  # Asset Manager/Administrator name assigned for allocation
     assigned_date: Optional[datetime] = None  # When the routing assignment was made
     routing_reason: Optional[str] = None  # Reason for the routing decision
+    location_id: Optional[str] = None  # Requester location, for shared location queues
+    
+    # Allocation queue claim fields
+    claimed_by: Optional[str] = None  # Asset Manager working on the requisition
+    claimed_by_name: Optional[str] = None
+    claimed_at: Optional[datetime] = None
+    claim_expires_at: Optional[datetime] = None
     
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class AssetRequisitionCreate(BaseModel):
     asset_type_id: str
@@ -278,6 +304,7 @@ class AssetAllocation(BaseModel):
     dispatch_details: Optional[str] = None
     status: AssetAllocationStatus = AssetAllocationStatus.ALLOCATED_TO_EMPLOYEE
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class AssetAllocationCreate(BaseModel):
     requisition_id: str
@@ -287,6 +314,86 @@ class AssetAllocationCreate(BaseModel):
     document_id: Optional[str] = None
     dispatch_details: Optional[str] = None
 
+class BulkAllocationRequest(BaseModel):
+    allocations: List[AssetAllocationCreate]
+
+# Delta sync responses: rows changed since updated_since plus ids deleted since then
+class AssetDefinitionChanges(BaseModel):
+    items: List[AssetDefinition]
+    deleted_ids: List[str] = []
+    next_updated_since: datetime  # Pass back as updated_since on the next sync
+
+class AssetRequisitionChanges(BaseModel):
+    items: List[AssetRequisition]
+    deleted_ids: List[str] = []
+    next_updated_since: datetime
+
+class AssetAllocationChanges(BaseModel):
+    items: List[AssetAllocation]
+    deleted_ids: List[str] = []
+    next_updated_since: datetime
+
+class BulkAllocationResult(BaseModel):
+    success: bool
+    message: str
+    total: int
+    allocated: int
+    failed: int
+    allocations: List[AssetAllocation] = []
+    errors: List[Dict[str, str]] = []  # index, requisition_id, asset_definition_id, error
+
+class AllocationQueueClaimRequest(BaseModel):
+    count: int = 1
+    location_id: Optional[str] = None  # Shared location queue instead of the caller's own
+
+class AllocationQueuePage(BaseModel):
+    items: List[AssetRequisition]
+    next_cursor: Optional[str] = None
+
+class AssetSearchResult(BaseModel):
+    items: List[AssetDefinition]  # Best match first
+    total: int
+    page: int
+    page_size: int
+
+class AssetReservation(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    asset_definition_id: str
+    asset_code: Optional[str] = None
+    requisition_id: Optional[str] = None  # Requisition the asset is being held for
+    reserved_by: str  # Asset Manager ID
+    reserved_by_name: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    expires_at: datetime
+
+class AssetReservationCreate(BaseModel):
+    asset_definition_id: str
+    requisition_id: Optional[str] = None
+    minutes: int = 15
+
+class AutoMatchProposal(BaseModel):
+    requisition_id: str
+    requested_for: str
+    requested_for_name: Optional[str] = None
+    requisition_location_name: Optional[str] = None
+    asset_type_id: str
+    asset_type_name: Optional[str] = None
+    asset_definition_id: str
+    asset_code: str
+    asset_location_name: Optional[str] = None
+    same_location: bool
+    book_value: float
+    cost: float
+
+class AutoMatchPlan(BaseModel):
+    total_requisitions: int
+    matched: int
+    unmatched: int
+    same_location_matches: int
+    total_book_value: float
+    proposals: List[AutoMatchProposal] = []
+    unmatched_requisitions: List[Dict[str, str]] = []  # requisition_id, reason
+
 class AssetRetrieval(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     employee_id: str
@@ -374,6 +481,13 @@ class UserUpdate(BaseModel):
     is_active: Optional[bool] = None
     password: Optional[str] = None
 
+class UserSummary(BaseModel):
+    id: str
+    name: str
+    email: str
+    location_id: Optional[str] = None
+    location_name: Optional[str] = None
+
 class PasswordChange(BaseModel):
     current_password: str
     new_password: str
@@ -386,6 +500,64 @@ class BulkImportResult(BaseModel):
     failed_imports: int
     errors: List[Dict[str, str]] = []
 
+class ImportJobStatus(str, Enum):
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    COMPLETED = "Completed"
+    FAILED = "Failed"
+    CANCELLED = "Cancelled"
+
+class ImportJob(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    job_type: str = "asset_definitions"
+    file_name: str
+    status: ImportJobStatus = ImportJobStatus.QUEUED
+    success: bool = False
+    message: Optional[str] = None
+    total_rows: int = 0  # Rows processed so far
+    successful_imports: int = 0
+    failed_imports: int = 0
+    errors: List[Dict[str, str]] = []
+    cancel_requested: bool = False
+    created_by: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class NamePropagationJob(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    source: str  # asset_types, locations, users
+    source_id: str
+    name: str
+    status: ImportJobStatus = ImportJobStatus.QUEUED
+    total_targets: int = 0  # Dependent name fields to update
+    completed_targets: int = 0
+    updated_documents: int = 0
+    message: Optional[str] = None
+    created_by: str
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class AssetDefinitionRowChange(BaseModel):
+    row: str
+    asset_code: str
+    action: str  # created, updated, unchanged
+    changes: Dict[str, Dict[str, Any]] = {}  # field -> {"from": old, "to": new}
+
+class BulkUpdateResult(BaseModel):
+    success: bool
+    message: str
+    total_rows: int
+    created: int
+    updated: int
+    unchanged: int
+    failed: int
+    changes: List[AssetDefinitionRowChange] = []
+    errors: List[Dict[str, str]] = []
+
 # Location Models
 class Location(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -444,6 +616,11 @@ class NDCRequest(BaseModel):
     asset_manager_name: str
     status: str = "Pending"  # Pending, Asset Manager Confirmation, Completed
     
+    # Recovery counters, kept in step with the recovery rows via $inc
+    pending_count: int = 0
+    recovered_count: int = 0
+    not_recovered_count: int = 0
+    
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -456,6 +633,18 @@ class NDCRequestCreate(BaseModel):
     separation_approved_on: datetime
     separation_reason: str
 
+class NDCBatchCreate(BaseModel):
+    separations: List[NDCRequestCreate]
+
+class NDCBatchResult(BaseModel):
+    success: bool
+    message: str
+    total: int
+    created: int  # Employees whose NDC requests were raised
+    failed: int
+    requests: List[Dict[str, Any]] = []  # ndc_request_id, employee_name, asset_manager_name, asset_count
+    errors: List[Dict[str, str]] = []  # row, employee_id, error
+
 class NDCAssetRecovery(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     ndc_request_id: str
@@ -482,6 +671,22 @@ class NDCAssetRecoveryUpdate(BaseModel):
     recovery_value: Optional[float] = None
     remarks: Optional[str] = None
 
+class NDCAssetRecoveryBulkItem(NDCAssetRecoveryUpdate):
+    recovery_id: str
+
+class NDCBulkRecoveryUpdate(BaseModel):
+    recoveries: List[NDCAssetRecoveryBulkItem]
+
+class NDCBulkRecoveryResult(BaseModel):
+    success: bool
+    message: str
+    total: int
+    updated: int
+    failed: int
+    ndc_status: Optional[str] = None
+    recoveries: List[NDCAssetRecovery] = []
+    errors: List[Dict[str, str]] = []  # recovery_id, error
+
 class NDCRevokeRequest(BaseModel):
     reason: str
 
@@ -643,7 +848,8 @@ class EmailService:
             "asset_allocated": "Asset Allocated - {{asset_type_name}} ({{asset_code}})",
             "asset_acknowledged": "Asset Acknowledgment Received - {{asset_type_name}} ({{asset_code}})",
             "ndc_created": "NDC Request Created - {{employee_name}} Asset Recovery Required",
-            "ndc_completed": "NDC Request Completed - {{employee_name}} Asset Recovery Finalized"
+            "ndc_completed": "NDC Request Completed - {{employee_name}} Asset Recovery Finalized",
+            "ndc_batch_created": "NDC Requests Created - {{employee_count}} Employees Require Asset Recovery"
         }
         
         subject_template = subjects.get(notification_type, "Asset Management Notification")
@@ -777,6 +983,25 @@ class EmailService:
             </body>
             </html>
             """,
+            "ndc_batch_created": """
+            <html>
+            <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+                <div style="max-width: 600px; margin: 0 auto; padding: 20px;">
+                    <h2 style="color: #dc2626;">NDC Requests Created - Asset Recovery Required</h2>
+                    <p>Dear {{asset_manager_name}},</p>
+                    <p>No Dues Certificate (NDC) requests have been created for {{employee_count}} employee separations. Your action is required to recover {{asset_count}} assets:</p>
+                    <div style="background-color: #fef2f2; padding: 15px; border-radius: 5px; margin: 20px 0;">
+                        <strong>Employees:</strong><br>
+                        {% for employee in employees %}
+                        {{employee.employee_name}} ({{employee.employee_designation}}) - Last Working Date: {{employee.last_working_date}}, Assets to Recover: {{employee.asset_count}}<br>
+                        {% endfor %}
+                    </div>
+                    <p>Please log in to the Asset Management System to review and process the asset recovery for these employees.</p>
+                    <p>Best regards,<br>Asset Management System</p>
+                </div>
+            </body>
+            </html>
+            """,
             "ndc_completed": """
             <html>
             <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
@@ -937,6 +1162,21 @@ Assets to Recover: {{asset_count}} items
 
 Please log in to the Asset Management System to review and process the asset recovery for this employee.
 
+Best regards,
+Asset Management System
+            """,
+            "ndc_batch_created": """
+NDC Requests Created - Asset Recovery Required
+
+Dear {{asset_manager_name}},
+
+No Dues Certificate (NDC) requests have been created for {{employee_count}} employee separations. Your action is required to recover {{asset_count}} assets:
+
+Employees:
+{% for employee in employees %}- {{employee.employee_name}} ({{employee.employee_designation}}) - Last Working Date: {{employee.last_working_date}}, Assets to Recover: {{employee.asset_count}}
+{% endfor %}
+Please log in to the Asset Management System to review and process the asset recovery for these employees.
+
 Best regards,
 Asset Management System
             """,
@@ -1030,6 +1270,342 @@ def require_role(required_roles: List[UserRole]):
         )
     return role_checker
 
+# Request-scoped data loaders
+class DocumentLoader:
+    """Batches and caches id lookups against one collection for a single request.
+
+    Every load() issued in the same event-loop tick is coalesced into one $in query,
+    and each id is fetched at most once for the lifetime of the loader. Returned
+    documents are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.cache: Dict[str, asyncio.Future] = {}
+        self.queue: List[str] = []
+        self.dispatch_task = None
+
+    def load(self, doc_id: Optional[str]) -> asyncio.Future:
+        """Return a future resolving to the document with this id, or None if missing"""
+        loop = asyncio.get_running_loop()
+        if not doc_id:
+            future = loop.create_future()
+            future.set_result(None)
+            return future
+        if doc_id not in self.cache:
+            self.cache[doc_id] = loop.create_future()
+            self.queue.append(doc_id)
+            if len(self.queue) == 1:
+                # Wait one tick so sibling lookups can join the same query
+                loop.call_soon(self.schedule_dispatch)
+        return self.cache[doc_id]
+
+    async def load_many(self, doc_ids: List[Optional[str]]) -> List[Optional[dict]]:
+        return list(await asyncio.gather(*[self.load(doc_id) for doc_id in doc_ids]))
+
+    def schedule_dispatch(self):
+        self.dispatch_task = asyncio.ensure_future(self.dispatch())
+
+    async def dispatch(self):
+        doc_ids, self.queue = self.queue, []
+        try:
+            docs = await self.collection.find({"id": {"$in": doc_ids}}, {"_id": 0}).to_list(None)
+        except Exception as e:
+            # Drop failed ids from the cache so a later load can retry them
+            for doc_id in doc_ids:
+                self.cache.pop(doc_id).set_exception(e)
+            return
+        docs_by_id = {doc["id"]: doc for doc in docs}
+        for doc_id in doc_ids:
+            self.cache[doc_id].set_result(docs_by_id.get(doc_id))
+
+class Loaders:
+    """Data loaders for the collections handlers most often look up by id"""
+
+    def __init__(self):
+        self.users = DocumentLoader(db.users)
+        self.asset_types = DocumentLoader(db.asset_types)
+
+async def get_loaders() -> Loaders:
+    """FastAPI dependency giving each request its own loaders; async so it runs on the event loop, not the threadpool"""
+    return Loaders()
+
+# Collection versions and the reference data cache
+async def bump_collection_versions(*collections: str):
+    """Record a write to these collections so snapshots and ETags derived from them are refreshed"""
+    await db.collection_versions.bulk_write([
+        UpdateOne({"_id": collection}, {"$inc": {"version": 1}}, upsert=True)
+        for collection in collections
+    ])
+
+async def get_collection_versions(collections: List[str]) -> Dict[str, int]:
+    """Current write version of each collection, 0 if it was never bumped"""
+    docs = await db.collection_versions.find({"_id": {"$in": collections}}).to_list(None)
+    versions = {doc["_id"]: doc["version"] for doc in docs}
+    return {collection: versions.get(collection, 0) for collection in collections}
+
+REFERENCE_DATA_COLLECTIONS = ["asset_types", "locations", "separation_reasons", "company_profile", "users"]
+
+# Bootstrap sections and the roles allowed to see them (None: any signed-in user)
+REFERENCE_DATA_SECTIONS = {
+    "asset_types": None,
+    "locations": None,
+    "company_profile": None,
+    "separation_reasons": [UserRole.HR_MANAGER, UserRole.ADMINISTRATOR],
+    "managers": [UserRole.ADMINISTRATOR],
+    "asset_managers": [UserRole.ADMINISTRATOR, UserRole.HR_MANAGER],
+}
+
+REFERENCE_USER_PROJECTION = {"_id": 0, "password_hash": 0, "session_token": 0, "search_terms": 0}
+
+reference_data_cache: Dict[str, Any] = {"version": None, "data": None, "bodies": {}}
+reference_data_lock = asyncio.Lock()
+
+def default_company_profile() -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "company_name": "Your Company Name",
+        "created_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
+    }
+
+async def load_reference_data() -> Dict[str, Any]:
+    """Read every reference collection and build the response models once"""
+    asset_types, locations, reasons, profile, managers, asset_managers = await asyncio.gather(
+        db.asset_types.find().to_list(1000),
+        db.locations.find().to_list(1000),
+        db.separation_reasons.find().to_list(100),
+        db.company_profile.find_one({}),
+        db.users.find({"roles": UserRole.MANAGER, "is_active": True}, REFERENCE_USER_PROJECTION).to_list(1000),
+        db.users.find({"roles": UserRole.ASSET_MANAGER, "is_active": True}, REFERENCE_USER_PROJECTION).to_list(1000)
+    )
+    return {
+        "asset_types": [AssetType(**asset_type) for asset_type in asset_types],
+        "locations": [Location(**location) for location in locations],
+        "company_profile": CompanyProfile(**(profile or default_company_profile())),
+        "separation_reasons": [SeparationReason(**reason) for reason in reasons],
+        "managers": [User(**manager) for manager in managers],
+        "asset_managers": [User(**asset_manager) for asset_manager in asset_managers],
+    }
+
+async def get_reference_data() -> Tuple[str, Dict[str, Any]]:
+    """Return the cached reference data and its version, reloading it only after a write"""
+    versions = await get_collection_versions(REFERENCE_DATA_COLLECTIONS)
+    version = ".".join(str(versions[collection]) for collection in REFERENCE_DATA_COLLECTIONS)
+    if reference_data_cache["version"] != version:
+        async with reference_data_lock:
+            if reference_data_cache["version"] != version:
+                data = await load_reference_data()
+                reference_data_cache.update(version=version, data=data, bodies={})
+    return version, reference_data_cache["data"]
+
+def user_has_any_role(user: User, roles: List[UserRole]) -> bool:
+    return UserRole.ADMINISTRATOR in user.roles or bool(set(user.roles).intersection(roles))
+
+# Delta sync
+DELTA_SYNC_TOMBSTONE_DAYS = 30
+DELTA_SYNC_OVERLAP = timedelta(seconds=5)
+
+async def record_deletions(collection: str, doc_ids: List[str]):
+    """Leave tombstones so delta sync clients learn which documents were deleted"""
+    if doc_ids:
+        deleted_at = datetime.now(timezone.utc)
+        await db.deleted_documents.insert_many([
+            {"collection": collection, "id": doc_id, "deleted_at": deleted_at}
+            for doc_id in doc_ids
+        ])
+
+async def find_changes_since(collection: str, query: dict, updated_since: datetime) -> Tuple[List[dict], List[str], datetime]:
+    """Documents matching query updated after updated_since, ids deleted since then, and the next sync point"""
+    now = datetime.now(timezone.utc)
+    updated_since = updated_since.replace(tzinfo=timezone.utc) if updated_since.tzinfo is None else updated_since
+    if updated_since < now - timedelta(days=DELTA_SYNC_TOMBSTONE_DAYS):
+        raise HTTPException(
+            status_code=410,
+            detail=f"updated_since is older than {DELTA_SYNC_TOMBSTONE_DAYS} days; reload the full list"
+        )
+    docs, tombstones = await asyncio.gather(
+        db[collection].find({"$and": [query, {"updated_at": {"$gt": updated_since}}]}).to_list(None),
+        db.deleted_documents.find(
+            {"collection": collection, "deleted_at": {"$gt": updated_since}}, {"_id": 0, "id": 1}
+        ).to_list(None)
+    )
+    # A write stamped just before this query may land just after it, so the next sync overlaps a little
+    return docs, [tombstone["id"] for tombstone in tombstones], now - DELTA_SYNC_OVERLAP
+
+# Live update events
+EVENT_STREAM_HEARTBEAT_SECONDS = 15
+EVENT_STREAM_QUEUE_SIZE = 100
+EVENT_HISTORY_SIZE = 1000
+
+class EventSubscriber:
+    """One connected event stream and the events waiting to be sent to it"""
+
+    def __init__(self, user: User):
+        self.user_id = user.id
+        self.roles = set(user.roles)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=EVENT_STREAM_QUEUE_SIZE)
+        self.needs_resync = False
+
+    def matches(self, event: dict) -> bool:
+        return (
+            UserRole.ADMINISTRATOR in self.roles
+            or self.user_id in event["audience"]
+            or bool(self.roles & event["roles"])
+        )
+
+    def offer(self, event: dict):
+        if not self.matches(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A slow client misses events; tell it to reload instead
+            self.needs_resync = True
+
+class EventBus:
+    """In-process fan-out of change events from the write handlers to connected event streams.
+
+    Recent events are kept so a reconnecting client can resume from its Last-Event-ID;
+    if that id is too old or from before a restart the client is told to resync.
+    """
+
+    def __init__(self):
+        self.boot_id = uuid.uuid4().hex[:8]
+        self.sequence = 0
+        self.history: collections.deque = collections.deque(maxlen=EVENT_HISTORY_SIZE)
+        self.subscribers = set()
+
+    def publish(self, event_type: str, data: dict, audience: set, roles: List[UserRole]):
+        self.sequence += 1
+        event = {
+            "id": f"{self.boot_id}-{self.sequence}",
+            "sequence": self.sequence,
+            "type": event_type,
+            "data": data,
+            "audience": audience,
+            "roles": set(roles)
+        }
+        self.history.append(event)
+        for subscriber in self.subscribers:
+            subscriber.offer(event)
+
+    def subscribe(self, user: User, last_event_id: Optional[str] = None) -> EventSubscriber:
+        subscriber = EventSubscriber(user)
+        if last_event_id:
+            boot_id, _, sequence = last_event_id.partition("-")
+            oldest = self.history[0]["sequence"] if self.history else self.sequence + 1
+            if boot_id != self.boot_id or not sequence.isdigit() or int(sequence) + 1 < oldest:
+                subscriber.needs_resync = True
+            else:
+                for event in self.history:
+                    if event["sequence"] > int(sequence):
+                        subscriber.offer(event)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: EventSubscriber):
+        self.subscribers.discard(subscriber)
+
+event_bus = EventBus()
+
+def requisition_event_data(action: str, requisition: dict) -> dict:
+    return {
+        "action": action,
+        "id": requisition["id"],
+        "status": requisition.get("status", RequisitionStatus.PENDING),  # New requisitions are stored without one
+        "requested_by": requisition.get("requested_by"),
+        "assigned_to": requisition.get("assigned_to"),
+        "claimed_by": requisition.get("claimed_by"),
+        "allocated_asset_id": requisition.get("allocated_asset_id"),
+        "updated_at": requisition.get("updated_at")
+    }
+
+async def publish_requisition_events(action: str, requisitions: List[dict]):
+    """Notify requesters, their management chain, HR and the assigned Asset Manager of requisition changes"""
+    try:
+        requester_ids = list({requisition["requested_by"] for requisition in requisitions})
+        links = await db.user_hierarchy.find(
+            {"descendant_id": {"$in": requester_ids}}, {"_id": 0, "ancestor_id": 1, "descendant_id": 1}
+        ).to_list(None)
+        managers_by_requester = collections.defaultdict(set)
+        for link in links:
+            managers_by_requester[link["descendant_id"]].add(link["ancestor_id"])
+        for requisition in requisitions:
+            audience = {
+                requisition["requested_by"],
+                requisition.get("team_member_employee_id"),
+                requisition.get("manager_id"),
+                requisition.get("assigned_to"),
+                requisition.get("claimed_by")
+            } | managers_by_requester[requisition["requested_by"]]
+            audience.discard(None)
+            event_bus.publish(
+                "requisition", requisition_event_data(action, requisition), audience, [UserRole.HR_MANAGER]
+            )
+    except Exception as e:
+        logging.error(f"Failed to publish requisition events: {str(e)}")
+
+def publish_allocation_events(action: str, allocations: List[dict]):
+    """Notify the employee, the allocating Asset Manager and allocation desks of allocation changes"""
+    for allocation in allocations:
+        event_bus.publish(
+            "allocation",
+            {
+                "action": action,
+                "id": allocation["id"],
+                "requisition_id": allocation["requisition_id"],
+                "asset_definition_id": allocation["asset_definition_id"],
+                "status": allocation.get("status"),
+                "updated_at": allocation.get("updated_at")
+            },
+            {allocation["requested_for"], allocation["allocated_by"]},
+            [UserRole.ASSET_MANAGER]
+        )
+
+def publish_ndc_events(action: str, ndc_requests: List[dict]):
+    """Notify HR and the Asset Manager an NDC request is assigned to of its changes"""
+    for ndc_request in ndc_requests:
+        audience = {ndc_request.get("asset_manager_id"), ndc_request.get("created_by")}
+        audience.discard(None)
+        event_bus.publish(
+            "ndc_request",
+            {
+                "action": action,
+                "id": ndc_request["id"],
+                "employee_id": ndc_request.get("employee_id"),
+                "asset_manager_id": ndc_request.get("asset_manager_id"),
+                "status": ndc_request.get("status"),
+                "pending_count": ndc_request.get("pending_count"),
+                "updated_at": ndc_request.get("updated_at")
+            },
+            audience,
+            [UserRole.HR_MANAGER]
+        )
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match names this ETag, using weak comparison"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag.removeprefix("W/") in {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+async def not_modified_response(request: Request, response: Response, collections: List[str]) -> Optional[Response]:
+    """Tag the response with a weak ETag built from the collections' write versions.
+
+    Returns a 304 response when the client's copy is current, so the caller can skip
+    the query and serialization entirely; otherwise sets the ETag and returns None.
+    """
+    versions = await get_collection_versions(collections)
+    etag = 'W/"' + ".".join(str(versions[collection]) for collection in collections) + '"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
 # Authentication Routes
 @api_router.post("/auth/emergent-callback")
 async def emergent_auth_callback(session_id: str):
@@ -1057,11 +1633,13 @@ async def emergent_auth_callback(session_id: str):
                 "name": session_data.name,
                 "roles": [UserRole.EMPLOYEE],  # Default roles
                 "picture": session_data.picture,
+                "search_terms": user_search_terms(session_data.name, session_data.email),
                 "session_token": session_data.session_token,
                 "created_at": datetime.now(timezone.utc),
                 "is_active": True
             }
             await db.users.insert_one(user_data)
+            await bump_collection_versions("users")
             user = User(**user_data)
         else:
             # Update session token
@@ -1107,6 +1685,8 @@ async def login(user_data: UserLogin):
                 {"email": user_data.email},
                 {"$set": {"session_token": session_token, "is_active": True}}
             )
+            if not existing_user.get("is_active", True):
+                await bump_collection_versions("users")
             existing_user["session_token"] = session_token
             user = User(**existing_user)
         else:
@@ -1117,11 +1697,13 @@ async def login(user_data: UserLogin):
                 "email": demo_user["email"],
                 "name": demo_user["name"],
                 "roles": demo_user["roles"],
+                "search_terms": user_search_terms(demo_user["name"], demo_user["email"]),
                 "session_token": session_token,
                 "created_at": datetime.now(timezone.utc),
                 "is_active": True
             }
             await db.users.insert_one(user_data_dict)
+            await bump_collection_versions("users")
             user = User(**user_data_dict)
         
         return {"success": True, "user": user.dict(), "session_token": session_token}
@@ -1175,26 +1757,154 @@ async def create_asset_type(
     # This is part of the restructuring where Asset Manager assignment moved from Asset Type to Asset Definition level
     
     await db.asset_types.insert_one(asset_type_dict)
+    await bump_collection_versions("asset_types")
     return AssetType(**asset_type_dict)
 
 @api_router.get("/asset-types", response_model=List[AssetType])
-async def get_asset_types(current_user: User = Depends(get_current_user)):
+async def get_asset_types(request: Request, response: Response, current_user: User = Depends(get_current_user)):
     """Get all asset types"""
-    asset_types = await db.asset_types.find().to_list(1000)
-    return [AssetType(**asset_type) for asset_type in asset_types]
+    not_modified = await not_modified_response(request, response, ["asset_types"])
+    if not_modified:
+        return not_modified
+    _, reference_data = await get_reference_data()
+    return reference_data["asset_types"]
 
 @api_router.get("/asset-types/{asset_type_id}", response_model=AssetType)
-async def get_asset_type(asset_type_id: str, current_user: User = Depends(get_current_user)):
+async def get_asset_type(asset_type_id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
     """Get a specific asset type"""
+    not_modified = await not_modified_response(request, response, ["asset_types"])
+    if not_modified:
+        return not_modified
     asset_type = await db.asset_types.find_one({"id": asset_type_id})
     if not asset_type:
         raise HTTPException(status_code=404, detail="Asset type not found")
     return AssetType(**asset_type)
 
+# Denormalized name fields: source collection -> (dependent collection, id field, name field, extra filter)
+NAME_PROPAGATION_TARGETS = {
+    "asset_types": [
+        ("asset_definitions", "asset_type_id", "asset_type_name", {}),
+        ("asset_requisitions", "asset_type_id", "asset_type_name", {}),
+        ("asset_allocations", "asset_type_id", "asset_type_name", {}),
+    ],
+    "locations": [
+        ("users", "location_id", "location_name", {}),
+        ("asset_definitions", "location_id", "location_name", {}),
+        ("asset_manager_locations", "location_id", "location_name", {}),
+    ],
+    "users": [
+        ("users", "reporting_manager_id", "reporting_manager_name", {}),
+        ("asset_definitions", "allocated_to", "allocated_to_name", {}),
+        ("asset_definitions", "assigned_asset_manager_id", "assigned_asset_manager_name", {}),
+        ("asset_requisitions", "requested_by", "requested_by_name", {}),
+        ("asset_requisitions", "requested_by", "requested_for_name", {"request_for": {"$ne": RequestFor.TEAM_MEMBER}}),
+        ("asset_requisitions", "team_member_employee_id", "requested_for_name", {"request_for": RequestFor.TEAM_MEMBER}),
+        ("asset_requisitions", "team_member_employee_id", "team_member_name", {}),
+        ("asset_requisitions", "manager_id", "manager_name", {}),
+        ("asset_requisitions", "hr_manager_id", "hr_manager_name", {}),
+        ("asset_requisitions", "manager_action_by", "manager_action_by_name", {}),
+        ("asset_requisitions", "hr_action_by", "hr_action_by_name", {}),
+        ("asset_requisitions", "assigned_to", "assigned_to_name", {}),
+        ("asset_requisitions", "claimed_by", "claimed_by_name", {}),
+        ("asset_allocations", "requested_for", "requested_for_name", {}),
+        ("asset_allocations", "approved_by", "approved_by_name", {}),
+        ("asset_allocations", "allocated_by", "allocated_by_name", {}),
+        ("asset_retrievals", "employee_id", "employee_name", {}),
+        ("asset_retrievals", "processed_by", "processed_by_name", {}),
+        ("asset_reservations", "reserved_by", "reserved_by_name", {}),
+        ("asset_manager_locations", "asset_manager_id", "asset_manager_name", {}),
+        ("ndc_requests", "employee_id", "employee_name", {}),
+        ("ndc_requests", "separation_approved_by", "separation_approved_by_name", {}),
+        ("ndc_requests", "created_by", "created_by_name", {}),
+        ("ndc_requests", "asset_manager_id", "asset_manager_name", {}),
+    ],
+}
+
+async def queue_name_propagation(
+    source: str, source_id: str, name: str, created_by: str, background_tasks: BackgroundTasks
+) -> NamePropagationJob:
+    """Record a rename and fan it out to the dependent collections after the response"""
+    job = NamePropagationJob(
+        source=source,
+        source_id=source_id,
+        name=name,
+        total_targets=len(NAME_PROPAGATION_TARGETS[source]),
+        created_by=created_by
+    )
+    await db.name_propagation_jobs.insert_one(job.dict())
+    background_tasks.add_task(run_name_propagation_job, job.id)
+    return job
+
+async def run_name_propagation_job(job_id: str):
+    """Background worker: copy a renamed source's name onto every dependent document"""
+    job = await db.name_propagation_jobs.find_one_and_update(
+        {"id": job_id},
+        {"$set": {
+            "status": ImportJobStatus.RUNNING,
+            "started_at": datetime.now(timezone.utc),
+            "updated_at": datetime.now(timezone.utc)
+        }}
+    )
+    try:
+        # Use the current name so overlapping renames settle on the latest one
+        source = await db[job["source"]].find_one({"id": job["source_id"]}, {"_id": 0, "name": 1})
+        name = source["name"] if source else job["name"]
+        
+        updated_documents = 0
+        for collection, id_field, name_field, extra_filter in NAME_PROPAGATION_TARGETS[job["source"]]:
+            result = await db[collection].update_many(
+                {id_field: job["source_id"], name_field: {"$ne": name}, **extra_filter},
+                {"$set": {name_field: name, "updated_at": datetime.now(timezone.utc)}}
+            )
+            if result.modified_count:
+                if collection == "asset_requisitions" and name_field in REQUISITION_SEARCH_FIELDS:
+                    await refresh_requisition_search_terms({id_field: job["source_id"], **extra_filter})
+                await bump_collection_versions(collection)
+            updated_documents += result.modified_count
+            await db.name_propagation_jobs.update_one(
+                {"id": job_id},
+                {
+                    "$inc": {"completed_targets": 1, "updated_documents": result.modified_count},
+                    "$set": {"updated_at": datetime.now(timezone.utc)}
+                }
+            )
+        
+        final_update = {
+            "status": ImportJobStatus.COMPLETED,
+            "message": f"Renamed to {name} on {updated_documents} documents"
+        }
+    except Exception as e:
+        logging.error(f"Name propagation job {job_id} failed: {str(e)}")
+        final_update = {"status": ImportJobStatus.FAILED, "message": f"Name propagation failed: {str(e)}"}
+    
+    final_update["completed_at"] = datetime.now(timezone.utc)
+    final_update["updated_at"] = datetime.now(timezone.utc)
+    await db.name_propagation_jobs.update_one({"id": job_id}, {"$set": final_update})
+
+@api_router.get("/name-propagation-jobs", response_model=List[NamePropagationJob])
+async def get_name_propagation_jobs(
+    current_user: User = Depends(require_role([UserRole.ADMINISTRATOR, UserRole.HR_MANAGER]))
+):
+    """Get the most recent rename propagation jobs"""
+    jobs = await db.name_propagation_jobs.find().sort("created_at", -1).to_list(100)
+    return [NamePropagationJob(**job) for job in jobs]
+
+@api_router.get("/name-propagation-jobs/{job_id}", response_model=NamePropagationJob)
+async def get_name_propagation_job(
+    job_id: str,
+    current_user: User = Depends(require_role([UserRole.ADMINISTRATOR, UserRole.HR_MANAGER]))
+):
+    """Get progress of a rename propagation job"""
+    job = await db.name_propagation_jobs.find_one({"id": job_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Name propagation job not found")
+    return NamePropagationJob(**job)
+
 @api_router.put("/asset-types/{asset_type_id}", response_model=AssetType)
 async def update_asset_type(
     asset_type_id: str,
     asset_type_update: AssetTypeUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_role([UserRole.ADMINISTRATOR, UserRole.HR_MANAGER]))
 ):
     """Update an asset type"""
@@ -1215,6 +1925,9 @@ async def update_asset_type(
     
     if update_data:
         await db.asset_types.update_one({"id": asset_type_id}, {"$set": update_data})
+        await bump_collection_versions("asset_types")
+        if update_data.get("name") and update_data["name"] != existing["name"]:
+            await queue_name_propagation("asset_types", asset_type_id, update_data["name"], current_user.id, background_tasks)
         updated = await db.asset_types.find_one({"id": asset_type_id})
         return AssetType(**updated)
     
@@ -1234,6 +1947,7 @@ async def delete_asset_type(
     result = await db.asset_types.delete_one({"id": asset_type_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Asset type not found")
+    await bump_collection_versions("asset_types")
     
     return {"message": "Asset type deleted successfully"}
 
@@ -1289,6 +2003,7 @@ async def create_asset_definition(
     asset_def_dict["id"] = str(uuid.uuid4())
     asset_def_dict["asset_type_name"] = asset_type["name"]
     asset_def_dict["created_at"] = datetime.now(timezone.utc)
+    asset_def_dict["updated_at"] = asset_def_dict["created_at"]
     asset_def_dict["created_by"] = current_user.id
     
     # Populate Asset Manager name if ID is provided
@@ -1319,18 +2034,199 @@ async def create_asset_definition(
     else:
         asset_def_dict["current_depreciation_value"] = asset_def.asset_value
     
-    await db.asset_definitions.insert_one(asset_def_dict)
+    try:
+        await db.asset_definitions.insert_one(asset_def_dict)
+    except DuplicateKeyError:
+        # Created concurrently since the check above; the unique index has the final say
+        raise HTTPException(status_code=400, detail="Asset code already exists")
+    await bump_collection_versions("asset_definitions")
     return AssetDefinition(**asset_def_dict)
 
-@api_router.get("/asset-definitions", response_model=List[AssetDefinition])
-async def get_asset_definitions(current_user: User = Depends(get_current_user)):
-    """Get all asset definitions"""
+@api_router.get("/asset-definitions", response_model=Union[List[AssetDefinition], AssetDefinitionChanges])
+async def get_asset_definitions(
+    request: Request,
+    response: Response,
+    updated_since: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Get all asset definitions, or only the changes since updated_since"""
+    not_modified = await not_modified_response(request, response, ["asset_definitions"])
+    if not_modified:
+        return not_modified
+    if updated_since:
+        asset_definitions, deleted_ids, next_updated_since = await find_changes_since("asset_definitions", {}, updated_since)
+        return AssetDefinitionChanges(
+            items=[AssetDefinition(**asset_def) for asset_def in asset_definitions],
+            deleted_ids=deleted_ids,
+            next_updated_since=next_updated_since
+        )
     asset_definitions = await db.asset_definitions.find().to_list(1000)
     return [AssetDefinition(**asset_def) for asset_def in asset_definitions]
 
+# Asset definition search
+ASSET_SEARCH_MAX_PAGE_SIZE = 100
+ASSET_SEARCH_MAX_TEXT_HITS = 1000
+ASSET_SEARCH_TEXT_FIELDS = {
+    "asset_code": 10,
+    "asset_description": 4,
+    "asset_details": 2,
+    "asset_type_name": 1,
+    "location_name": 1,
+    "allocated_to_name": 1,
+}
+# Code matches rank above word matches: exact, then prefix, then anywhere in the code
+ASSET_CODE_MATCH_SCORES = {"exact": 100, "prefix": 50, "substring": 10}
+
+def asset_code_grams(code: str) -> set:
+    """Trigrams of the code anchored with ^, plus the one-character prefix, so 1-2 character prefixes are lookups too"""
+    anchored = "^" + code
+    return {anchored[:2]} | {anchored[i:i + 3] for i in range(len(anchored) - 2)}
+
+class AssetCodeIndex:
+    """In-memory n-gram index over asset codes for typeahead.
+
+    Loaded once per process, then kept current by applying the asset definitions changed
+    or deleted since the last sync (updated_at and tombstones) whenever the collection's
+    write version moves.
+    """
+
+    def __init__(self):
+        self.codes: Dict[str, str] = {}
+        self.grams: Dict[str, set] = collections.defaultdict(set)
+        self.version = None
+        self.synced_at: Optional[datetime] = None
+        self.lock = asyncio.Lock()
+
+    def add(self, asset_id: str, code: str):
+        self.remove(asset_id)
+        code = code.casefold()
+        self.codes[asset_id] = code
+        for gram in asset_code_grams(code):
+            self.grams[gram].add(asset_id)
+
+    def remove(self, asset_id: str):
+        code = self.codes.pop(asset_id, None)
+        if code is None:
+            return
+        for gram in asset_code_grams(code):
+            ids = self.grams.get(gram)
+            if ids is not None:
+                ids.discard(asset_id)
+                if not ids:
+                    del self.grams[gram]
+
+    def match(self, term: str) -> Dict[str, int]:
+        """Score the assets whose code equals, starts with or contains term"""
+        term = term.casefold()
+        if len(term) < 3:
+            # Too short for a trigram: prefix lookups only
+            candidates = self.grams.get(("^" + term)[:3], set())
+        else:
+            grams = sorted((self.grams.get(term[i:i + 3], set()) for i in range(len(term) - 2)), key=len)
+            candidates = set.intersection(*grams) if grams[0] else set()
+        scores = {}
+        for asset_id in candidates:
+            code = self.codes[asset_id]
+            if code == term:
+                scores[asset_id] = ASSET_CODE_MATCH_SCORES["exact"]
+            elif code.startswith(term):
+                scores[asset_id] = ASSET_CODE_MATCH_SCORES["prefix"]
+            elif term in code:
+                scores[asset_id] = ASSET_CODE_MATCH_SCORES["substring"]
+        return scores
+
+    async def sync(self):
+        """Bring the index up to date with asset definition writes from any server process"""
+        version = (await get_collection_versions(["asset_definitions"]))["asset_definitions"]
+        if version == self.version:
+            return
+        async with self.lock:
+            if version == self.version:
+                return
+            now = datetime.now(timezone.utc)
+            if self.synced_at is None or self.synced_at < now - timedelta(days=DELTA_SYNC_TOMBSTONE_DAYS - 1):
+                assets = await db.asset_definitions.find({}, {"_id": 0, "id": 1, "asset_code": 1}).to_list(None)
+                self.codes.clear()
+                self.grams.clear()
+                deleted_ids = []
+                self.synced_at = now - DELTA_SYNC_OVERLAP
+            else:
+                assets, deleted_ids, self.synced_at = await find_changes_since("asset_definitions", {}, self.synced_at)
+            for asset_id in deleted_ids:
+                self.remove(asset_id)
+            for asset in assets:
+                self.add(asset["id"], asset["asset_code"])
+            self.version = version
+
+asset_code_index = AssetCodeIndex()
+
+@api_router.get("/asset-definitions/search", response_model=AssetSearchResult)
+async def search_asset_definitions(
+    q: str = "",
+    page: int = 1,
+    page_size: int = 20,
+    current_user: User = Depends(get_current_user)
+):
+    """Ranked search over asset code, description, details, type, location and holder names.
+
+    Words are matched with the MongoDB text index; partial codes and code prefixes are
+    matched with the in-memory n-gram index. Code matches rank first.
+    """
+    if page < 1 or not 1 <= page_size <= ASSET_SEARCH_MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"page must be at least 1 and page_size between 1 and {ASSET_SEARCH_MAX_PAGE_SIZE}"
+        )
+    terms = q.split()
+    if not terms:
+        return AssetSearchResult(items=[], total=0, page=page, page_size=page_size)
+    
+    await asset_code_index.sync()
+    text_hits = await db.asset_definitions.find(
+        {"$text": {"$search": " ".join(terms)}},
+        {"_id": 0, "id": 1, "asset_code": 1, "score": {"$meta": "textScore"}}
+    ).sort([("score", {"$meta": "textScore"})]).limit(ASSET_SEARCH_MAX_TEXT_HITS).to_list(None)
+    
+    scores = collections.defaultdict(float)
+    codes = {}
+    for hit in text_hits:
+        scores[hit["id"]] += hit["score"]
+        codes[hit["id"]] = hit["asset_code"]
+    for term in terms:
+        for asset_id, score in asset_code_index.match(term).items():
+            scores[asset_id] += score
+            codes[asset_id] = asset_code_index.codes[asset_id]
+    
+    ranked = sorted(scores, key=lambda asset_id: (-scores[asset_id], codes[asset_id]))
+    page_ids = ranked[(page - 1) * page_size:page * page_size]
+    assets = await db.asset_definitions.find({"id": {"$in": page_ids}}, {"_id": 0}).to_list(None)
+    assets_by_id = {asset["id"]: asset for asset in assets}
+    return AssetSearchResult(
+        items=[AssetDefinition(**assets_by_id[asset_id]) for asset_id in page_ids if asset_id in assets_by_id],
+        total=len(ranked),
+        page=page,
+        page_size=page_size
+    )
+
+@api_router.get("/asset-definitions/available", response_model=List[AssetDefinition])
+async def get_available_asset_definitions(
+    asset_type_id: Optional[str] = None,
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
+):
+    """Get assets that can be allocated now: Available and not reserved by someone else"""
+    reserved = await get_assets_reserved_by_others(current_user.id)
+    query = {"status": AssetStatus.AVAILABLE, "id": {"$nin": list(reserved)}}
+    if asset_type_id:
+        query["asset_type_id"] = asset_type_id
+    asset_defs = await db.asset_definitions.find(query).to_list(1000)
+    return [AssetDefinition(**asset_def) for asset_def in asset_defs]
+
 @api_router.get("/asset-definitions/{asset_def_id}", response_model=AssetDefinition)
-async def get_asset_definition(asset_def_id: str, current_user: User = Depends(get_current_user)):
+async def get_asset_definition(asset_def_id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
     """Get a specific asset definition"""
+    not_modified = await not_modified_response(request, response, ["asset_definitions"])
+    if not_modified:
+        return not_modified
     asset_def = await db.asset_definitions.find_one({"id": asset_def_id})
     if not asset_def:
         raise HTTPException(status_code=404, detail="Asset definition not found")
@@ -1386,7 +2282,12 @@ async def update_asset_definition(
             update_data["location_name"] = None
     
     if update_data:
-        await db.asset_definitions.update_one({"id": asset_def_id}, {"$set": update_data})
+        update_data["updated_at"] = datetime.now(timezone.utc)
+        try:
+            await db.asset_definitions.update_one({"id": asset_def_id}, {"$set": update_data})
+        except DuplicateKeyError:
+            raise HTTPException(status_code=400, detail="Asset code already exists")
+        await bump_collection_versions("asset_definitions")
         updated = await db.asset_definitions.find_one({"id": asset_def_id})
         return AssetDefinition(**updated)
     
@@ -1401,6 +2302,10 @@ async def delete_asset_definition(
     result = await db.asset_definitions.delete_one({"id": asset_def_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Asset definition not found")
+    await asyncio.gather(
+        record_deletions("asset_definitions", [asset_def_id]),
+        bump_collection_versions("asset_definitions")
+    )
     
     return {"message": "Asset definition deleted successfully"}
 
@@ -1408,7 +2313,8 @@ async def delete_asset_definition(
 async def acknowledge_asset_allocation(
     asset_def_id: str,
     acknowledgment: AssetAcknowledgmentRequest,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Employee acknowledges receipt of allocated asset"""
     # Get the asset definition
@@ -1434,13 +2340,15 @@ async def acknowledge_asset_allocation(
     update_data = {
         "acknowledged": True,
         "acknowledgment_date": datetime.now(timezone.utc),
-        "acknowledgment_notes": acknowledgment.acknowledgment_notes
+        "acknowledgment_notes": acknowledgment.acknowledgment_notes,
+        "updated_at": datetime.now(timezone.utc)
     }
     
     await db.asset_definitions.update_one(
         {"id": asset_def_id}, 
         {"$set": update_data}
     )
+    await bump_collection_versions("asset_definitions")
     
     # Get updated asset to return
     updated_asset = await db.asset_definitions.find_one({"id": asset_def_id})
@@ -1450,24 +2358,22 @@ async def acknowledge_asset_allocation(
         # Trigger 5: When employee acknowledges the allocation
         # To: Asset Manager, CC: Employee, Manager, HR Manager
         
-        # Get asset type details
-        asset_type = await db.asset_types.find_one({"id": asset["asset_type_id"]})
+        # Get asset type and manager details
+        asset_type, manager = await asyncio.gather(
+            loaders.asset_types.load(asset["asset_type_id"]),
+            loaders.users.load(current_user.reporting_manager_id)
+        )
         
         # Get Asset Manager (either assigned to asset type or the one who allocated)
         asset_manager = None
         if asset_type and asset_type.get("assigned_asset_manager_id"):
-            asset_manager = await db.users.find_one({"id": asset_type["assigned_asset_manager_id"]})
+            asset_manager = await loaders.users.load(asset_type["assigned_asset_manager_id"])
         
         # If no specific asset manager assigned, find asset managers from allocations
         if not asset_manager:
             allocation = await db.asset_allocations.find_one({"asset_definition_id": asset_def_id})
             if allocation and allocation.get("allocated_by"):
-                asset_manager = await db.users.find_one({"id": allocation["allocated_by"]})
-        
-        # Get manager details
-        manager = None
-        if current_user.reporting_manager_id:
-            manager = await db.users.find_one({"id": current_user.reporting_manager_id})
+                asset_manager = await loaders.users.load(allocation["allocated_by"])
         
         # Get HR managers
         hr_managers = await db.users.find({"roles": UserRole.HR_MANAGER, "is_active": True}).to_list(100)
@@ -1525,11 +2431,19 @@ async def get_my_allocated_assets(
 @api_router.post("/asset-requisitions", response_model=AssetRequisition)
 async def create_asset_requisition(
     requisition: AssetRequisitionCreate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Create a new asset requisition"""
+    # Look up the asset type, team member and manager together
+    requesting_for_team_member = requisition.request_for == RequestFor.TEAM_MEMBER
+    asset_type, team_member, manager = await asyncio.gather(
+        loaders.asset_types.load(requisition.asset_type_id),
+        loaders.users.load(requisition.team_member_employee_id if requesting_for_team_member else None),
+        loaders.users.load(current_user.reporting_manager_id)
+    )
+    
     # Verify asset type exists
-    asset_type = await db.asset_types.find_one({"id": requisition.asset_type_id})
     if not asset_type:
         raise HTTPException(status_code=400, detail="Asset type not found")
     
@@ -1555,7 +2469,6 @@ async def create_asset_requisition(
                 detail="Team member employee ID is required when requesting for team member"
             )
         
-        team_member = await db.users.find_one({"id": requisition.team_member_employee_id})
         if not team_member:
             raise HTTPException(status_code=400, detail="Team member not found")
         team_member_name = team_member["name"]
@@ -1566,7 +2479,10 @@ async def create_asset_requisition(
     requisition_dict["requested_by"] = current_user.id
     requisition_dict["requested_by_name"] = current_user.name
     requisition_dict["team_member_name"] = team_member_name
+    requisition_dict["requested_for_name"] = team_member_name or current_user.name
+    requisition_dict["status"] = RequisitionStatus.PENDING
     requisition_dict["created_at"] = datetime.now(timezone.utc)
+    requisition_dict["updated_at"] = requisition_dict["created_at"]
     
     # Set manager ID and name from the requesting user's reporting manager
     if current_user.reporting_manager_id:
@@ -1577,7 +2493,13 @@ async def create_asset_requisition(
     if requisition_dict.get("required_by_date") and isinstance(requisition_dict["required_by_date"], str):
         requisition_dict["required_by_date"] = datetime.fromisoformat(requisition_dict["required_by_date"])
     
+    # Allocation queue ordering and location queue membership
+    requisition_dict["queue_due_date"] = requisition_dict.get("required_by_date") or QUEUE_NO_DUE_DATE
+    requisition_dict["location_id"] = current_user.location_id
+    requisition_dict["search_terms"] = requisition_search_terms(requisition_dict)
+    
     await db.asset_requisitions.insert_one(requisition_dict)
+    await publish_requisition_events("created", [requisition_dict])
     
     # Send email notification for asset request
     try:
@@ -1585,8 +2507,6 @@ async def create_asset_requisition(
             # Trigger 1: When employee requests for an asset
             # To: Manager, CC: Employee, HR Manager
             
-            # Get manager details
-            manager = await db.users.find_one({"id": current_user.reporting_manager_id})
             # Get HR managers
             hr_managers = await db.users.find({"roles": UserRole.HR_MANAGER, "is_active": True}).to_list(100)
             
@@ -1615,58 +2535,147 @@ async def create_asset_requisition(
     
     return AssetRequisition(**requisition_dict)
 
-@api_router.get("/asset-requisitions", response_model=List[AssetRequisition])
-async def get_asset_requisitions(current_user: User = Depends(get_current_user)):
-    """Get asset requisitions based on user role"""
+REQUISITION_LIST_MAX_PAGE_SIZE = 200
+REQUISITION_SORT_FIELDS = [
+    "created_at", "required_by_date", "status", "request_type", "asset_type_name",
+    "requested_by_name", "requested_for_name", "id"
+]
+REQUISITION_SEARCH_FIELDS = ["asset_type_name", "requested_by_name", "requested_for_name", "team_member_name"]
+
+def requisition_search_terms(requisition: dict) -> List[str]:
+    """Case-folded keys the requisition search prefix-matches: the id, each searchable name and its parts"""
+    terms = {(requisition.get("id") or "").casefold()}
+    for field in REQUISITION_SEARCH_FIELDS:
+        name_key = " ".join((requisition.get(field) or "").casefold().split())
+        terms.update([name_key, *name_key.split()])
+    return sorted(terms - {""})
+
+async def refresh_requisition_search_terms(query: dict):
+    """Recompute search_terms on the requisitions matching query after their names changed"""
+    requisitions = await db.asset_requisitions.find(
+        query, {"_id": 0, "id": 1, **{field: 1 for field in REQUISITION_SEARCH_FIELDS}}
+    ).to_list(None)
+    if requisitions:
+        await db.asset_requisitions.bulk_write([
+            UpdateOne({"id": requisition["id"]}, {"$set": {"search_terms": requisition_search_terms(requisition)}})
+            for requisition in requisitions
+        ], ordered=False)
+
+def requisition_filter_query(
+    status: Optional[List[RequisitionStatus]],
+    asset_type_id: Optional[str],
+    request_type: Optional[RequestType],
+    requested_by: Optional[str],
+    assigned_to: Optional[str],
+    created_from: Optional[datetime],
+    created_to: Optional[datetime],
+    required_by_from: Optional[datetime],
+    required_by_to: Optional[datetime],
+    search: Optional[str]
+) -> List[dict]:
+    """Mongo conditions for the requisition list filters; equality filters come first so the indexes apply"""
+    conditions = []
+    if status:
+        conditions.append({"status": {"$in": status}})
+    for field, value in [("asset_type_id", asset_type_id), ("request_type", request_type),
+                         ("requested_by", requested_by), ("assigned_to", assigned_to)]:
+        if value:
+            conditions.append({field: value})
+    for field, start, end in [("created_at", created_from, created_to), ("required_by_date", required_by_from, required_by_to)]:
+        date_range = {}
+        if start:
+            date_range["$gte"] = start
+        if end:
+            date_range["$lte"] = end
+        if date_range:
+            conditions.append({field: date_range})
+    prefix = " ".join((search or "").casefold().split())
+    if prefix:
+        # Anchored prefix scan on the indexed search_terms keys (id, names and name parts)
+        conditions.append({"search_terms": {"$regex": f"^{re.escape(prefix)}"}})
+    return conditions
+
+@api_router.get("/asset-requisitions", response_model=Union[List[AssetRequisition], AssetRequisitionChanges])
+async def get_asset_requisitions(
+    response: Response,
+    updated_since: Optional[datetime] = None,
+    status: Optional[List[RequisitionStatus]] = Query(None),
+    asset_type_id: Optional[str] = None,
+    request_type: Optional[RequestType] = None,
+    requested_by: Optional[str] = None,
+    assigned_to: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    required_by_from: Optional[datetime] = None,
+    required_by_to: Optional[datetime] = None,
+    search: Optional[str] = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+    page: int = 1,
+    page_size: Optional[int] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Get asset requisitions based on user role, or only the changes since updated_since.
+
+    Filters, search and sorting run in Mongo. search matches the start of the requisition
+    id, an asset type or person name, or any word of those names, using the indexed
+    search_terms keys. Pass page_size to get one page; the total number of matching
+    requisitions is returned in the X-Total-Count header.
+    
+    The changes feed ignores the list filters: a requisition that stops matching them has
+    no tombstone, so every changed requisition is returned and the client drops the ones
+    that no longer match its view.
+    """
     if UserRole.EMPLOYEE in current_user.roles and len(current_user.roles) == 1:
         # Pure employees can only see their own requisitions
-        requisitions = await db.asset_requisitions.find({"requested_by": current_user.id}).to_list(1000)
+        query = {"requested_by": current_user.id}
     elif UserRole.MANAGER in current_user.roles:
-        # Managers can see requisitions from their direct reports
-        requisitions = await db.asset_requisitions.find({
-            "manager_id": current_user.id
-        }).to_list(1000)
+        # Managers can see requisitions from their whole reporting subtree
+        manager_ids = [current_user.id] + await get_subordinate_ids(current_user.id)
+        query = {"manager_id": {"$in": manager_ids}}
     else:
         # HR Managers and Administrators can see all requisitions
-        requisitions = await db.asset_requisitions.find().to_list(1000)
+        query = {}
+    
+    if updated_since:
+        requisitions, deleted_ids, next_updated_since = await find_changes_since("asset_requisitions", query, updated_since)
+        return AssetRequisitionChanges(
+            items=[AssetRequisition(**req) for req in requisitions],
+            deleted_ids=deleted_ids,
+            next_updated_since=next_updated_since
+        )
     
-    # Populate name fields for each requisition
-    enhanced_requisitions = []
-    for req in requisitions:
-        # Get requester info
-        requester = await db.users.find_one({"id": req["requested_by"]})
-        
-        # Populate requested_for_name based on request_for type
-        if req.get("request_for") == "Team Member" and req.get("team_member_employee_id"):
-            # Get team member info
-            team_member = await db.users.find_one({"id": req["team_member_employee_id"]})
-            req["requested_for_name"] = team_member["name"] if team_member else "Unknown Team Member"
-            req["team_member_name"] = team_member["name"] if team_member else None
-        else:
-            # Self request - use requester's name
-            req["requested_for_name"] = requester["name"] if requester else "Unknown User"
-        
-        # Populate other name fields
-        req["requested_by_name"] = requester["name"] if requester else "Unknown User"
-        
-        # Get asset type name
-        if req.get("asset_type_id"):
-            asset_type = await db.asset_types.find_one({"id": req["asset_type_id"]})
-            req["asset_type_name"] = asset_type["name"] if asset_type else None
-        
-        # Get manager approval info
-        if req.get("manager_approved_by"):
-            manager = await db.users.find_one({"id": req["manager_approved_by"]})
-            req["manager_approved_by_name"] = manager["name"] if manager else None
-            
-        # Get HR approval info  
-        if req.get("hr_approved_by"):
-            hr_manager = await db.users.find_one({"id": req["hr_approved_by"]})
-            req["hr_approved_by_name"] = hr_manager["name"] if hr_manager else None
-        
-        enhanced_requisitions.append(AssetRequisition(**req))
+    conditions = requisition_filter_query(
+        status, asset_type_id, request_type, requested_by, assigned_to,
+        created_from, created_to, required_by_from, required_by_to, search
+    )
+    if conditions:
+        query = {"$and": [query] + conditions}
+    
+    if sort_by not in REQUISITION_SORT_FIELDS:
+        raise HTTPException(status_code=400, detail=f"sort_by must be one of: {', '.join(REQUISITION_SORT_FIELDS)}")
+    if sort_order not in ["asc", "desc"]:
+        raise HTTPException(status_code=400, detail="sort_order must be 'asc' or 'desc'")
+    direction = 1 if sort_order == "asc" else -1
+    sort = [(sort_by, direction)] + ([("id", direction)] if sort_by != "id" else [])
+    
+    cursor = db.asset_requisitions.find(query, {"_id": 0}).sort(sort)
+    if page_size is not None:
+        if page < 1 or not 1 <= page_size <= REQUISITION_LIST_MAX_PAGE_SIZE:
+            raise HTTPException(
+                status_code=400,
+                detail=f"page must be at least 1 and page_size between 1 and {REQUISITION_LIST_MAX_PAGE_SIZE}"
+            )
+        total, requisitions = await asyncio.gather(
+            db.asset_requisitions.count_documents(query),
+            cursor.skip((page - 1) * page_size).limit(page_size).to_list(page_size)
+        )
+        response.headers["X-Total-Count"] = str(total)
+    else:
+        requisitions = await cursor.to_list(1000)
     
-    return enhanced_requisitions
+    # Names are denormalized at write time and kept current by name propagation
+    return [AssetRequisition(**req) for req in requisitions]
 
 @api_router.delete("/asset-requisitions/{requisition_id}")
 async def delete_asset_requisition(
@@ -1702,6 +2711,10 @@ async def delete_asset_requisition(
     result = await db.asset_requisitions.delete_one({"id": requisition_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Asset requisition not found")
+    await asyncio.gather(
+        record_deletions("asset_requisitions", [requisition_id]),
+        publish_requisition_events("deleted", [requisition])
+    )
     
     return {"message": "Asset requisition withdrawn successfully"}
 
@@ -1709,7 +2722,8 @@ async def delete_asset_requisition(
 async def manager_action_on_requisition(
     requisition_id: str,
     action_request: ManagerActionRequest,
-    current_user: User = Depends(require_role([UserRole.MANAGER, UserRole.ADMINISTRATOR]))
+    current_user: User = Depends(require_role([UserRole.MANAGER, UserRole.ADMINISTRATOR])),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Manager action on asset requisition (approve/reject/hold)"""
     # Get the requisition
@@ -1731,7 +2745,7 @@ async def manager_action_on_requisition(
     user_roles = current_user.roles if hasattr(current_user, 'roles') else [current_user.role] if hasattr(current_user, 'role') else []
     if UserRole.ADMINISTRATOR not in user_roles:
         # For managers, verify they are the reporting manager of the requester
-        requester = await db.users.find_one({"id": requisition["requested_by"]})
+        requester = await loaders.users.load(requisition["requested_by"])
         if not requester or requester.get("reporting_manager_id") != current_user.id:
             raise HTTPException(
                 status_code=403, 
@@ -1742,7 +2756,8 @@ async def manager_action_on_requisition(
     update_data = {
         "manager_action_by": current_user.id,
         "manager_action_by_name": current_user.name,
-        "manager_approval_date": datetime.now(timezone.utc)
+        "manager_approval_date": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
     }
     
     if action_request.action.lower() == "approve":
@@ -1762,23 +2777,24 @@ async def manager_action_on_requisition(
     
     # Enhanced Asset Allocation Logic - Route approved requests immediately
     if action_request.action.lower() == "approve":
-        await perform_asset_allocation_routing(requisition_id, requisition)
+        await perform_asset_allocation_routing(requisition_id, requisition, loaders)
     
     # Get updated requisition to return
     updated_requisition = await db.asset_requisitions.find_one({"id": requisition_id})
+    await publish_requisition_events("updated", [updated_requisition])
     
     # Send email notifications for manager action
     try:
         # Get employee details
-        requester = await db.users.find_one({"id": requisition["requested_by"]})
+        requester = await loaders.users.load(requisition["requested_by"])
         # Get HR managers
         hr_managers = await db.users.find({"roles": UserRole.HR_MANAGER, "is_active": True}).to_list(100)
         # Get asset manager if assigned to asset type
         asset_managers = []
         if requisition.get("asset_type_id"):
-            asset_type = await db.asset_types.find_one({"id": requisition["asset_type_id"]})
+            asset_type = await loaders.asset_types.load(requisition["asset_type_id"])
             if asset_type and asset_type.get("assigned_asset_manager_id"):
-                asset_manager = await db.users.find_one({"id": asset_type["assigned_asset_manager_id"]})
+                asset_manager = await loaders.users.load(asset_type["assigned_asset_manager_id"])
                 if asset_manager:
                     asset_managers.append(asset_manager)
         
@@ -1827,11 +2843,11 @@ async def manager_action_on_requisition(
         "requisition": AssetRequisition(**updated_requisition).dict()
     }
 
-async def perform_asset_allocation_routing(requisition_id: str, requisition: dict):
+async def perform_asset_allocation_routing(requisition_id: str, requisition: dict, loaders: Loaders):
     """Enhanced Asset Allocation Logic - Route approved requests based on available Asset Definitions with Asset Manager and Location"""
     try:
         # Get employee details (requester)
-        requested_user = await db.users.find_one({"id": requisition["requested_by"]})
+        requested_user = await loaders.users.load(requisition["requested_by"])
         if not requested_user:
             logging.error(f"Employee not found for requisition {requisition_id}")
             return
@@ -1926,23 +2942,21 @@ async def perform_asset_allocation_routing(requisition_id: str, requisition: dic
                         "assigned_to_name": assigned_person["name"],
                         "assigned_date": datetime.now(timezone.utc),
                         "routing_reason": routing_reason,
-                        "status": RequisitionStatus.ASSIGNED_FOR_ALLOCATION
+                        "location_id": employee_location_id,
+                        "status": RequisitionStatus.ASSIGNED_FOR_ALLOCATION,
+                        "updated_at": datetime.now(timezone.utc)
                     }
                 }
             )
             
             # Step 6: Send notification emails about the routing
             try:
-                # Get manager details
-                manager = None
-                if requested_user.get("reporting_manager_id"):
-                    manager = await db.users.find_one({"id": requested_user["reporting_manager_id"]})
-                
-                # Get HR managers
-                hr_managers = await db.users.find({"roles": UserRole.HR_MANAGER, "is_active": True}).to_list(100)
-                
-                # Get asset type for context
-                asset_type = await db.asset_types.find_one({"id": requisition["asset_type_id"]})
+                # Get manager, HR managers and asset type for context
+                manager, hr_managers, asset_type = await asyncio.gather(
+                    loaders.users.load(requested_user.get("reporting_manager_id")),
+                    db.users.find({"roles": UserRole.HR_MANAGER, "is_active": True}).to_list(100),
+                    loaders.asset_types.load(requisition["asset_type_id"])
+                )
                 
                 # Prepare email recipients
                 to_emails = [assigned_person["email"]]  # Primary recipient: assigned Asset Manager/Administrator
@@ -1989,7 +3003,8 @@ async def perform_asset_allocation_routing(requisition_id: str, requisition: dic
 async def hr_action_on_requisition(
     requisition_id: str,
     action_request: HRActionRequest,
-    current_user: User = Depends(require_role([UserRole.HR_MANAGER, UserRole.ADMINISTRATOR]))
+    current_user: User = Depends(require_role([UserRole.HR_MANAGER, UserRole.ADMINISTRATOR])),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """HR Manager action on asset requisition (approve/reject/hold)"""
     # Get the requisition
@@ -2009,7 +3024,8 @@ async def hr_action_on_requisition(
     update_data = {
         "hr_action_by": current_user.id,
         "hr_action_by_name": current_user.name,
-        "hr_approval_date": datetime.now(timezone.utc)
+        "hr_approval_date": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
     }
     
     if action_request.action.lower() == "approve":
@@ -2029,10 +3045,11 @@ async def hr_action_on_requisition(
     
     # Enhanced Asset Allocation Logic - Route approved requests immediately
     if action_request.action.lower() == "approve":
-        await perform_asset_allocation_routing(requisition_id, requisition)
+        await perform_asset_allocation_routing(requisition_id, requisition, loaders)
     
     # Get updated requisition to return
     updated_requisition = await db.asset_requisitions.find_one({"id": requisition_id})
+    await publish_requisition_events("updated", [updated_requisition])
     
     return {
         "message": f"Requisition {action_request.action.lower()}ed successfully",
@@ -2063,25 +3080,25 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
         stats["pending_requisitions"] = pending_requisitions
     
     if UserRole.MANAGER in current_user.roles:
-        # Manager-specific statistics: requests from their direct reports
-        # Get all requisitions from the manager's direct reports
+        # Manager-specific statistics: requests from their whole reporting subtree
+        subtree_manager_ids = {"$in": [current_user.id] + await get_subordinate_ids(current_user.id)}
         total_requisitions = await db.asset_requisitions.count_documents({
-            "manager_id": current_user.id
+            "manager_id": subtree_manager_ids
         })
         
         approved_requests = await db.asset_requisitions.count_documents({
-            "manager_id": current_user.id,
+            "manager_id": subtree_manager_ids,
             "status": RequisitionStatus.MANAGER_APPROVED
         })
         
         rejected_requests = await db.asset_requisitions.count_documents({
-            "manager_id": current_user.id, 
+            "manager_id": subtree_manager_ids, 
             "status": RequisitionStatus.REJECTED,
             "manager_rejection_reason": {"$exists": True}
         })
         
         held_requests = await db.asset_requisitions.count_documents({
-            "manager_id": current_user.id,
+            "manager_id": subtree_manager_ids,
             "status": RequisitionStatus.ON_HOLD
         })
         
@@ -2102,6 +3119,69 @@ async def get_dashboard_stats(current_user: User = Depends(get_current_user)):
     
     return stats
 
+USER_SEARCH_MAX_RESULTS = 50
+
+def user_search_terms(name: Optional[str], email: Optional[str]) -> List[str]:
+    """Case-folded keys the user typeahead prefix-matches: full name, each name part and email"""
+    name_key = " ".join((name or "").casefold().split())
+    return sorted({name_key, *name_key.split(), (email or "").casefold()} - {""})
+
+# Reporting hierarchy: a closure table in user_hierarchy with one row per (ancestor_id,
+# descendant_id) pair at every depth >= 1, kept in step with reporting_manager_id.
+async def get_subordinate_ids(manager_id: str) -> List[str]:
+    """All users reporting to manager_id directly or indirectly"""
+    return await db.user_hierarchy.distinct("descendant_id", {"ancestor_id": manager_id})
+
+async def set_reporting_manager_in_hierarchy(user_id: str, reporting_manager_id: Optional[str]):
+    """Move a user, with everyone below them, under a new reporting manager (or to the top).
+
+    Links from the user's subtree to their old ancestors are deleted and links to the new
+    manager's chain are inserted, so only the affected rows are touched.
+    """
+    lookups = [
+        db.user_hierarchy.find({"ancestor_id": user_id}, {"_id": 0, "descendant_id": 1, "depth": 1}).to_list(None),
+        db.user_hierarchy.distinct("ancestor_id", {"descendant_id": user_id})
+    ]
+    if reporting_manager_id:
+        lookups.append(db.user_hierarchy.find(
+            {"descendant_id": reporting_manager_id}, {"_id": 0, "ancestor_id": 1, "depth": 1}
+        ).to_list(None))
+    results = await asyncio.gather(*lookups)
+    subtree_rows, old_ancestor_ids = results[0], results[1]
+    new_ancestor_rows = results[2] if reporting_manager_id else []
+    subtree = [(user_id, 0)] + [(row["descendant_id"], row["depth"]) for row in subtree_rows]
+    
+    if old_ancestor_ids:
+        await db.user_hierarchy.delete_many({
+            "descendant_id": {"$in": [descendant_id for descendant_id, _ in subtree]},
+            "ancestor_id": {"$in": old_ancestor_ids}
+        })
+    if reporting_manager_id:
+        ancestors = [(reporting_manager_id, 0)] + [(row["ancestor_id"], row["depth"]) for row in new_ancestor_rows]
+        await db.user_hierarchy.insert_many([
+            {"ancestor_id": ancestor_id, "descendant_id": descendant_id, "depth": ancestor_depth + descendant_depth + 1}
+            for ancestor_id, ancestor_depth in ancestors
+            for descendant_id, descendant_depth in subtree
+        ])
+
+async def rebuild_user_hierarchy() -> int:
+    """Rebuild the whole closure table from reporting_manager_id; returns the number of links"""
+    users = await db.users.find({}, {"_id": 0, "id": 1, "reporting_manager_id": 1}).to_list(None)
+    managers = {user["id"]: user.get("reporting_manager_id") for user in users}
+    rows = []
+    for user_id in managers:
+        ancestor_id, depth, seen = managers[user_id], 1, {user_id}
+        # Stop at the top of the chain, at unknown managers and at cycles
+        while ancestor_id and ancestor_id in managers and ancestor_id not in seen:
+            rows.append({"ancestor_id": ancestor_id, "descendant_id": user_id, "depth": depth})
+            seen.add(ancestor_id)
+            ancestor_id, depth = managers[ancestor_id], depth + 1
+    
+    await db.user_hierarchy.delete_many({})
+    if rows:
+        await db.user_hierarchy.insert_many(rows)
+    return len(rows)
+
 # User Management Routes (Administrator only)
 @api_router.post("/users", response_model=User)
 async def create_user(
@@ -2150,11 +3230,15 @@ async def create_user(
         "location_id": user_data.location_id,
         "location_name": location_name,
         "password_hash": password_hash,
+        "search_terms": user_search_terms(user_data.name, user_data.email),
         "created_at": datetime.now(timezone.utc),
         "is_active": True
     }
     
     await db.users.insert_one(user_dict)
+    await bump_collection_versions("users")
+    if user_data.reporting_manager_id:
+        await set_reporting_manager_in_hierarchy(user_dict["id"], user_data.reporting_manager_id)
     user_dict.pop("password_hash", None)  # Don't return password hash
     return User(**user_dict)
 
@@ -2166,21 +3250,267 @@ async def get_users(
     users = await db.users.find({}, {"password_hash": 0}).to_list(1000)
     return [User(**user) for user in users]
 
+BULK_USER_IMPORT_REQUIRED_COLUMNS = ['email', 'name', 'password']
+BULK_USER_IMPORT_COLUMNS = BULK_USER_IMPORT_REQUIRED_COLUMNS + [
+    'roles', 'designation', 'date_of_joining', 'reporting_manager_email', 'location_code'
+]
+
+# Case-insensitive matching for email lookups, backed by the users email index of the same collation
+EMAIL_COLLATION = Collation(locale="en", strength=CollationStrength.SECONDARY)
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Process pool worker: hash a chunk of passwords the same way create_user does"""
+    return [hashlib.sha256(password.encode()).hexdigest() for password in passwords]
+
+@api_router.post("/users/bulk-import", response_model=BulkImportResult)
+async def bulk_import_users(
+    file: UploadFile = File(...),
+    current_user: User = Depends(require_role([UserRole.ADMINISTRATOR]))
+):
+    """Create users in bulk from an HRIS CSV or XLSX export.
+
+    Reporting managers may be existing users or rows of the same file; rows are created in
+    reporting order so managers always come before their reports. Emails, managers and
+    locations are resolved in memory, passwords are hashed on the import process pool and
+    users are inserted with insert_many in chunks.
+    """
+    if not file.filename.endswith(('.csv', '.xlsx')):
+        raise HTTPException(status_code=400, detail="Only CSV and XLSX files are allowed")
+    
+    try:
+        async with contextlib.aclosing(iter_upload_frames(file)) as upload_frames:
+            frames = [df async for df in upload_frames]
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
+    
+    columns = list(frames[0].columns) if frames else []
+    missing_columns = [col for col in BULK_USER_IMPORT_REQUIRED_COLUMNS if col not in columns]
+    if missing_columns:
+        raise HTTPException(status_code=400, detail=f"Missing required columns: {', '.join(missing_columns)}")
+    unknown_columns = [col for col in columns if col not in BULK_USER_IMPORT_COLUMNS]
+    if unknown_columns:
+        raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown_columns)}")
+    
+    records = [
+        (str(index + 2), {col: (value or '').strip() for col, value in record.items()})
+        for df in frames
+        for index, record in zip(df.index, df.astype(object).where(df.notna(), None).to_dict('records'))
+    ]
+    errors = []
+    
+    # Parse and validate each row on its own
+    rows = {}  # Case-folded email -> parsed row
+    for row, record in records:
+        missing = [col for col in BULK_USER_IMPORT_REQUIRED_COLUMNS if not record.get(col)]
+        if missing:
+            errors.append({'row': row, 'error': f'Missing required value(s): {", ".join(missing)}'})
+            continue
+        email_key = record['email'].casefold()
+        if email_key in rows:
+            errors.append({'row': row, 'error': f'Duplicate email "{record["email"]}" in file (row {rows[email_key]["row"]})'})
+            continue
+        try:
+            user_data = UserCreate(
+                email=record['email'],
+                name=record['name'],
+                password=record['password'],
+                roles=[role.strip() for role in re.split(r'[;,]', record.get('roles') or '') if role.strip()] or [UserRole.EMPLOYEE],
+                designation=record.get('designation') or None,
+                date_of_joining=record.get('date_of_joining') or None
+            )
+        except ValidationError as e:
+            first_error = e.errors()[0]
+            errors.append({'row': row, 'error': f"Invalid {first_error['loc'][0]}: {first_error['msg']}"})
+            continue
+        rows[email_key] = {
+            'row': row,
+            'user_data': user_data,
+            'manager_key': (record.get('reporting_manager_email') or '').casefold(),
+            'location_code': record.get('location_code') or None
+        }
+    
+    # Resolve existing users and locations with one query each; stored emails may be mixed case
+    emails = {row['user_data'].email for row in rows.values()} | {row['manager_key'] for row in rows.values() if row['manager_key']}
+    existing_users, locations = await asyncio.gather(
+        db.users.find(
+            {"email": {"$in": list(emails)}},
+            {"_id": 0, "id": 1, "email": 1, "name": 1, "roles": 1},
+            collation=EMAIL_COLLATION
+        ).to_list(None),
+        db.locations.find({"status": ActiveStatus.ACTIVE}, {"_id": 0, "id": 1, "code": 1, "name": 1}).to_list(None)
+    )
+    existing_by_email = {user["email"].casefold(): user for user in existing_users}
+    locations_by_code = {location["code"]: location for location in locations}
+    
+    for email_key in [key for key in rows if key in existing_by_email]:
+        errors.append({'row': rows.pop(email_key)['row'], 'error': 'User with this email already exists'})
+    
+    def row_error(email_key: str) -> Optional[str]:
+        """Problems with a row's own manager and location references"""
+        entry = rows[email_key]
+        manager_key = entry['manager_key']
+        if manager_key:
+            manager_roles = (rows[manager_key]['user_data'].roles if manager_key in rows
+                             else existing_by_email.get(manager_key, {}).get("roles"))
+            if manager_roles is None:
+                return f'Reporting manager "{manager_key}" not found'
+            if UserRole.MANAGER not in manager_roles:
+                return 'Selected reporting manager must have Manager role'
+        if entry['location_code'] and entry['location_code'] not in locations_by_code:
+            return f'Location code "{entry["location_code"]}" not found'
+        return None
+    
+    # Order rows so in-file managers come before their reports (Kahn's algorithm)
+    reports = collections.defaultdict(list)
+    for email_key, entry in rows.items():
+        if entry['manager_key'] in rows:
+            reports[entry['manager_key']].append(email_key)
+    queue = collections.deque(key for key, entry in rows.items() if entry['manager_key'] not in rows)
+    ordered, failed, reached = [], set(), set(queue)
+    while queue:
+        email_key = queue.popleft()
+        manager_key = rows[email_key]['manager_key']
+        if manager_key in failed:
+            error = f'Reporting manager in row {rows[manager_key]["row"]} could not be imported'
+        else:
+            error = row_error(email_key)
+        if error:
+            errors.append({'row': rows[email_key]['row'], 'error': error})
+            failed.add(email_key)
+        else:
+            ordered.append(email_key)
+        queue.extend(reports[email_key])
+        reached.update(reports[email_key])
+    for email_key in rows.keys() - reached:
+        errors.append({'row': rows[email_key]['row'], 'error': 'Reporting lines in the file form a cycle'})
+    
+    # Hash passwords on the process pool, one task per chunk
+    loop = asyncio.get_running_loop()
+    pool = get_import_process_pool()
+    chunks = [ordered[i:i + BULK_IMPORT_BATCH_SIZE] for i in range(0, len(ordered), BULK_IMPORT_BATCH_SIZE)]
+    hashed_chunks = await asyncio.gather(*[
+        loop.run_in_executor(pool, hash_passwords, [rows[key]['user_data'].password for key in chunk])
+        for chunk in chunks
+    ])
+    
+    ids = {key: str(uuid.uuid4()) for key in ordered}
+    created_ids = []
+    for chunk, password_hashes in zip(chunks, hashed_chunks):
+        user_dicts = []
+        for email_key, password_hash in zip(chunk, password_hashes):
+            entry = rows[email_key]
+            user_data = entry['user_data']
+            manager = (
+                {"id": ids[entry['manager_key']], "name": rows[entry['manager_key']]['user_data'].name}
+                if entry['manager_key'] in rows else existing_by_email.get(entry['manager_key'])
+            )
+            location = locations_by_code.get(entry['location_code'])
+            user_dicts.append({
+                "id": ids[email_key],
+                "email": user_data.email,
+                "name": user_data.name,
+                "roles": user_data.roles,
+                "designation": user_data.designation,
+                "date_of_joining": user_data.date_of_joining,
+                "reporting_manager_id": manager["id"] if manager else None,
+                "reporting_manager_name": manager["name"] if manager else None,
+                "location_id": location["id"] if location else None,
+                "location_name": location["name"] if location else None,
+                "password_hash": password_hash,
+                "search_terms": user_search_terms(user_data.name, user_data.email),
+                "created_at": datetime.now(timezone.utc),
+                "is_active": True
+            })
+        failed_indexes = set()
+        try:
+            await db.users.insert_many(user_dicts, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                failed_indexes.add(write_error["index"])
+                errors.append({
+                    'row': rows[chunk[write_error["index"]]]['row'],
+                    'error': write_error.get("errmsg", "Insert failed")
+                })
+        created_ids.extend(user["id"] for i, user in enumerate(user_dicts) if i not in failed_indexes)
+    
+    # Extend the reporting hierarchy in memory from the managers' existing chains
+    if created_ids:
+        await bump_collection_versions("users")
+        managers_by_user = {
+            ids[key]: ids[rows[key]['manager_key']] if rows[key]['manager_key'] in rows else existing_by_email[rows[key]['manager_key']]["id"]
+            for key in ordered if rows[key]['manager_key']
+        }
+        existing_manager_ids = list(set(managers_by_user.values()) - set(ids.values()))
+        existing_chains = await db.user_hierarchy.find(
+            {"descendant_id": {"$in": existing_manager_ids}}, {"_id": 0}
+        ).to_list(None)
+        ancestors = collections.defaultdict(list)
+        for link in existing_chains:
+            ancestors[link["descendant_id"]].append((link["ancestor_id"], link["depth"]))
+        created = set(created_ids)
+        hierarchy_rows = []
+        for key in ordered:  # Managers are always processed before their reports
+            user_id = ids[key]
+            manager_id = managers_by_user.get(user_id)
+            if manager_id:
+                ancestors[user_id] = [(manager_id, 1)] + [(ancestor_id, depth + 1) for ancestor_id, depth in ancestors[manager_id]]
+                if user_id in created:
+                    hierarchy_rows.extend(
+                        {"ancestor_id": ancestor_id, "descendant_id": user_id, "depth": depth}
+                        for ancestor_id, depth in ancestors[user_id]
+                    )
+        if hierarchy_rows:
+            await db.user_hierarchy.insert_many(hierarchy_rows, ordered=False)
+    
+    errors.sort(key=lambda e: int(e['row']))
+    return BulkImportResult(
+        success=len(created_ids) > 0,
+        message=f"Import completed. {len(created_ids)} users created, {len(errors)} failed.",
+        total_rows=len(records),
+        successful_imports=len(created_ids),
+        failed_imports=len(errors),
+        errors=errors
+    )
+
 @api_router.get("/users/managers", response_model=List[User])
 async def get_managers(
     current_user: User = Depends(require_role([UserRole.ADMINISTRATOR]))
 ):
     """Get all users with Manager role"""
-    managers = await db.users.find({"roles": UserRole.MANAGER, "is_active": True}, {"password_hash": 0}).to_list(1000)
-    return [User(**manager) for manager in managers]
+    _, reference_data = await get_reference_data()
+    return reference_data["managers"]
 
 @api_router.get("/users/asset-managers", response_model=List[User])
 async def get_asset_managers(
     current_user: User = Depends(require_role([UserRole.ADMINISTRATOR, UserRole.HR_MANAGER]))
 ):
     """Get all users with Asset Manager role"""
-    asset_managers = await db.users.find({"roles": UserRole.ASSET_MANAGER, "is_active": True}, {"password_hash": 0}).to_list(1000)
-    return [User(**asset_manager) for asset_manager in asset_managers]
+    _, reference_data = await get_reference_data()
+    return reference_data["asset_managers"]
+
+@api_router.get("/users/search", response_model=List[UserSummary])
+async def search_users(
+    q: str = "",
+    role: Optional[UserRole] = None,
+    limit: int = 10,
+    current_user: User = Depends(get_current_user)
+):
+    """Typeahead for user pickers: active users whose name, a name part or email starts with q.
+
+    Matches are an anchored prefix scan on the indexed search_terms keys, so only up to
+    limit users are read.
+    """
+    prefix = " ".join(q.casefold().split())
+    if not prefix:
+        return []
+    
+    query = {"search_terms": {"$regex": f"^{re.escape(prefix)}"}, "is_active": True}
+    if role:
+        query["roles"] = role
+    users = await db.users.find(
+        query, {"_id": 0, "id": 1, "name": 1, "email": 1, "location_id": 1, "location_name": 1}
+    ).limit(max(1, min(limit, USER_SEARCH_MAX_RESULTS))).to_list(None)
+    return sorted((UserSummary(**user) for user in users), key=lambda user: user.name.casefold())
 
 @api_router.get("/users/{user_id}", response_model=User)
 async def get_user(
@@ -2197,15 +3527,18 @@ async def get_user(
 async def update_user(
     user_id: str,
     user_update: UserUpdate,
-    current_user: User = Depends(require_role([UserRole.ADMINISTRATOR]))
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_role([UserRole.ADMINISTRATOR])),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Update a user"""
-    existing_user = await db.users.find_one({"id": user_id})
+    update_data = user_update.dict(exclude_unset=True)
+    
+    # The user and a new reporting manager are fetched with one query
+    existing_user, reporting_manager = await loaders.users.load_many([user_id, update_data.get("reporting_manager_id")])
     if not existing_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    update_data = user_update.dict(exclude_unset=True)
-    
     # Validate email uniqueness if provided
     if "email" in update_data and update_data["email"]:
         # Check if email already exists (excluding current user)
@@ -2227,7 +3560,6 @@ async def update_user(
     # Validate and update reporting manager if provided
     if "reporting_manager_id" in update_data:
         if update_data["reporting_manager_id"]:
-            reporting_manager = await db.users.find_one({"id": update_data["reporting_manager_id"]})
             if not reporting_manager:
                 raise HTTPException(status_code=400, detail="Reporting manager not found")
             
@@ -2235,6 +3567,10 @@ async def update_user(
             manager_roles = reporting_manager.get("roles", [])
             if UserRole.MANAGER not in manager_roles:
                 raise HTTPException(status_code=400, detail="Selected reporting manager must have Manager role")
+            
+            # Reporting lines must not loop back to the user
+            if update_data["reporting_manager_id"] == user_id or update_data["reporting_manager_id"] in await get_subordinate_ids(user_id):
+                raise HTTPException(status_code=400, detail="A user cannot report to themselves or to one of their own reports")
             update_data["reporting_manager_name"] = reporting_manager["name"]
         else:
             # Clear reporting manager
@@ -2251,13 +3587,25 @@ async def update_user(
             # Clear location
             update_data["location_name"] = None
     
+    # Keep the typeahead keys in step with the name and email
+    if update_data.get("name") or update_data.get("email"):
+        update_data["search_terms"] = user_search_terms(
+            update_data.get("name") or existing_user.get("name"),
+            update_data.get("email") or existing_user.get("email")
+        )
+    
     if update_data:
         await db.users.update_one({"id": user_id}, {"$set": update_data})
+        await bump_collection_versions("users")
+        if "reporting_manager_id" in update_data and update_data["reporting_manager_id"] != existing_user.get("reporting_manager_id"):
+            await set_reporting_manager_in_hierarchy(user_id, update_data["reporting_manager_id"])
+        if update_data.get("name") and update_data["name"] != existing_user["name"]:
+            await queue_name_propagation("users", user_id, update_data["name"], current_user.id, background_tasks)
         updated_user = await db.users.find_one({"id": user_id}, {"password_hash": 0})
         return User(**updated_user)
     
-    existing_user.pop("password_hash", None)
-    return User(**existing_user)
+    # Loaded documents are shared, so drop the hash from a copy
+    return User(**{field: value for field, value in existing_user.items() if field != "password_hash"})
 
 @api_router.delete("/users/{user_id}")
 async def delete_user(
@@ -2272,6 +3620,11 @@ async def delete_user(
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="User not found")
     
+    await asyncio.gather(
+        db.user_hierarchy.delete_many({"$or": [{"ancestor_id": user_id}, {"descendant_id": user_id}]}),
+        bump_collection_versions("users")
+    )
+    
     return {"message": "User deleted successfully"}
 
 # Company Profile Routes
@@ -2289,6 +3642,7 @@ async def create_company_profile(
         update_data = profile_data.dict()
         update_data["updated_at"] = datetime.now(timezone.utc)
         await db.company_profile.update_one({}, {"$set": update_data})
+        await bump_collection_versions("company_profile")
         updated_profile = await db.company_profile.find_one({})
         return CompanyProfile(**updated_profile)
     else:
@@ -2298,22 +3652,15 @@ async def create_company_profile(
         profile_dict["created_at"] = datetime.now(timezone.utc)
         profile_dict["updated_at"] = datetime.now(timezone.utc)
         await db.company_profile.insert_one(profile_dict)
+        await bump_collection_versions("company_profile")
         return CompanyProfile(**profile_dict)
 
 @api_router.get("/company-profile", response_model=CompanyProfile)
 async def get_company_profile():
     """Get company profile (public endpoint)"""
-    profile = await db.company_profile.find_one({})
-    if not profile:
-        # Return default profile
-        default_profile = {
-            "id": str(uuid.uuid4()),
-            "company_name": "Your Company Name",
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
-        }
-        return CompanyProfile(**default_profile)
-    return CompanyProfile(**profile)
+    # Falls back to a default profile until one is saved
+    _, reference_data = await get_reference_data()
+    return reference_data["company_profile"]
 
 @api_router.put("/company-profile", response_model=CompanyProfile)
 async def update_company_profile(
@@ -2336,12 +3683,46 @@ async def update_company_profile(
         profile_dict["company_name"] = profile_dict.get("company_name", "Your Company Name")
         profile_dict["created_at"] = datetime.now(timezone.utc)
         await db.company_profile.insert_one(profile_dict)
+        await bump_collection_versions("company_profile")
         return CompanyProfile(**profile_dict)
     else:
         await db.company_profile.update_one({}, {"$set": update_data})
+        await bump_collection_versions("company_profile")
         updated_profile = await db.company_profile.find_one({})
         return CompanyProfile(**updated_profile)
 
+# Bootstrap Route
+@api_router.get("/bootstrap")
+async def get_bootstrap(
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """Reference data needed on page load in one cached, compressed response"""
+    version, reference_data = await get_reference_data()
+    sections = tuple(
+        section for section, roles in REFERENCE_DATA_SECTIONS.items()
+        if roles is None or user_has_any_role(current_user, roles)
+    )
+    # Each role mix sees different sections, so it gets its own body and ETag
+    variant = hashlib.sha1(",".join(sections).encode()).hexdigest()[:8]
+    etag = f'"{version}-{variant}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding, Authorization"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    cache_key = (version, sections)
+    bodies = reference_data_cache["bodies"]
+    if cache_key not in bodies:
+        payload = {section: reference_data[section] for section in sections}
+        payload["version"] = version
+        body = json.dumps(jsonable_encoder(payload)).encode()
+        bodies[cache_key] = (body, gzip.compress(body))
+    body, compressed_body = bodies[cache_key]
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=compressed_body, media_type="application/json", headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
 # Password Change Route
 @api_router.post("/auth/change-password")
 async def change_password(
@@ -2375,138 +3756,786 @@ async def change_password(
     return {"message": "Password changed successfully"}
 
 
-@api_router.post("/asset-definitions/bulk-import", response_model=BulkImportResult)
-async def bulk_import_asset_definitions(
-    file: UploadFile = File(...),
-    current_user: User = Depends(require_role([UserRole.ADMINISTRATOR, UserRole.HR_MANAGER]))
-):
-    """Bulk import asset definitions from CSV file"""
-    if not file.filename.endswith('.csv'):
-        raise HTTPException(status_code=400, detail="Only CSV files are allowed")
+BULK_IMPORT_REQUIRED_COLUMNS = ['asset_type_code', 'asset_code', 'asset_description', 'asset_details', 'asset_value']
+BULK_IMPORT_BATCH_SIZE = 1000
+BULK_IMPORT_BLOCK_BYTES = 1024 * 1024  # Raw CSV bytes parsed per process pool task
+IMPORT_PROCESS_WORKERS = int(os.environ.get('IMPORT_PROCESS_WORKERS', min(4, os.cpu_count() or 1)))
+import_process_pool: Optional[ProcessPoolExecutor] = None
+
+def validate_asset_definition_frame(df: pd.DataFrame, asset_type_lookup: Dict[str, dict]):
+    """Validate a bulk import frame column-wise instead of row by row.
+
+    Expects the frame to be read with dtype=str. Returns the frame of valid rows (with
+    numeric columns converted) and the per-row errors in the BulkImportResult format.
+    Row numbers are the pandas index + 2 for the header line. Duplicate codes are only
+    detected within the frame; callers processing a file in blocks check across blocks.
+    """
+    row_numbers = pd.Series(df.index + 2, index=df.index)
+    text = {
+        col: df[col].str.strip().replace('', None)
+        for col in ['asset_type_code', 'asset_code', 'asset_description', 'asset_details', 'asset_value']
+    }
+    asset_value = pd.to_numeric(text['asset_value'], errors='coerce')
+    empty_column = pd.Series(None, index=df.index, dtype=object)
+    depreciation_raw = df.get('asset_depreciation_value_per_year', empty_column).str.strip().replace('', None)
+    depreciation = pd.to_numeric(depreciation_raw, errors='coerce')
+    status_values = df.get('status', empty_column).str.strip().replace('', None).fillna(AssetStatus.AVAILABLE.value)
+    
+    error = pd.Series(None, index=df.index, dtype=object)
+    
+    def flag(condition: pd.Series, message):
+        nonlocal error
+        error = error.mask(error.isna() & condition, message)
+    
+    # Checks are applied in order; only the first failure is reported for a row
+    missing = pd.DataFrame({col: values.isna() for col, values in text.items()})
+    flag(missing.any(axis=1), 'Missing required value(s): ' + missing.dot(missing.columns + ', ').str.rstrip(', '))
+    flag(~text['asset_type_code'].isin(asset_type_lookup.keys()),
+         'Asset type code "' + text['asset_type_code'].astype(str) + '" not found')
+    flag(asset_value.isna(), 'Invalid asset value "' + text['asset_value'].astype(str) + '"')
+    flag(depreciation_raw.notna() & depreciation.isna(),
+         'Invalid depreciation value "' + depreciation_raw.astype(str) + '"')
+    flag(~status_values.isin([s.value for s in AssetStatus]),
+         'Invalid status "' + status_values.astype(str) + '"')
+    
+    # Duplicate asset codes inside the file: the first otherwise valid occurrence wins
+    flag(text['asset_code'].where(error.isna()).duplicated(keep='first'),
+         'Duplicate asset code "' + text['asset_code'].astype(str) + '" in file')
+    
+    invalid = error.notna()
+    errors = [
+        {'row': str(row), 'error': message}
+        for row, message in zip(row_numbers[invalid], error[invalid])
+    ]
     
-    try:
-        contents = await file.read()
-        df = pd.read_csv(io.BytesIO(contents))
-        
-        required_columns = ['asset_type_code', 'asset_code', 'asset_description', 'asset_details', 'asset_value']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+    valid = ~invalid
+    valid_df = pd.DataFrame({
+        'row': row_numbers[valid],
+        'asset_type_code': text['asset_type_code'][valid],
+        'asset_code': text['asset_code'][valid],
+        'asset_description': text['asset_description'][valid],
+        'asset_details': text['asset_details'][valid],
+        'asset_value': asset_value[valid].astype(float),
+        'asset_depreciation_value_per_year': depreciation[valid].astype(object).where(depreciation[valid].notna(), None),
+        'status': status_values[valid],
+    })
+    return valid_df, errors
+
+async def insert_asset_definition_batches(valid_df: pd.DataFrame, asset_type_lookup: Dict[str, dict], created_by: str):
+    """Insert validated rows in batches, skipping codes that already exist.
+
+    Existing codes are resolved with one $in query per batch and the batch is written with
+    a single unordered insert_many. Returns (successful_imports, errors).
+    """
+    successful_imports = 0
+    errors = []
+    
+    for start in range(0, len(valid_df), BULK_IMPORT_BATCH_SIZE):
+        batch = valid_df.iloc[start:start + BULK_IMPORT_BATCH_SIZE]
+        codes = batch['asset_code'].tolist()
         
-        if missing_columns:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Missing required columns: {', '.join(missing_columns)}"
-            )
+        existing = await db.asset_definitions.find(
+            {"asset_code": {"$in": codes}}, {"_id": 0, "asset_code": 1}
+        ).to_list(None)
+        existing_codes = {doc["asset_code"] for doc in existing}
         
-        total_rows = len(df)
-        successful_imports = 0
-        failed_imports = 0
-        errors = []
+        exists_mask = batch['asset_code'].isin(existing_codes)
+        errors.extend(
+            {'row': str(row), 'error': f'Asset code "{code}" already exists'}
+            for row, code in zip(batch['row'][exists_mask], batch['asset_code'][exists_mask])
+        )
+        batch = batch[~exists_mask]
+        if batch.empty:
+            continue
         
-        # Get all asset types for lookup
-        asset_types = await db.asset_types.find().to_list(1000)
-        asset_type_lookup = {at['code']: at for at in asset_types}
+        created_at = datetime.now(timezone.utc)
+        rows = batch['row'].tolist()
+        documents = []
+        for record in batch.drop(columns=['row']).to_dict('records'):
+            asset_type = asset_type_lookup[record.pop('asset_type_code')]
+            record.update({
+                "id": str(uuid.uuid4()),
+                "asset_type_id": asset_type['id'],
+                "asset_type_name": asset_type['name'],
+                "current_depreciation_value": record['asset_value'],  # Initial value
+                "created_at": created_at,
+                "created_by": created_by,
+                "updated_at": created_at
+            })
+            documents.append(record)
         
-        for index, row in df.iterrows():
-            try:
-                # Validate asset type exists
-                asset_type_code = row['asset_type_code']
-                if asset_type_code not in asset_type_lookup:
-                    errors.append({
-                        'row': index + 2,  # +2 because pandas is 0-indexed and CSV has header
-                        'error': f'Asset type code "{asset_type_code}" not found'
-                    })
-                    failed_imports += 1
+        try:
+            result = await db.asset_definitions.insert_many(documents, ordered=False)
+            successful_imports += len(result.inserted_ids)
+        except BulkWriteError as e:
+            successful_imports += e.details.get("nInserted", 0)
+            for write_error in e.details.get("writeErrors", []):
+                index = write_error["index"]
+                message = write_error.get("errmsg", "Insert failed")
+                if write_error.get("code") == 11000:
+                    message = f'Asset code "{documents[index]["asset_code"]}" already exists'
+                errors.append({'row': str(rows[index]), 'error': message})
+    
+    if successful_imports:
+        await bump_collection_versions("asset_definitions")
+    return successful_imports, errors
+
+def iter_bulk_import_frames(fileobj, filename: str, chunk_size: int = BULK_IMPORT_BATCH_SIZE):
+    """Yield a CSV/XLSX file as string-typed DataFrames of chunk_size rows.
+
+    Reads straight from the file object so only one chunk is held in memory at a time.
+    The frame index continues across chunks, and a header-only file yields one empty
+    frame so callers can still validate the columns.
+    """
+    fileobj.seek(0)
+    if filename.endswith('.xlsx'):
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None) or ()
+            columns = [str(col).strip() if col is not None else '' for col in header]
+            batch, index = [], []
+            yielded = False
+            for position, row in enumerate(rows):
+                # Skip rows that are entirely empty, as pandas does for CSV
+                if all(value is None for value in row):
                     continue
+                values = [str(value) if value is not None else None for value in row[:len(columns)]]
+                batch.append(values + [None] * (len(columns) - len(values)))
+                index.append(position)
+                if len(batch) == chunk_size:
+                    yield pd.DataFrame(batch, columns=columns, index=index, dtype=object)
+                    batch, index = [], []
+                    yielded = True
+            if batch or not yielded:
+                yield pd.DataFrame(batch, columns=columns, index=index, dtype=object)
+        finally:
+            workbook.close()
+    else:
+        yield from pd.read_csv(fileobj, dtype=str, chunksize=chunk_size)
+
+def find_csv_record_boundary(data: bytes, last: bool = True) -> int:
+    """Return the offset just past the last (or first) newline in data that ends a CSV record.
+
+    A newline ends a record when it is preceded by an even number of quote characters,
+    which also holds for escaped quotes (""). data must start at a record boundary.
+    Returns -1 when data contains no complete record.
+    """
+    position = data.rfind(b'\n') if last else data.find(b'\n')
+    while position != -1:
+        if data.count(b'"', 0, position) % 2 == 0:
+            return position + 1
+        position = data.rfind(b'\n', 0, position) if last else data.find(b'\n', position + 1)
+    return -1
+
+def iter_csv_blocks(fileobj, block_size: int = BULK_IMPORT_BLOCK_BYTES):
+    """Yield a CSV file as raw byte blocks of roughly block_size that end on record boundaries"""
+    buffer = b''
+    while True:
+        data = fileobj.read(block_size)
+        if not data:
+            if buffer:
+                yield buffer
+            return
+        buffer += data
+        boundary = find_csv_record_boundary(buffer)
+        if boundary > 0:
+            yield buffer[:boundary]
+            buffer = buffer[boundary:]
+
+def parse_csv_block(header: bytes, block: bytes) -> pd.DataFrame:
+    """Process pool worker: parse one CSV block into a string-typed DataFrame"""
+    return pd.read_csv(io.BytesIO(header + block), dtype=str)
+
+def parse_asset_definition_block(header: bytes, block: bytes, asset_type_lookup: Dict[str, dict]):
+    """Process pool worker: parse and validate one CSV block.
+
+    Returns (valid_df, errors, row_count) with row numbers relative to the block, so the
+    caller only has to shift them by the number of rows in earlier blocks.
+    """
+    df = parse_csv_block(header, block)
+    valid_df, errors = validate_asset_definition_frame(df, asset_type_lookup)
+    return valid_df, errors, len(df)
+
+def convert_xlsx_to_csv(xlsx_path: str, csv_path: str):
+    """Process pool worker: rewrite an XLSX upload as CSV so it can be split into blocks"""
+    with open(xlsx_path, 'rb') as src, open(csv_path, 'w', newline='', encoding='utf-8') as dst:
+        for chunk_number, df in enumerate(iter_bulk_import_frames(src, xlsx_path)):
+            df.to_csv(dst, header=chunk_number == 0, index=False)
+
+def get_import_process_pool() -> ProcessPoolExecutor:
+    """Process pool for the CPU-bound parse/validate stage of bulk imports"""
+    global import_process_pool
+    if import_process_pool is None:
+        import_process_pool = ProcessPoolExecutor(
+            max_workers=IMPORT_PROCESS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return import_process_pool
+
+async def save_upload_to_temp_file(file: UploadFile) -> str:
+    """Copy an upload to a temporary file on disk and return its path"""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp:
+        while chunk := await file.read(1024 * 1024):
+            tmp.write(chunk)
+    return tmp.name
+
+def split_csv_header(blocks):
+    """Split the header record off the first CSV block; returns (header, remaining blocks)"""
+    first_block = next(blocks, b'')
+    header_end = find_csv_record_boundary(first_block, last=False)
+    if header_end == -1:
+        return first_block, itertools.chain([b''], blocks)
+    return first_block[:header_end], itertools.chain([first_block[header_end:]], blocks)
+
+async def iter_upload_frames(file: UploadFile):
+    """Yield an uploaded CSV/XLSX file as string-typed DataFrames parsed in the import process pool.
+
+    The request-handler counterpart of iter_bulk_import_frames: the upload is spooled to
+    disk, XLSX is converted to CSV and CSV blocks are parsed by the workers while the
+    current frame is processed, so large files do not stall the event loop. The frame
+    index continues across blocks and a header-only file yields one empty frame. Use
+    with contextlib.aclosing so the temporary files are removed when the caller stops early.
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_import_process_pool()
+    file_path = await save_upload_to_temp_file(file)
+    csv_path = file_path
+    pending = collections.deque()
+    try:
+        if file.filename.endswith('.xlsx'):
+            csv_path = f"{file_path}.csv"
+            await loop.run_in_executor(pool, convert_xlsx_to_csv, file_path, csv_path)
+        
+        with open(csv_path, 'rb') as fileobj:
+            header, blocks = split_csv_header(iter_csv_blocks(fileobj))
+            for block in itertools.islice(blocks, IMPORT_PROCESS_WORKERS):
+                pending.append(loop.run_in_executor(pool, parse_csv_block, header, block))
+            
+            row_offset = 0
+            while pending:
+                df = await pending.popleft()
+                block = next(blocks, None)
+                if block is not None:
+                    pending.append(loop.run_in_executor(pool, parse_csv_block, header, block))
+                df.index += row_offset
+                row_offset += len(df)
+                yield df
+    finally:
+        for future in pending:
+            future.cancel()
+        for path in {file_path, csv_path}:
+            if os.path.exists(path):
+                os.remove(path)
+
+IMPORT_JOB_MAX_ERRORS = 10000  # Keeps the job document well below the 16MB limit
+IMPORT_JOB_FINISHED_STATUSES = [ImportJobStatus.COMPLETED, ImportJobStatus.FAILED, ImportJobStatus.CANCELLED]
+
+async def run_asset_definition_import(file_path: str, filename: str, created_by: str, job_id: Optional[str] = None):
+    """Validate and insert a bulk import file block by block.
+
+    Parsing and validation run in the import process pool so the event loop stays free to
+    serve other requests; up to IMPORT_PROCESS_WORKERS blocks are parsed ahead while the
+    current one is inserted. When job_id is given, progress counters and row errors are
+    written to the import job after every block, and the import stops early if the job
+    was cancelled. Returns (BulkImportResult, cancelled).
+    """
+    loop = asyncio.get_running_loop()
+    pool = get_import_process_pool()
+    
+    total_rows = 0
+    successful_imports = 0
+    errors = []
+    seen_codes = set()
+    cancelled = False
+    
+    # Get all asset types for lookup; only id and name are needed by the workers
+    asset_types = await db.asset_types.find({}, {"_id": 0, "id": 1, "code": 1, "name": 1}).to_list(1000)
+    asset_type_lookup = {at['code']: at for at in asset_types}
+    
+    csv_path = file_path
+    if filename.endswith('.xlsx'):
+        csv_path = f"{file_path}.csv"
+        await loop.run_in_executor(pool, convert_xlsx_to_csv, file_path, csv_path)
+    
+    pending = collections.deque()
+    try:
+        with open(csv_path, 'rb') as fileobj:
+            header, blocks = split_csv_header(iter_csv_blocks(fileobj))
+            
+            columns = pd.read_csv(io.BytesIO(header), nrows=0).columns
+            missing_columns = [col for col in BULK_IMPORT_REQUIRED_COLUMNS if col not in columns]
+            if missing_columns:
+                raise HTTPException(
+                    status_code=400, 
+                    detail=f"Missing required columns: {', '.join(missing_columns)}"
+                )
+            
+            for block in itertools.islice(blocks, IMPORT_PROCESS_WORKERS):
+                pending.append(loop.run_in_executor(pool, parse_asset_definition_block, header, block, asset_type_lookup))
+            
+            while pending:
+                valid_df, block_errors, row_count = await pending.popleft()
+                block = next(blocks, None)
+                if block is not None:
+                    pending.append(loop.run_in_executor(pool, parse_asset_definition_block, header, block, asset_type_lookup))
                 
-                asset_type = asset_type_lookup[asset_type_code]
-                
-                # Check if asset code already exists
-                existing_asset = await db.asset_definitions.find_one({"asset_code": row['asset_code']})
-                if existing_asset:
-                    errors.append({
-                        'row': index + 2,
-                        'error': f'Asset code "{row["asset_code"]}" already exists'
-                    })
-                    failed_imports += 1
-                    continue
+                # Shift block-relative row numbers to file row numbers
+                for error in block_errors:
+                    error['row'] = str(int(error['row']) + total_rows)
+                valid_df['row'] += total_rows
+                total_rows += row_count
                 
-                # Create asset definition
-                asset_def_dict = {
-                    "id": str(uuid.uuid4()),
-                    "asset_type_id": asset_type['id'],
-                    "asset_type_name": asset_type['name'],
-                    "asset_code": row['asset_code'],
-                    "asset_description": row['asset_description'],
-                    "asset_details": row['asset_details'],
-                    "asset_value": float(row['asset_value']),
-                    "asset_depreciation_value_per_year": float(row.get('asset_depreciation_value_per_year', 0)) if pd.notna(row.get('asset_depreciation_value_per_year')) else None,
-                    "status": row.get('status', 'Available'),
-                    "current_depreciation_value": float(row['asset_value']),  # Initial value
-                    "created_at": datetime.now(timezone.utc),
-                    "created_by": current_user.id
-                }
+                # Duplicates of codes accepted from earlier blocks
+                duplicate_mask = valid_df['asset_code'].isin(seen_codes)
+                block_errors.extend(
+                    {'row': str(row), 'error': f'Duplicate asset code "{code}" in file'}
+                    for row, code in zip(valid_df['row'][duplicate_mask], valid_df['asset_code'][duplicate_mask])
+                )
+                valid_df = valid_df[~duplicate_mask]
+                seen_codes.update(valid_df['asset_code'])
                 
-                await db.asset_definitions.insert_one(asset_def_dict)
-                successful_imports += 1
+                inserted, insert_errors = await insert_asset_definition_batches(
+                    valid_df, asset_type_lookup, created_by
+                )
+                successful_imports += inserted
+                block_errors.extend(insert_errors)
+                block_errors.sort(key=lambda e: int(e['row']))
+                errors.extend(block_errors)
                 
-            except Exception as e:
-                errors.append({
-                    'row': index + 2,
-                    'error': str(e)
-                })
-                failed_imports += 1
-        
-        return BulkImportResult(
-            success=successful_imports > 0,
-            message=f"Import completed. {successful_imports} successful, {failed_imports} failed.",
-            total_rows=total_rows,
-            successful_imports=successful_imports,
-            failed_imports=failed_imports,
-            errors=errors
+                if job_id:
+                    job = await db.import_jobs.find_one_and_update(
+                        {"id": job_id},
+                        {
+                            "$set": {
+                                "total_rows": total_rows,
+                                "successful_imports": successful_imports,
+                                "failed_imports": total_rows - successful_imports,
+                                "updated_at": datetime.now(timezone.utc)
+                            },
+                            "$push": {"errors": {"$each": block_errors, "$slice": IMPORT_JOB_MAX_ERRORS}}
+                        },
+                        projection={"_id": 0, "cancel_requested": 1},
+                        return_document=ReturnDocument.AFTER
+                    )
+                    if job and job.get("cancel_requested"):
+                        cancelled = True
+                        break
+    finally:
+        for future in pending:
+            future.cancel()
+        if csv_path != file_path and os.path.exists(csv_path):
+            os.remove(csv_path)
+    
+    failed_imports = total_rows - successful_imports
+    if cancelled:
+        message = f"Import cancelled after {total_rows} rows. {successful_imports} successful, {failed_imports} failed."
+    else:
+        message = f"Import completed. {successful_imports} successful, {failed_imports} failed."
+    
+    result = BulkImportResult(
+        success=successful_imports > 0,
+        message=message,
+        total_rows=total_rows,
+        successful_imports=successful_imports,
+        failed_imports=failed_imports,
+        errors=errors
+    )
+    return result, cancelled
+
+async def run_bulk_import_job(job_id: str, file_path: str, filename: str, created_by: str):
+    """Background worker for an asynchronous bulk import job"""
+    try:
+        job = await db.import_jobs.find_one_and_update(
+            {"id": job_id, "cancel_requested": {"$ne": True}},
+            {"$set": {
+                "status": ImportJobStatus.RUNNING,
+                "started_at": datetime.now(timezone.utc),
+                "updated_at": datetime.now(timezone.utc)
+            }}
         )
+        if not job:
+            # Cancelled before it started
+            await db.import_jobs.update_one(
+                {"id": job_id},
+                {"$set": {
+                    "status": ImportJobStatus.CANCELLED,
+                    "message": "Import cancelled before it started",
+                    "completed_at": datetime.now(timezone.utc),
+                    "updated_at": datetime.now(timezone.utc)
+                }}
+            )
+            return
+        
+        result, cancelled = await run_asset_definition_import(file_path, filename, created_by, job_id=job_id)
         
+        final_update = {
+            "status": ImportJobStatus.CANCELLED if cancelled else ImportJobStatus.COMPLETED,
+            "success": result.success,
+            "message": result.message
+        }
+    except HTTPException as e:
+        final_update = {"status": ImportJobStatus.FAILED, "message": e.detail}
+    except Exception as e:
+        logging.error(f"Bulk import job {job_id} failed: {str(e)}")
+        final_update = {"status": ImportJobStatus.FAILED, "message": f"Error processing file: {str(e)}"}
+    finally:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+    
+    final_update["completed_at"] = datetime.now(timezone.utc)
+    final_update["updated_at"] = datetime.now(timezone.utc)
+    await db.import_jobs.update_one({"id": job_id}, {"$set": final_update})
+
+@api_router.post("/asset-definitions/bulk-import", response_model=Union[BulkImportResult, ImportJob])
+async def bulk_import_asset_definitions(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    run_in_background: bool = False,
+    current_user: User = Depends(require_role([UserRole.ADMINISTRATOR, UserRole.HR_MANAGER]))
+):
+    """Bulk import asset definitions from a CSV or XLSX file, processed chunk by chunk.
+
+    With run_in_background=true the file is queued as an import job and the job is returned
+    immediately; poll GET /import-jobs/{job_id} for progress.
+    """
+    if not file.filename.endswith(('.csv', '.xlsx')):
+        raise HTTPException(status_code=400, detail="Only CSV and XLSX files are allowed")
+    
+    # The process pool workers read from disk, and the upload is closed once the request completes
+    file_path = await save_upload_to_temp_file(file)
+    
+    if run_in_background:
+        job = ImportJob(file_name=file.filename, created_by=current_user.id)
+        # file_path lets the startup sweep clean up after a job that died with its process
+        await db.import_jobs.insert_one({**job.dict(), "file_path": file_path})
+        background_tasks.add_task(run_bulk_import_job, job.id, file_path, file.filename, current_user.id)
+        return job
+    
+    try:
+        result, _ = await run_asset_definition_import(file_path, file.filename, current_user.id)
+        return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+    finally:
+        os.remove(file_path)
+
+@api_router.get("/import-jobs/{job_id}", response_model=ImportJob)
+async def get_import_job(
+    job_id: str,
+    current_user: User = Depends(require_role([UserRole.ADMINISTRATOR, UserRole.HR_MANAGER]))
+):
+    """Get progress and row errors of a bulk import job"""
+    job = await db.import_jobs.find_one({"id": job_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    
+    if job["created_by"] != current_user.id and UserRole.ADMINISTRATOR not in current_user.roles:
+        raise HTTPException(status_code=403, detail="You can only view your own import jobs")
+    
+    return ImportJob(**job)
+
+@api_router.post("/import-jobs/{job_id}/cancel", response_model=ImportJob)
+async def cancel_import_job(
+    job_id: str,
+    current_user: User = Depends(require_role([UserRole.ADMINISTRATOR, UserRole.HR_MANAGER]))
+):
+    """Request cancellation of a bulk import job; rows already imported are kept"""
+    job = await db.import_jobs.find_one({"id": job_id})
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    
+    if job["created_by"] != current_user.id and UserRole.ADMINISTRATOR not in current_user.roles:
+        raise HTTPException(status_code=403, detail="You can only cancel your own import jobs")
+    
+    if job["status"] in IMPORT_JOB_FINISHED_STATUSES:
+        raise HTTPException(status_code=400, detail=f"Import job has already finished ({ImportJobStatus(job['status']).value})")
+    
+    await db.import_jobs.update_one(
+        {"id": job_id},
+        {"$set": {"cancel_requested": True, "updated_at": datetime.now(timezone.utc)}}
+    )
+    updated = await db.import_jobs.find_one({"id": job_id})
+    return ImportJob(**updated)
+
+BULK_UPDATE_COLUMNS = [
+    'asset_code', 'asset_type_code', 'asset_description', 'asset_details', 'asset_value',
+    'asset_depreciation_value_per_year', 'status', 'location_code', 'asset_manager_email'
+]
+
+def plain_value(value):
+    """Enum members compare and serialize by value in change summaries"""
+    return value.value if isinstance(value, Enum) else value
+
+def parse_asset_definition_update_row(record: Dict[str, Optional[str]], lookups: Dict[str, Dict[str, dict]]) -> Dict[str, Any]:
+    """Turn one bulk update row into asset definition fields.
+
+    Only non-empty cells are returned, so blank cells leave the stored value unchanged.
+    Codes and emails are resolved through the per-file lookups. Raises ValueError with
+    the row error message.
+    """
+    fields = {}
+    for column in ['asset_description', 'asset_details']:
+        if record.get(column):
+            fields[column] = record[column]
+    for column in ['asset_value', 'asset_depreciation_value_per_year']:
+        if record.get(column):
+            try:
+                fields[column] = float(record[column])
+            except ValueError:
+                raise ValueError(f'Invalid {column.replace("_", " ")} "{record[column]}"')
+    if record.get('status'):
+        if record['status'] not in [s.value for s in AssetStatus]:
+            raise ValueError(f'Invalid status "{record["status"]}"')
+        fields['status'] = record['status']
+    if record.get('asset_type_code'):
+        asset_type = lookups['asset_types'].get(record['asset_type_code'])
+        if not asset_type:
+            raise ValueError(f'Asset type code "{record["asset_type_code"]}" not found')
+        fields['asset_type_id'] = asset_type['id']
+        fields['asset_type_name'] = asset_type['name']
+    if record.get('location_code'):
+        location = lookups['locations'].get(record['location_code'])
+        if not location:
+            raise ValueError(f'Location code "{record["location_code"]}" not found or inactive')
+        fields['location_id'] = location['id']
+        fields['location_name'] = location['name']
+    if record.get('asset_manager_email'):
+        asset_manager = lookups['asset_managers'].get(record['asset_manager_email'].lower())
+        if not asset_manager:
+            raise ValueError(f'Asset Manager "{record["asset_manager_email"]}" not found or inactive')
+        fields['assigned_asset_manager_id'] = asset_manager['id']
+        fields['assigned_asset_manager_name'] = asset_manager['name']
+    return fields
+
+async def apply_asset_definition_updates(
+    df: pd.DataFrame,
+    lookups: Dict[str, Dict[str, dict]],
+    upsert: bool,
+    created_by: str,
+    seen_codes: set
+):
+    """Diff one chunk of a bulk update file against the stored assets and write the changes.
+
+    Existing assets are fetched with a single $in query and all updates/inserts go out in
+    one unordered bulk_write. Returns (row changes, errors).
+    """
+    changes = []
+    errors = []
+    operations = []
+    operation_changes = []
+
+    records = df.astype(object).where(df.notna(), None).to_dict('records')
+    codes = [(record.get('asset_code') or '').strip() for record in records]
+    existing = await db.asset_definitions.find(
+        {"asset_code": {"$in": [code for code in codes if code]}}, {"_id": 0}
+    ).to_list(None)
+    existing_by_code = {asset["asset_code"]: asset for asset in existing}
+
+    for index, record in zip(df.index, records):
+        row = str(index + 2)
+        record = {key: value.strip() if isinstance(value, str) else value for key, value in record.items()}
+        code = record.get('asset_code')
+        if not code:
+            errors.append({'row': row, 'error': 'Missing asset code'})
+            continue
+        if code in seen_codes:
+            errors.append({'row': row, 'error': f'Duplicate asset code "{code}" in file'})
+            continue
+        seen_codes.add(code)
+
+        try:
+            fields = parse_asset_definition_update_row(record, lookups)
+        except ValueError as e:
+            errors.append({'row': row, 'error': str(e)})
+            continue
+
+        asset = existing_by_code.get(code)
+        if asset:
+            diff = {
+                field: {"from": plain_value(asset.get(field)), "to": value}
+                for field, value in fields.items()
+                if plain_value(asset.get(field)) != value
+            }
+            if not diff:
+                changes.append(AssetDefinitionRowChange(row=row, asset_code=code, action="unchanged"))
+                continue
+            update_data = {field: change["to"] for field, change in diff.items()}
+            update_data["updated_at"] = datetime.now(timezone.utc)
+            operations.append(UpdateOne({"id": asset["id"]}, {"$set": update_data}))
+            operation_changes.append(AssetDefinitionRowChange(row=row, asset_code=code, action="updated", changes=diff))
+        elif upsert:
+            missing = [col for col in ['asset_type_code', 'asset_description', 'asset_details', 'asset_value'] if not record.get(col)]
+            if missing:
+                errors.append({'row': row, 'error': f'New asset is missing required value(s): {", ".join(missing)}'})
+                continue
+            asset_def = AssetDefinition(asset_code=code, created_by=created_by, **fields)
+            asset_def.current_depreciation_value = asset_def.asset_value  # Initial value
+            operations.append(InsertOne(asset_def.dict()))
+            operation_changes.append(AssetDefinitionRowChange(
+                row=row, asset_code=code, action="created",
+                changes={field: {"from": None, "to": value} for field, value in fields.items()}
+            ))
+        else:
+            errors.append({'row': row, 'error': f'Asset code "{code}" not found'})
+
+    if operations:
+        failed_indexes = set()
+        try:
+            await db.asset_definitions.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details.get("writeErrors", []):
+                failed_indexes.add(write_error["index"])
+                message = write_error.get("errmsg", "Update failed")
+                if write_error.get("code") == 11000:
+                    message = f'Asset code "{operation_changes[write_error["index"]].asset_code}" already exists'
+                errors.append({'row': operation_changes[write_error["index"]].row, 'error': message})
+        changes.extend(change for i, change in enumerate(operation_changes) if i not in failed_indexes)
+        await bump_collection_versions("asset_definitions")
+
+    return changes, errors
+
+@api_router.post("/asset-definitions/bulk-update", response_model=BulkUpdateResult)
+async def bulk_update_asset_definitions(
+    file: UploadFile = File(...),
+    upsert: bool = False,
+    current_user: User = Depends(require_role([UserRole.ADMINISTRATOR, UserRole.HR_MANAGER]))
+):
+    """Bulk update asset definitions keyed on asset_code from a CSV or XLSX file.
+
+    Only the columns present and non-empty in a row are changed. With upsert=true, unknown
+    asset codes are created instead of being reported as errors. Returns a per-row diff.
+    """
+    if not file.filename.endswith(('.csv', '.xlsx')):
+        raise HTTPException(status_code=400, detail="Only CSV and XLSX files are allowed")
+
+    # Resolve codes and emails once per file instead of once per row
+    asset_types = await db.asset_types.find({}, {"_id": 0, "id": 1, "code": 1, "name": 1}).to_list(1000)
+    locations = await db.locations.find(
+        {"status": ActiveStatus.ACTIVE}, {"_id": 0, "id": 1, "code": 1, "name": 1}
+    ).to_list(1000)
+    asset_managers = await db.users.find(
+        {"roles": {"$in": [UserRole.ASSET_MANAGER]}, "is_active": True},
+        {"_id": 0, "id": 1, "email": 1, "name": 1}
+    ).to_list(None)
+    lookups = {
+        'asset_types': {at['code']: at for at in asset_types},
+        'locations': {loc['code']: loc for loc in locations},
+        'asset_managers': {am['email'].lower(): am for am in asset_managers},
+    }
+
+    total_rows = 0
+    changes = []
+    errors = []
+    seen_codes = set()
+    try:
+        async with contextlib.aclosing(iter_upload_frames(file)) as frames:
+            async for df in frames:
+                if 'asset_code' not in df.columns:
+                    raise HTTPException(status_code=400, detail="Missing required column: asset_code")
+                unknown_columns = [col for col in df.columns if col not in BULK_UPDATE_COLUMNS]
+                if unknown_columns:
+                    raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown_columns)}")
+
+                total_rows += len(df)
+                chunk_changes, chunk_errors = await apply_asset_definition_updates(
+                    df, lookups, upsert, current_user.id, seen_codes
+                )
+                changes.extend(sorted(chunk_changes, key=lambda c: int(c.row)))
+                errors.extend(sorted(chunk_errors, key=lambda e: int(e['row'])))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+
+    counts = collections.Counter(change.action for change in changes)
+    message = (
+        f"Update completed. {counts['created']} created, {counts['updated']} updated, "
+        f"{counts['unchanged']} unchanged, {len(errors)} failed."
+    )
+    return BulkUpdateResult(
+        success=counts['created'] + counts['updated'] > 0,
+        message=message,
+        total_rows=total_rows,
+        created=counts['created'],
+        updated=counts['updated'],
+        unchanged=counts['unchanged'],
+        failed=len(errors),
+        changes=changes,
+        errors=errors
+    )
 
 # Asset Allocation Routes (Asset Manager)
-@api_router.get("/asset-allocations", response_model=List[AssetAllocation])
+@api_router.get("/asset-allocations", response_model=Union[List[AssetAllocation], AssetAllocationChanges])
 async def get_asset_allocations(
+    updated_since: Optional[datetime] = None,
     current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
 ):
-    """Get all asset allocations"""
+    """Get all asset allocations, or only the changes since updated_since"""
+    if updated_since:
+        allocations, deleted_ids, next_updated_since = await find_changes_since("asset_allocations", {}, updated_since)
+        return AssetAllocationChanges(
+            items=[AssetAllocation(**allocation) for allocation in allocations],
+            deleted_ids=deleted_ids,
+            next_updated_since=next_updated_since
+        )
     allocations = await db.asset_allocations.find().to_list(1000)
     return [AssetAllocation(**allocation) for allocation in allocations]
 
-@api_router.post("/asset-allocations", response_model=AssetAllocation)
-async def create_asset_allocation(
+ALLOCATABLE_REQUISITION_STATUSES = [
+    RequisitionStatus.MANAGER_APPROVED, RequisitionStatus.HR_APPROVED, RequisitionStatus.ASSIGNED_FOR_ALLOCATION
+]
+BULK_ALLOCATION_MAX_ITEMS = 500
+
+def requisition_approver_id(requisition: dict) -> Optional[str]:
+    """Approver recorded on an allocation; falls back to whoever took the approval action"""
+    return (
+        requisition.get("manager_id") or requisition.get("hr_manager_id")
+        or requisition.get("manager_action_by") or requisition.get("hr_action_by")
+    )
+
+def asset_claim_update(requisition: dict, requested_user: Optional[dict], allocation_id: str, allocation_date: datetime) -> dict:
+    """$set applied to an Available asset when an allocation claims it"""
+    return {
+        "$set": {
+            "status": AssetStatus.ALLOCATED,
+            "allocated_to": requisition["requested_by"],
+            "allocated_to_name": requested_user["name"] if requested_user else None,
+            "allocation_date": allocation_date,
+            "allocation_id": allocation_id,
+            "updated_at": datetime.now(timezone.utc)
+        }
+    }
+
+ASSET_CLAIM_RELEASE = {
+    "$set": {
+        "status": AssetStatus.AVAILABLE,
+        "allocated_to": None,
+        "allocated_to_name": None,
+        "allocation_date": None,
+        "allocation_id": None
+    },
+    "$currentDate": {"updated_at": True}
+}
+
+def build_allocation_dict(
     allocation_data: AssetAllocationCreate,
-    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
-):
-    """Allocate an asset to an employee based on approved requisition"""
-    # Get requisition details
-    requisition = await db.asset_requisitions.find_one({"id": allocation_data.requisition_id})
-    if not requisition:
-        raise HTTPException(status_code=404, detail="Requisition not found")
-    
-    if requisition["status"] not in [RequisitionStatus.MANAGER_APPROVED, RequisitionStatus.HR_APPROVED, RequisitionStatus.ASSIGNED_FOR_ALLOCATION]:
-        raise HTTPException(status_code=400, detail="Requisition must be approved before allocation")
-    
-    # Get asset definition details
-    asset_def = await db.asset_definitions.find_one({"id": allocation_data.asset_definition_id})
-    if not asset_def:
-        raise HTTPException(status_code=404, detail="Asset definition not found")
-    
-    if asset_def["status"] != AssetStatus.AVAILABLE:
-        raise HTTPException(status_code=400, detail="Asset is not available for allocation")
-    
-    # Get asset type and user details
-    asset_type = await db.asset_types.find_one({"id": asset_def["asset_type_id"]})
-    requested_user = await db.users.find_one({"id": requisition["requested_by"]})
-    approved_by_user = await db.users.find_one({"id": requisition.get("manager_id") or requisition.get("hr_manager_id")})
-    
-    # Create allocation record
-    allocation_dict = {
-        "id": str(uuid.uuid4()),
+    allocation_id: str,
+    allocation_date: datetime,
+    requisition: dict,
+    asset_def: dict,
+    asset_type: Optional[dict],
+    requested_user: Optional[dict],
+    approved_by_user: Optional[dict],
+    current_user: User
+) -> dict:
+    """Allocation record for a claimed asset"""
+    return {
+        "id": allocation_id,
         "requisition_id": allocation_data.requisition_id,
         "request_type": "Asset Request",
         "asset_type_id": asset_def["asset_type_id"],
@@ -2515,102 +4544,865 @@ async def create_asset_allocation(
         "asset_definition_code": asset_def["asset_code"],
         "requested_for": requisition["requested_by"],
         "requested_for_name": requested_user["name"] if requested_user else None,
-        "approved_by": requisition.get("manager_id") or requisition.get("hr_manager_id"),
+        "approved_by": requisition_approver_id(requisition),
         "approved_by_name": approved_by_user["name"] if approved_by_user else None,
         "allocated_by": current_user.id,
         "allocated_by_name": current_user.name,
-        "allocated_date": datetime.now(timezone.utc),
+        "allocated_date": allocation_date,
         "remarks": allocation_data.remarks,
         "reference_id": allocation_data.reference_id,
         "document_id": allocation_data.document_id,
         "dispatch_details": allocation_data.dispatch_details,
         "status": AssetAllocationStatus.ALLOCATED_TO_EMPLOYEE,
-        "created_at": datetime.now(timezone.utc)
+        "created_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
     }
+
+def build_asset_allocated_notification(
+    requested_user: dict,
+    manager: Optional[dict],
+    hr_managers: List[dict],
+    asset_manager: User,
+    asset_type: Optional[dict],
+    asset_def: dict
+) -> dict:
+    """send_notification arguments for an asset allocation"""
+    # Trigger 4: When Asset Manager allocates the asset to employee
+    # To: Employee, CC: Asset Manager, Manager, HR Manager
+    cc_emails = [asset_manager.email]
+    if manager:
+        cc_emails.append(manager["email"])
+    cc_emails.extend([hr["email"] for hr in hr_managers])
     
-    await db.asset_allocations.insert_one(allocation_dict)
+    return {
+        "notification_type": "asset_allocated",
+        "to_emails": [requested_user["email"]],
+        "cc_emails": cc_emails,
+        "context": {
+            "employee_name": requested_user["name"],
+            "asset_type_name": asset_type["name"] if asset_type else "Unknown",
+            "asset_code": asset_def["asset_code"],
+            "asset_value": asset_def.get("asset_value", 0),
+            "asset_manager_name": asset_manager.name,
+            "allocation_date": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        }
+    }
+
+async def send_notification_batch(notifications: List[dict]):
+    """Background task: send a batch of notifications, logging failures without stopping"""
+    for notification in notifications:
+        try:
+            await email_service.send_notification(**notification)
+        except Exception as e:
+            logging.error(f"Failed to send {notification['notification_type']} notification: {str(e)}")
+
+@api_router.post("/asset-allocations", response_model=AssetAllocation)
+async def create_asset_allocation(
+    allocation_data: AssetAllocationCreate,
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR])),
+    loaders: Loaders = Depends(get_loaders)
+):
+    """Allocate an asset to an employee based on approved requisition"""
+    # Get requisition details
+    requisition = await db.asset_requisitions.find_one({"id": allocation_data.requisition_id})
+    if not requisition:
+        raise HTTPException(status_code=404, detail="Requisition not found")
     
-    # Update asset definition status and allocated to
-    await db.asset_definitions.update_one(
-        {"id": allocation_data.asset_definition_id},
-        {
-            "$set": {
-                "status": AssetStatus.ALLOCATED,
-                "allocated_to": requisition["requested_by"],
-                "allocated_to_name": requested_user["name"] if requested_user else None,
-                "allocation_date": datetime.now(timezone.utc)
+    if requisition["status"] not in ALLOCATABLE_REQUISITION_STATUSES:
+        raise HTTPException(status_code=400, detail="Requisition must be approved before allocation")
+    
+    if is_claimed_by_other(requisition, current_user.id):
+        raise HTTPException(status_code=400, detail=f"Requisition is being handled by {requisition.get('claimed_by_name')}")
+    
+    requested_user, approved_by_user, reserved = await asyncio.gather(
+        loaders.users.load(requisition["requested_by"]),
+        loaders.users.load(requisition_approver_id(requisition)),
+        get_assets_reserved_by_others(current_user.id, [allocation_data.asset_definition_id])
+    )
+    if reserved:
+        reservation = reserved[allocation_data.asset_definition_id]
+        raise HTTPException(status_code=400, detail=f"Asset is reserved by {reservation.get('reserved_by_name')}")
+    allocation_id = str(uuid.uuid4())
+    allocation_date = datetime.now(timezone.utc)
+    
+    # Claim the asset atomically so concurrent allocations cannot both take it
+    asset_def = await db.asset_definitions.find_one_and_update(
+        {"id": allocation_data.asset_definition_id, "status": AssetStatus.AVAILABLE},
+        asset_claim_update(requisition, requested_user, allocation_id, allocation_date),
+        return_document=ReturnDocument.AFTER
+    )
+    if not asset_def:
+        if not await db.asset_definitions.find_one({"id": allocation_data.asset_definition_id}, {"_id": 1}):
+            raise HTTPException(status_code=404, detail="Asset definition not found")
+        raise HTTPException(status_code=400, detail="Asset is not available for allocation")
+    await bump_collection_versions("asset_definitions")
+    
+    # Move the requisition to Allocated only if nobody else allocated it in the meantime
+    requisition_result, asset_type = await asyncio.gather(
+        db.asset_requisitions.update_one(
+            {"id": allocation_data.requisition_id, "status": {"$in": ALLOCATABLE_REQUISITION_STATUSES}},
+            {
+                "$set": {
+                    "status": RequisitionStatus.ALLOCATED,
+                    "allocated_asset_id": allocation_data.asset_definition_id,
+                    "allocated_asset_code": asset_def["asset_code"],
+                    "updated_at": allocation_date
+                }
             }
-        }
+        ),
+        loaders.asset_types.load(asset_def["asset_type_id"])
     )
+    if requisition_result.modified_count == 0:
+        # Undo our claim on the asset
+        await db.asset_definitions.update_one({"id": asset_def["id"], "allocation_id": allocation_id}, ASSET_CLAIM_RELEASE)
+        await bump_collection_versions("asset_definitions")
+        raise HTTPException(status_code=400, detail="Requisition is no longer pending allocation")
     
-    # Update requisition status
-    await db.asset_requisitions.update_one(
-        {"id": allocation_data.requisition_id},
-        {
-            "$set": {
-                "status": RequisitionStatus.ALLOCATED,
-                "allocated_asset_id": allocation_data.asset_definition_id,
-                "allocated_asset_code": asset_def["asset_code"]
-            }
-        }
+    # Create allocation record
+    allocation_dict = build_allocation_dict(
+        allocation_data, allocation_id, allocation_date, requisition, asset_def,
+        asset_type, requested_user, approved_by_user, current_user
+    )
+    await asyncio.gather(
+        db.asset_allocations.insert_one(allocation_dict),
+        db.asset_reservations.delete_many({"asset_definition_id": allocation_data.asset_definition_id})
     )
+    await publish_requisition_events("updated", [{
+        **requisition,
+        "status": RequisitionStatus.ALLOCATED,
+        "allocated_asset_id": allocation_data.asset_definition_id,
+        "updated_at": allocation_date
+    }])
+    publish_allocation_events("created", [allocation_dict])
     
     # Send email notification for asset allocation
     try:
-        # Trigger 4: When Asset Manager allocates the asset to employee
-        # To: Employee, CC: Asset Manager, Manager, HR Manager
+        if requested_user:
+            manager, hr_managers = await asyncio.gather(
+                loaders.users.load(requested_user.get("reporting_manager_id")),
+                db.users.find({"roles": UserRole.HR_MANAGER, "is_active": True}).to_list(100)
+            )
+            await email_service.send_notification(**build_asset_allocated_notification(
+                requested_user, manager, hr_managers, current_user, asset_type, asset_def
+            ))
+    except Exception as e:
+        # Log error but don't fail the allocation
+        logging.error(f"Failed to send asset allocation notification: {str(e)}")
+    
+    return AssetAllocation(**allocation_dict)
+
+@api_router.post("/asset-allocations/bulk", response_model=BulkAllocationResult)
+async def bulk_create_asset_allocations(
+    bulk_request: BulkAllocationRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
+):
+    """Allocate assets for many approved requisitions at once, e.g. for an onboarding wave.
+
+    Items are validated with a few $in queries, assets are claimed atomically and all writes
+    are batched. Items that fail are reported per index; the rest are still allocated.
+    Notifications are sent as one background batch after the response.
+    """
+    items = bulk_request.allocations
+    if not items:
+        raise HTTPException(status_code=400, detail="No allocations provided")
+    if len(items) > BULK_ALLOCATION_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_ALLOCATION_MAX_ITEMS} allocations can be made at once")
+    
+    errors = []
+    
+    def fail(index: int, message: str):
+        errors.append({
+            "index": str(index),
+            "requisition_id": items[index].requisition_id,
+            "asset_definition_id": items[index].asset_definition_id,
+            "error": message
+        })
+    
+    requisitions, assets, reserved = await asyncio.gather(
+        db.asset_requisitions.find({"id": {"$in": [item.requisition_id for item in items]}}, {"_id": 0}).to_list(None),
+        db.asset_definitions.find({"id": {"$in": [item.asset_definition_id for item in items]}}, {"_id": 0}).to_list(None),
+        get_assets_reserved_by_others(current_user.id, [item.asset_definition_id for item in items])
+    )
+    requisitions_by_id = {req["id"]: req for req in requisitions}
+    assets_by_id = {asset["id"]: asset for asset in assets}
+    
+    # Validate each item against the prefetched documents
+    candidates = []  # indexes of items that passed validation
+    seen_requisitions, seen_assets = set(), set()
+    for index, item in enumerate(items):
+        requisition = requisitions_by_id.get(item.requisition_id)
+        asset_def = assets_by_id.get(item.asset_definition_id)
+        if item.requisition_id in seen_requisitions:
+            fail(index, "Requisition appears more than once in the batch")
+        elif item.asset_definition_id in seen_assets:
+            fail(index, "Asset appears more than once in the batch")
+        elif not requisition:
+            fail(index, "Requisition not found")
+        elif requisition["status"] not in ALLOCATABLE_REQUISITION_STATUSES:
+            fail(index, "Requisition must be approved before allocation")
+        elif is_claimed_by_other(requisition, current_user.id):
+            fail(index, f"Requisition is being handled by {requisition.get('claimed_by_name')}")
+        elif not asset_def:
+            fail(index, "Asset definition not found")
+        elif asset_def["status"] != AssetStatus.AVAILABLE:
+            fail(index, "Asset is not available for allocation")
+        elif item.asset_definition_id in reserved:
+            fail(index, f"Asset is reserved by {reserved[item.asset_definition_id].get('reserved_by_name')}")
+        else:
+            candidates.append(index)
+        seen_requisitions.add(item.requisition_id)
+        seen_assets.add(item.asset_definition_id)
+    
+    allocations = []
+    if candidates:
+        user_ids = set()
+        for index in candidates:
+            requisition = requisitions_by_id[items[index].requisition_id]
+            user_ids.update([requisition["requested_by"], requisition_approver_id(requisition)])
+        users, asset_types = await asyncio.gather(
+            db.users.find({"id": {"$in": list(user_ids - {None})}}, {"_id": 0}).to_list(None),
+            db.asset_types.find(
+                {"id": {"$in": list({assets_by_id[items[index].asset_definition_id]["asset_type_id"] for index in candidates})}},
+                {"_id": 0}
+            ).to_list(None)
+        )
+        users_by_id = {user["id"]: user for user in users}
+        asset_types_by_id = {asset_type["id"]: asset_type for asset_type in asset_types}
         
-        # Get manager details
-        manager = None
-        if requested_user and requested_user.get("reporting_manager_id"):
-            manager = await db.users.find_one({"id": requested_user["reporting_manager_id"]})
+        allocation_ids = {index: str(uuid.uuid4()) for index in candidates}
+        allocation_date = datetime.now(timezone.utc)
         
-        # Get HR managers
-        hr_managers = await db.users.find({"roles": UserRole.HR_MANAGER, "is_active": True}).to_list(100)
+        # Claim all assets in one unordered bulk_write; each update only matches an Available asset
+        await db.asset_definitions.bulk_write([
+            UpdateOne(
+                {"id": items[index].asset_definition_id, "status": AssetStatus.AVAILABLE},
+                asset_claim_update(
+                    requisitions_by_id[items[index].requisition_id],
+                    users_by_id.get(requisitions_by_id[items[index].requisition_id]["requested_by"]),
+                    allocation_ids[index],
+                    allocation_date
+                )
+            )
+            for index in candidates
+        ], ordered=False)
+        claimed = await db.asset_definitions.find(
+            {"allocation_id": {"$in": list(allocation_ids.values())}}, {"_id": 0, "id": 1}
+        ).to_list(None)
+        claimed_asset_ids = {asset["id"] for asset in claimed}
+        if claimed_asset_ids:
+            await bump_collection_versions("asset_definitions")
+        for index in candidates:
+            if items[index].asset_definition_id not in claimed_asset_ids:
+                fail(index, "Asset is not available for allocation")
+        candidates = [index for index in candidates if items[index].asset_definition_id in claimed_asset_ids]
+    
+    if candidates:
+        # Move the requisitions to Allocated, guarded on their status like the single allocation
+        await db.asset_requisitions.bulk_write([
+            UpdateOne(
+                {"id": items[index].requisition_id, "status": {"$in": ALLOCATABLE_REQUISITION_STATUSES}},
+                {
+                    "$set": {
+                        "status": RequisitionStatus.ALLOCATED,
+                        "allocated_asset_id": items[index].asset_definition_id,
+                        "allocated_asset_code": assets_by_id[items[index].asset_definition_id]["asset_code"],
+                        "updated_at": allocation_date
+                    }
+                }
+            )
+            for index in candidates
+        ], ordered=False)
+        transitioned = await db.asset_requisitions.find(
+            {
+                "id": {"$in": [items[index].requisition_id for index in candidates]},
+                "status": RequisitionStatus.ALLOCATED,
+                "allocated_asset_id": {"$in": [items[index].asset_definition_id for index in candidates]}
+            },
+            {"_id": 0, "id": 1, "allocated_asset_id": 1}
+        ).to_list(None)
+        transitioned_pairs = {(req["id"], req["allocated_asset_id"]) for req in transitioned}
         
-        if requested_user:
-            to_emails = [requested_user["email"]]
-            cc_emails = [current_user.email]  # Asset Manager
-            
-            # Add manager to CC if exists
-            if manager:
-                cc_emails.append(manager["email"])
-            
-            # Add HR managers to CC
-            cc_emails.extend([hr["email"] for hr in hr_managers])
-            
-            # Context for email template
-            context = {
-                "employee_name": requested_user["name"],
-                "asset_type_name": asset_type["name"] if asset_type else "Unknown",
-                "asset_code": asset_def["asset_code"],
-                "asset_value": asset_def.get("asset_value", 0),
-                "asset_manager_name": current_user.name,
-                "allocation_date": datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
-            }
+        lost = [
+            index for index in candidates
+            if (items[index].requisition_id, items[index].asset_definition_id) not in transitioned_pairs
+        ]
+        if lost:
+            # Undo our claims on the assets whose requisitions were allocated elsewhere
+            await db.asset_definitions.bulk_write([
+                UpdateOne(
+                    {"id": items[index].asset_definition_id, "allocation_id": allocation_ids[index]},
+                    ASSET_CLAIM_RELEASE
+                )
+                for index in lost
+            ], ordered=False)
+            await bump_collection_versions("asset_definitions")
+            for index in lost:
+                fail(index, "Requisition is no longer pending allocation")
+        candidates = [index for index in candidates if index not in lost]
+        
+        for index in candidates:
+            requisition = requisitions_by_id[items[index].requisition_id]
+            asset_def = assets_by_id[items[index].asset_definition_id]
+            allocations.append(build_allocation_dict(
+                items[index], allocation_ids[index], allocation_date, requisition, asset_def,
+                asset_types_by_id.get(asset_def["asset_type_id"]),
+                users_by_id.get(requisition["requested_by"]),
+                users_by_id.get(requisition_approver_id(requisition)),
+                current_user
+            ))
+        if allocations:
+            await asyncio.gather(
+                db.asset_allocations.insert_many(allocations),
+                db.asset_reservations.delete_many(
+                    {"asset_definition_id": {"$in": [allocation["asset_definition_id"] for allocation in allocations]}}
+                )
+            )
+            await publish_requisition_events("updated", [
+                {
+                    **requisitions_by_id[allocation["requisition_id"]],
+                    "status": RequisitionStatus.ALLOCATED,
+                    "allocated_asset_id": allocation["asset_definition_id"],
+                    "updated_at": allocation_date
+                }
+                for allocation in allocations
+            ])
+            publish_allocation_events("created", allocations)
+    
+    if allocations:
+        # Queue all notifications as one batch; manager and HR lookups are shared
+        try:
+            requested_users = [users_by_id.get(allocation["requested_for"]) for allocation in allocations]
+            manager_ids = list({user["reporting_manager_id"] for user in requested_users if user and user.get("reporting_manager_id")})
+            managers, hr_managers = await asyncio.gather(
+                db.users.find({"id": {"$in": manager_ids}}, {"_id": 0}).to_list(None),
+                db.users.find({"roles": UserRole.HR_MANAGER, "is_active": True}).to_list(100)
+            )
+            managers_by_id = {manager["id"]: manager for manager in managers}
+            notifications = [
+                build_asset_allocated_notification(
+                    requested_user,
+                    managers_by_id.get(requested_user.get("reporting_manager_id")),
+                    hr_managers,
+                    current_user,
+                    asset_types_by_id.get(allocation["asset_type_id"]),
+                    assets_by_id[allocation["asset_definition_id"]]
+                )
+                for allocation, requested_user in zip(allocations, requested_users)
+                if requested_user
+            ]
+            background_tasks.add_task(send_notification_batch, notifications)
+        except Exception as e:
+            # Log error but don't fail the allocations
+            logging.error(f"Failed to queue asset allocation notifications: {str(e)}")
+    
+    errors.sort(key=lambda e: int(e["index"]))
+    return BulkAllocationResult(
+        success=len(allocations) > 0,
+        message=f"Bulk allocation completed. {len(allocations)} allocated, {len(errors)} failed.",
+        total=len(items),
+        allocated=len(allocations),
+        failed=len(errors),
+        allocations=[AssetAllocation(**allocation) for allocation in allocations],
+        errors=errors
+    )
+
+# Auto-match cost weights. The location term dominates, so a same-location match is always
+# preferred; within that, lower book value (0-1) and then older stock (0-0.5) are preferred.
+AUTO_MATCH_LOCATION_MISMATCH_COST = 10.0
+AUTO_MATCH_BOOK_VALUE_WEIGHT = 1.0
+AUTO_MATCH_STOCK_AGE_WEIGHT = 0.5
+AUTO_MATCH_URGENCY_WEIGHT = 1.0  # Only matters when there are fewer assets than requisitions
+
+AUTO_MATCH_TIE_TOLERANCE = 1e-9
+
+def solve_assignment(group_costs: np.ndarray, row_groups: np.ndarray, row_offsets: Optional[np.ndarray] = None) -> np.ndarray:
+    """Minimum-cost assignment of every row to a distinct column (rows <= columns).
+
+    Row i costs group_costs[row_groups[i]] + row_offsets[i] against the columns, so rows
+    that share a cost profile (e.g. requisitions from one location) are stored once; a
+    plain matrix is the case row_groups = arange(n). Uses the shortest augmenting path
+    method (Jonker-Volgenant) vectorized in NumPy. Columns tied at the shortest distance
+    are scanned together, which keeps interchangeable rows from being visited one by one.
+    Returns the column assigned to each row.
+    """
+    n_rows, n_cols = len(row_groups), group_costs.shape[1]
+    if n_rows > n_cols:
+        raise ValueError("solve_assignment needs at least as many columns as rows")
+    offsets = np.zeros(n_rows) if row_offsets is None else row_offsets
+    u = np.zeros(n_rows)
+    v = np.zeros(n_cols)
+    col_for_row = np.full(n_rows, -1)
+    row_for_col = np.full(n_cols, -1)
+    all_cols = np.arange(n_cols)
+    
+    for current_row in range(n_rows):
+        # Dijkstra over columns from current_row until a free column is reached
+        shortest = np.full(n_cols, np.inf)
+        path = np.full(n_cols, -1)
+        remaining = np.ones(n_cols, dtype=bool)
+        scanned_rows = [current_row]
+        rows = np.array([current_row])
+        min_value = 0.0
+        sink = -1
+        while sink == -1:
+            # Relax from the rows just reached, using the best row of each cost group
+            values = offsets[rows] - u[rows]
+            order = np.lexsort((values, row_groups[rows]))
+            groups, first = np.unique(row_groups[rows][order], return_index=True)
+            best_rows = rows[order][first]
+            block = group_costs[groups] + values[order][first][:, None]
+            best = np.argmin(block, axis=0)
+            reduced = min_value + block[best, all_cols] - v
+            improved = remaining & (reduced < shortest)
+            path[improved] = best_rows[best][improved]
+            shortest[improved] = reduced[improved]
             
-            await email_service.send_notification(
-                notification_type="asset_allocated",
-                to_emails=to_emails,
-                cc_emails=cc_emails,
-                context=context
+            candidates = np.where(remaining, shortest, np.inf)
+            min_value = candidates.min()
+            if not np.isfinite(min_value):
+                raise ValueError("No feasible assignment")
+            ties = np.flatnonzero(candidates <= min_value + AUTO_MATCH_TIE_TOLERANCE)
+            free = ties[row_for_col[ties] == -1]
+            if free.size:
+                sink = int(free[0])
+                remaining[sink] = False
+            else:
+                remaining[ties] = False
+                rows = row_for_col[ties]
+                scanned_rows.extend(rows.tolist())
+        
+        # Update the dual variables
+        u[current_row] += min_value
+        other_rows = np.array(scanned_rows[1:], dtype=int)
+        if other_rows.size:
+            u[other_rows] += min_value - shortest[col_for_row[other_rows]]
+        scanned_cols = ~remaining
+        v[scanned_cols] -= min_value - shortest[scanned_cols]
+        
+        # Augment along the path back to current_row
+        col = sink
+        while True:
+            row = path[col]
+            row_for_col[col] = row
+            col_for_row[row], col = col, col_for_row[row]
+            if row == current_row:
+                break
+    
+    return col_for_row
+
+def normalize(values: np.ndarray) -> np.ndarray:
+    """Scale values to 0-1; constant input maps to 0"""
+    spread = values.max() - values.min() if values.size else 0
+    return (values - values.min()) / spread if spread else np.zeros(len(values))
+
+def match_requisitions_to_assets(requisitions: List[dict], assets: List[dict]):
+    """Cost-minimizing assignment of one asset type's requisitions to its available assets.
+
+    requisitions need a location_id (the requester's) and sort_key (urgency, earliest
+    first). The cost of giving asset j to requisition i is a location mismatch penalty plus
+    the asset's normalized book value and stock age, plus the requisition's urgency when
+    assets are scarce. Because only the location term depends on the pair, an optimal plan
+    only ever uses each location's cheapest assets up to its demand and the overall cheapest
+    assets, so the solver runs on at most two columns per requisition.
+    Returns a list of (requisition, asset, cost) and the unmatched requisitions.
+    """
+    if not requisitions or not assets:
+        return [], list(requisitions)
+    
+    book_values = np.array([
+        asset.get("current_depreciation_value") if asset.get("current_depreciation_value") is not None
+        else asset.get("asset_value", 0)
+        for asset in assets
+    ], dtype=float)
+    created = np.array([
+        asset["created_at"].timestamp() if isinstance(asset.get("created_at"), datetime) else 0
+        for asset in assets
+    ], dtype=float)
+    asset_costs = (
+        AUTO_MATCH_BOOK_VALUE_WEIGHT * normalize(book_values)
+        + AUTO_MATCH_STOCK_AGE_WEIGHT * normalize(created)
+    )
+    
+    # Candidate assets: the cheapest overall plus the cheapest per location, up to demand
+    demand = collections.Counter(req.get("location_id") for req in requisitions)
+    order = np.argsort(asset_costs, kind="stable")
+    taken_per_location = collections.Counter()
+    candidates = []
+    for rank, index in enumerate(order):
+        location_id = assets[index].get("location_id")
+        if rank < len(requisitions) or (location_id and taken_per_location[location_id] < demand[location_id]):
+            candidates.append(index)
+            taken_per_location[location_id] += 1
+    candidates = np.array(candidates)
+    candidate_costs = asset_costs[candidates]
+    
+    # Integer location codes; the last code stands for "no location" and never matches
+    location_ids = sorted({req["location_id"] for req in requisitions if req.get("location_id")}
+                          | {assets[i]["location_id"] for i in candidates if assets[i].get("location_id")})
+    no_location = len(location_ids)
+    codes = {location_id: code for code, location_id in enumerate(location_ids)}
+    req_locations = np.array([codes.get(req.get("location_id"), no_location) for req in requisitions])
+    asset_locations = np.array([codes.get(assets[i].get("location_id"), no_location) for i in candidates])
+    
+    def mismatch(location_code, other_codes):
+        return (other_codes != location_code) | (other_codes == no_location)
+    
+    # Earliest due date / oldest request gets the lowest urgency cost
+    urgency_rank = np.empty(len(requisitions))
+    urgency_rank[sorted(range(len(requisitions)), key=lambda i: requisitions[i]["sort_key"])] = np.arange(len(requisitions))
+    urgency_costs = AUTO_MATCH_URGENCY_WEIGHT * normalize(urgency_rank)
+    
+    location_range = range(no_location + 1)
+    if len(requisitions) <= len(candidates):
+        # Requisitions from the same location share a cost profile over the assets
+        group_costs = np.stack([
+            candidate_costs + AUTO_MATCH_LOCATION_MISMATCH_COST * mismatch(code, asset_locations)
+            for code in location_range
+        ])
+        assigned = solve_assignment(group_costs, req_locations, urgency_costs)
+        pairs = list(enumerate(assigned))
+    else:
+        # More requisitions than assets: assign every asset to a requisition instead
+        group_costs = np.stack([
+            urgency_costs + AUTO_MATCH_LOCATION_MISMATCH_COST * mismatch(code, req_locations)
+            for code in location_range
+        ])
+        assigned = solve_assignment(group_costs, asset_locations, candidate_costs)
+        pairs = sorted((i, j) for j, i in enumerate(assigned))
+    
+    matches = []
+    matched_rows = set()
+    for i, j in pairs:
+        cost = (
+            urgency_costs[i] + candidate_costs[j]
+            + AUTO_MATCH_LOCATION_MISMATCH_COST * mismatch(req_locations[i], asset_locations[j])
+        )
+        matches.append((requisitions[i], assets[candidates[j]], float(cost)))
+        matched_rows.add(i)
+    unmatched = [req for i, req in enumerate(requisitions) if i not in matched_rows]
+    return matches, unmatched
+
+@api_router.get("/asset-allocations/auto-match", response_model=AutoMatchPlan)
+async def auto_match_asset_allocations(
+    asset_manager_id: Optional[str] = None,
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
+):
+    """Propose an asset for every requisition pending allocation.
+
+    Asset Managers get a plan for the requisitions assigned to them; Administrators can
+    pass asset_manager_id or get a plan for all pending requisitions. Nothing is allocated;
+    the proposals can be submitted as-is to POST /asset-allocations/bulk.
+    """
+    if UserRole.ADMINISTRATOR not in current_user.roles:
+        asset_manager_id = current_user.id
+    
+    query = {"status": {"$in": ALLOCATABLE_REQUISITION_STATUSES}}
+    if asset_manager_id:
+        query["assigned_to"] = asset_manager_id
+    requisitions = await db.asset_requisitions.find(query, {"_id": 0}).to_list(None)
+    
+    asset_type_ids = list({req["asset_type_id"] for req in requisitions})
+    requester_ids = list({req["requested_by"] for req in requisitions})
+    reserved = await get_assets_reserved_by_others(current_user.id)
+    assets, requesters = await asyncio.gather(
+        db.asset_definitions.find(
+            {"status": AssetStatus.AVAILABLE, "asset_type_id": {"$in": asset_type_ids}, "id": {"$nin": list(reserved)}},
+            {"_id": 0, "id": 1, "asset_type_id": 1, "asset_type_name": 1, "asset_code": 1, "asset_value": 1,
+             "current_depreciation_value": 1, "location_id": 1, "location_name": 1, "created_at": 1}
+        ).to_list(None),
+        db.users.find({"id": {"$in": requester_ids}}, {"_id": 0, "id": 1, "location_id": 1, "location_name": 1}).to_list(None)
+    )
+    requesters_by_id = {user["id"]: user for user in requesters}
+    
+    # Group by asset type; requisitions only match assets of the requested type
+    requisitions_by_type = collections.defaultdict(list)
+    for req in requisitions:
+        requester = requesters_by_id.get(req["requested_by"], {})
+        req["location_id"] = requester.get("location_id")
+        req["location_name"] = requester.get("location_name")
+        required_by = req.get("required_by_date") or datetime.max
+        created_at = req.get("created_at") or datetime.max
+        req["sort_key"] = (required_by.replace(tzinfo=None), created_at.replace(tzinfo=None))
+        requisitions_by_type[req["asset_type_id"]].append(req)
+    assets_by_type = collections.defaultdict(list)
+    for asset in assets:
+        assets_by_type[asset["asset_type_id"]].append(asset)
+    
+    def solve_all():
+        return {
+            asset_type_id: match_requisitions_to_assets(type_requisitions, assets_by_type[asset_type_id])
+            for asset_type_id, type_requisitions in requisitions_by_type.items()
+        }
+    
+    # The solver is CPU-bound; keep it off the event loop
+    results = await asyncio.get_running_loop().run_in_executor(None, solve_all)
+    
+    proposals = []
+    unmatched = []
+    for asset_type_id, (matches, type_unmatched) in results.items():
+        for req, asset, cost in matches:
+            proposals.append(AutoMatchProposal(
+                requisition_id=req["id"],
+                requested_for=req["requested_by"],
+                requested_for_name=req.get("requested_by_name"),
+                requisition_location_name=req.get("location_name"),
+                asset_type_id=asset_type_id,
+                asset_type_name=asset.get("asset_type_name") or req.get("asset_type_name"),
+                asset_definition_id=asset["id"],
+                asset_code=asset["asset_code"],
+                asset_location_name=asset.get("location_name"),
+                same_location=bool(req["location_id"]) and req["location_id"] == asset.get("location_id"),
+                book_value=asset.get("current_depreciation_value") if asset.get("current_depreciation_value") is not None else asset.get("asset_value", 0),
+                cost=round(cost, 4)
+            ))
+        reason = "Not enough available assets of this type" if assets_by_type[asset_type_id] else "No available assets of this type"
+        unmatched.extend({"requisition_id": req["id"], "reason": reason} for req in type_unmatched)
+    
+    proposals.sort(key=lambda p: (p.asset_type_name or "", p.asset_code))
+    return AutoMatchPlan(
+        total_requisitions=len(requisitions),
+        matched=len(proposals),
+        unmatched=len(unmatched),
+        same_location_matches=sum(1 for p in proposals if p.same_location),
+        total_book_value=sum(p.book_value for p in proposals),
+        proposals=proposals,
+        unmatched_requisitions=unmatched
+    )
+
+@api_router.get("/pending-allocations")
+async def get_pending_allocations(
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
+):
+    """Get approved requisitions pending allocation"""
+    pending_requisitions = await db.asset_requisitions.find({
+        "status": {"$in": [RequisitionStatus.MANAGER_APPROVED, RequisitionStatus.HR_APPROVED]}
+    }).to_list(1000)
+    
+    return [AssetRequisition(**req) for req in pending_requisitions]
+
+ALLOCATION_QUEUE_MAX_PAGE_SIZE = 200
+ALLOCATION_QUEUE_MAX_CLAIM = 50
+ALLOCATION_CLAIM_MINUTES = 30  # Claims lapse so abandoned items return to the queue
+ALLOCATION_QUEUE_SORT = [("queue_due_date", 1), ("created_at", 1), ("id", 1)]
+QUEUE_NO_DUE_DATE = datetime(9999, 12, 31, tzinfo=timezone.utc)  # Sorts undated requisitions last
+
+def as_utc(value: datetime) -> datetime:
+    """MongoDB returns naive UTC datetimes; make them comparable with aware ones"""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def is_claimed_by_other(requisition: dict, user_id: str) -> bool:
+    """Whether another Asset Manager holds an unexpired queue claim on the requisition"""
+    return (
+        bool(requisition.get("claimed_by")) and requisition["claimed_by"] != user_id
+        and requisition.get("claim_expires_at") is not None
+        and as_utc(requisition["claim_expires_at"]) > datetime.now(timezone.utc)
+    )
+
+def unclaimed_requisition_query() -> dict:
+    return {"$or": [{"claimed_by": None}, {"claim_expires_at": {"$lte": datetime.now(timezone.utc)}}]}
+
+def allocation_queue_query(current_user: User, location_id: Optional[str]) -> dict:
+    """Pending-allocation filter for the caller's own queue or a shared location queue"""
+    query = {"status": {"$in": ALLOCATABLE_REQUISITION_STATUSES}}
+    if location_id:
+        query["location_id"] = location_id
+    else:
+        query["assigned_to"] = current_user.id
+    return query
+
+def encode_queue_cursor(requisition: dict) -> str:
+    key = [requisition["queue_due_date"].isoformat(), requisition["created_at"].isoformat(), requisition["id"]]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def decode_queue_cursor(cursor: str) -> dict:
+    """Keyset filter for the items after the cursor in ALLOCATION_QUEUE_SORT order"""
+    try:
+        due, created, requisition_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        due, created = datetime.fromisoformat(due), datetime.fromisoformat(created)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {"$or": [
+        {"queue_due_date": {"$gt": due}},
+        {"queue_due_date": due, "created_at": {"$gt": created}},
+        {"queue_due_date": due, "created_at": created, "id": {"$gt": requisition_id}}
+    ]}
+
+@api_router.get("/allocation-queue", response_model=AllocationQueuePage)
+async def get_allocation_queue(
+    location_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    unclaimed_only: bool = False,
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
+):
+    """Requisitions pending allocation, earliest due date first and then oldest first.
+
+    Without location_id this is the caller's own queue (requisitions routed to them); with
+    it, the shared queue of requisitions from that location. Pass next_cursor from the
+    previous page to continue.
+    """
+    limit = max(1, min(limit, ALLOCATION_QUEUE_MAX_PAGE_SIZE))
+    conditions = [allocation_queue_query(current_user, location_id)]
+    if cursor:
+        conditions.append(decode_queue_cursor(cursor))
+    if unclaimed_only:
+        conditions.append(unclaimed_requisition_query())
+    
+    items = await db.asset_requisitions.find(
+        {"$and": conditions}, {"_id": 0}
+    ).sort(ALLOCATION_QUEUE_SORT).limit(limit + 1).to_list(limit + 1)
+    
+    next_cursor = encode_queue_cursor(items[limit - 1]) if len(items) > limit else None
+    return AllocationQueuePage(items=[AssetRequisition(**req) for req in items[:limit]], next_cursor=next_cursor)
+
+@api_router.post("/allocation-queue/claim", response_model=List[AssetRequisition])
+async def claim_allocation_queue_items(
+    claim_request: AllocationQueueClaimRequest,
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
+):
+    """Claim the next N unclaimed requisitions from a queue, in priority order.
+
+    Each item is claimed with its own find_one_and_update, so Asset Managers draining the
+    same queue concurrently never receive the same requisition. Claims expire after
+    ALLOCATION_CLAIM_MINUTES.
+    """
+    if not 1 <= claim_request.count <= ALLOCATION_QUEUE_MAX_CLAIM:
+        raise HTTPException(status_code=400, detail=f"Count must be between 1 and {ALLOCATION_QUEUE_MAX_CLAIM}")
+    
+    query = {"$and": [allocation_queue_query(current_user, claim_request.location_id), unclaimed_requisition_query()]}
+    claimed_at = datetime.now(timezone.utc)
+    claim = {"$set": {
+        "claimed_by": current_user.id,
+        "claimed_by_name": current_user.name,
+        "claimed_at": claimed_at,
+        "claim_expires_at": claimed_at + timedelta(minutes=ALLOCATION_CLAIM_MINUTES),
+        "updated_at": claimed_at
+    }}
+    
+    claimed = []
+    for _ in range(claim_request.count):
+        requisition = await db.asset_requisitions.find_one_and_update(
+            query, claim, sort=ALLOCATION_QUEUE_SORT, return_document=ReturnDocument.AFTER
+        )
+        if not requisition:
+            break
+        claimed.append(requisition)
+    if claimed:
+        await publish_requisition_events("claimed", claimed)
+    return [AssetRequisition(**requisition) for requisition in claimed]
+
+@api_router.post("/allocation-queue/{requisition_id}/release", response_model=AssetRequisition)
+async def release_allocation_queue_item(
+    requisition_id: str,
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
+):
+    """Return a claimed requisition to its queue"""
+    query = {"id": requisition_id}
+    if UserRole.ADMINISTRATOR not in current_user.roles:
+        query["claimed_by"] = current_user.id
+    requisition = await db.asset_requisitions.find_one_and_update(
+        query,
+        {"$set": {
+            "claimed_by": None,
+            "claimed_by_name": None,
+            "claimed_at": None,
+            "claim_expires_at": None,
+            "updated_at": datetime.now(timezone.utc)
+        }},
+        return_document=ReturnDocument.AFTER
+    )
+    if not requisition:
+        raise HTTPException(status_code=404, detail="Requisition not found or not claimed by you")
+    await publish_requisition_events("released", [requisition])
+    return AssetRequisition(**requisition)
+
+# Asset Reservation Routes (Asset Manager)
+ASSET_RESERVATION_DEFAULT_MINUTES = 15
+ASSET_RESERVATION_MAX_MINUTES = 240
+
+def active_reservations_query(**filters) -> dict:
+    """Reservations that have not expired yet; the TTL monitor only deletes about once a minute"""
+    return {"expires_at": {"$gt": datetime.now(timezone.utc)}, **filters}
+
+async def get_assets_reserved_by_others(user_id: str, asset_ids: Optional[List[str]] = None) -> Dict[str, dict]:
+    """Active reservations held by other users, keyed by asset id"""
+    filters = {"reserved_by": {"$ne": user_id}}
+    if asset_ids is not None:
+        filters["asset_definition_id"] = {"$in": asset_ids}
+    reservations = await db.asset_reservations.find(active_reservations_query(**filters), {"_id": 0}).to_list(None)
+    return {reservation["asset_definition_id"]: reservation for reservation in reservations}
+
+@api_router.get("/asset-reservations", response_model=List[AssetReservation])
+async def get_asset_reservations(
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
+):
+    """Get active reservations; Asset Managers see their own"""
+    filters = {} if UserRole.ADMINISTRATOR in current_user.roles else {"reserved_by": current_user.id}
+    reservations = await db.asset_reservations.find(active_reservations_query(**filters)).to_list(1000)
+    return [AssetReservation(**reservation) for reservation in reservations]
+
+@api_router.post("/asset-reservations", response_model=AssetReservation)
+async def reserve_asset(
+    reservation_data: AssetReservationCreate,
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
+):
+    """Hold an available asset while its allocation is being prepared.
+
+    The unique index on asset_definition_id means only one reservation per asset can exist,
+    so concurrent attempts are settled by a single insert. Reservations expire on their own
+    and are removed when the asset is allocated.
+    """
+    if not 1 <= reservation_data.minutes <= ASSET_RESERVATION_MAX_MINUTES:
+        raise HTTPException(status_code=400, detail=f"Minutes must be between 1 and {ASSET_RESERVATION_MAX_MINUTES}")
+    
+    asset_def = await db.asset_definitions.find_one({"id": reservation_data.asset_definition_id})
+    if not asset_def:
+        raise HTTPException(status_code=404, detail="Asset definition not found")
+    if asset_def["status"] != AssetStatus.AVAILABLE:
+        raise HTTPException(status_code=400, detail="Asset is not available for allocation")
+    
+    now = datetime.now(timezone.utc)
+    reservation = AssetReservation(
+        asset_definition_id=asset_def["id"],
+        asset_code=asset_def["asset_code"],
+        requisition_id=reservation_data.requisition_id,
+        reserved_by=current_user.id,
+        reserved_by_name=current_user.name,
+        created_at=now,
+        expires_at=now + timedelta(minutes=reservation_data.minutes)
+    )
+    
+    try:
+        await db.asset_reservations.insert_one(reservation.dict())
+    except DuplicateKeyError:
+        # Clear a reservation that has expired but not been removed by the TTL monitor yet
+        await db.asset_reservations.delete_one({"asset_definition_id": asset_def["id"], "expires_at": {"$lte": now}})
+        try:
+            await db.asset_reservations.insert_one(reservation.dict())
+        except DuplicateKeyError:
+            existing = await db.asset_reservations.find_one({"asset_definition_id": asset_def["id"]}) or {}
+            raise HTTPException(
+                status_code=409,
+                detail=f"Asset is already reserved by {existing.get('reserved_by_name', 'another user')}"
             )
-    except Exception as e:
-        # Log error but don't fail the allocation
-        logging.error(f"Failed to send asset allocation notification: {str(e)}")
     
-    return AssetAllocation(**allocation_dict)
+    return reservation
 
-@api_router.get("/pending-allocations")
-async def get_pending_allocations(
+@api_router.delete("/asset-reservations/{reservation_id}")
+async def release_asset_reservation(
+    reservation_id: str,
     current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
 ):
-    """Get approved requisitions pending allocation"""
-    pending_requisitions = await db.asset_requisitions.find({
-        "status": {"$in": [RequisitionStatus.MANAGER_APPROVED, RequisitionStatus.HR_APPROVED]}
-    }).to_list(1000)
+    """Release an asset reservation"""
+    query = {"id": reservation_id}
+    if UserRole.ADMINISTRATOR not in current_user.roles:
+        query["reserved_by"] = current_user.id
+    result = await db.asset_reservations.delete_one(query)
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Reservation not found")
     
-    return [AssetRequisition(**req) for req in pending_requisitions]
+    return {"message": "Reservation released successfully"}
 
 # Asset Retrieval Routes (Asset Manager)
 @api_router.get("/asset-retrievals", response_model=List[AssetRetrieval])
@@ -2624,15 +5416,18 @@ async def get_asset_retrievals(
 @api_router.post("/asset-retrievals", response_model=AssetRetrieval)
 async def create_asset_retrieval(
     retrieval_data: AssetRetrievalCreate,
-    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR])),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Create asset retrieval record for employee separation"""
     # Get employee and asset details
-    employee = await db.users.find_one({"id": retrieval_data.employee_id})
+    employee, asset_def = await asyncio.gather(
+        loaders.users.load(retrieval_data.employee_id),
+        db.asset_definitions.find_one({"id": retrieval_data.asset_definition_id})
+    )
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     
-    asset_def = await db.asset_definitions.find_one({"id": retrieval_data.asset_definition_id})
     if not asset_def:
         raise HTTPException(status_code=404, detail="Asset definition not found")
     
@@ -2641,7 +5436,7 @@ async def create_asset_retrieval(
         raise HTTPException(status_code=400, detail="Asset is not allocated to this employee")
     
     # Get asset type details
-    asset_type = await db.asset_types.find_one({"id": asset_def["asset_type_id"]})
+    asset_type = await loaders.asset_types.load(asset_def["asset_type_id"])
     
     # Find original allocation
     allocation = await db.asset_allocations.find_one({
@@ -2697,16 +5492,18 @@ async def update_asset_retrieval(
                     "$set": {
                         "status": new_status,
                         "allocated_to": None,
-                        "allocated_to_name": None
+                        "allocated_to_name": None,
+                        "updated_at": datetime.now(timezone.utc)
                     }
                 }
             )
+            await bump_collection_versions("asset_definitions")
         
         # Update allocation status
         if existing_retrieval.get("allocation_id"):
             await db.asset_allocations.update_one(
                 {"id": existing_retrieval["allocation_id"]},
-                {"$set": {"status": AssetAllocationStatus.RECEIVED_FROM_EMPLOYEE}}
+                {"$set": {"status": AssetAllocationStatus.RECEIVED_FROM_EMPLOYEE, "updated_at": datetime.now(timezone.utc)}}
             )
         
         update_data["status"] = "Recovered"
@@ -3010,11 +5807,16 @@ Asset Management System
 # Location Management Routes
 @api_router.get("/locations", response_model=List[Location])
 async def get_locations(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user)
 ):
     """Get all locations"""
-    locations = await db.locations.find().to_list(1000)
-    return [Location(**location) for location in locations]
+    not_modified = await not_modified_response(request, response, ["locations"])
+    if not_modified:
+        return not_modified
+    _, reference_data = await get_reference_data()
+    return reference_data["locations"]
 
 @api_router.post("/locations", response_model=Location)
 async def create_location(
@@ -3033,12 +5835,14 @@ async def create_location(
     location_dict["updated_at"] = datetime.now(timezone.utc)
     
     await db.locations.insert_one(location_dict)
+    await bump_collection_versions("locations")
     return Location(**location_dict)
 
 @api_router.put("/locations/{location_id}", response_model=Location)
 async def update_location(
     location_id: str,
     location_update: LocationUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(require_role([UserRole.ADMINISTRATOR]))
 ):
     """Update location"""
@@ -3059,6 +5863,9 @@ async def update_location(
     update_data["updated_at"] = datetime.now(timezone.utc)
     
     await db.locations.update_one({"id": location_id}, {"$set": update_data})
+    await bump_collection_versions("locations")
+    if update_data.get("name") and update_data["name"] != existing["name"]:
+        await queue_name_propagation("locations", location_id, update_data["name"], current_user.id, background_tasks)
     
     updated = await db.locations.find_one({"id": location_id})
     return Location(**updated)
@@ -3090,6 +5897,7 @@ async def delete_location(
         )
     
     await db.locations.delete_one({"id": location_id})
+    await bump_collection_versions("locations")
     return {"message": "Location deleted successfully"}
 
 # Asset Manager Location Assignment Routes
@@ -3197,6 +6005,7 @@ async def set_default_location_for_users(
     )
     
     total_updated = result.modified_count + result2.modified_count
+    await bump_collection_versions("locations", "users")
     
     return {
         "message": f"Default location set for {total_updated} existing users",
@@ -3212,8 +6021,8 @@ async def get_separation_reasons(
     current_user: User = Depends(require_role([UserRole.HR_MANAGER, UserRole.ADMINISTRATOR]))
 ):
     """Get all separation reasons"""
-    reasons = await db.separation_reasons.find().to_list(100)
-    return [SeparationReason(**reason) for reason in reasons]
+    _, reference_data = await get_reference_data()
+    return reference_data["separation_reasons"]
 
 @api_router.post("/separation-reasons", response_model=SeparationReason)
 async def create_separation_reason(
@@ -3234,6 +6043,7 @@ async def create_separation_reason(
     }
     
     await db.separation_reasons.insert_one(reason_dict)
+    await bump_collection_versions("separation_reasons")
     return SeparationReason(**reason_dict)
 
 # NDC Request Management
@@ -3257,132 +6067,146 @@ async def get_ndc_requests(
     
     return [NDCRequest(**request) for request in requests]
 
+async def load_ndc_routing_data(assets: List[dict], location_ids: List[Optional[str]]) -> dict:
+    """Prefetch everything needed to route NDC assets to Asset Managers.
+
+    One $in query each for the asset types, the Asset Manager location assignments and
+    the Asset Managers themselves, plus the Administrator used as fallback.
+    """
+    asset_types = await db.asset_types.find(
+        {"id": {"$in": list({asset["asset_type_id"] for asset in assets})}}
+    ).to_list(None)
+    manager_ids = list({at["assigned_asset_manager_id"] for at in asset_types if at.get("assigned_asset_manager_id")})
+    am_locations, asset_managers, fallback_admin = await asyncio.gather(
+        db.asset_manager_locations.find(
+            {"asset_manager_id": {"$in": manager_ids}, "location_id": {"$in": location_ids}},
+            {"_id": 0, "asset_manager_id": 1, "location_id": 1}
+        ).to_list(None),
+        db.users.find({"id": {"$in": manager_ids}}).to_list(None),
+        db.users.find_one({"roles": {"$in": [UserRole.ADMINISTRATOR]}})
+    )
+    return {
+        "asset_types": {at["id"]: at for at in asset_types},
+        "am_locations": {(aml["asset_manager_id"], aml.get("location_id")) for aml in am_locations},
+        "asset_managers": {am["id"]: am for am in asset_managers},
+        "fallback_admin": fallback_admin
+    }
+
+def group_ndc_assets_by_asset_manager(assets: List[dict], employee: dict, routing: dict) -> Dict[str, dict]:
+    """Group an employee's assets by the Asset Manager responsible for recovering them.
+
+    An asset goes to its type's Asset Manager when that manager is assigned to the
+    employee's location, otherwise to an Administrator.
+    """
+    asset_manager_groups = {}
+    for asset in assets:
+        asset_type = routing["asset_types"].get(asset["asset_type_id"])
+        
+        # Find Asset Manager for this asset (by location + asset type)
+        asset_manager = None
+        am_id = asset_type.get("assigned_asset_manager_id") if asset_type else None
+        if am_id and (am_id, employee.get("location_id")) in routing["am_locations"]:
+            asset_manager = routing["asset_managers"].get(am_id)
+        
+        # Fallback to Administrator if no Asset Manager found
+        if not asset_manager:
+            asset_manager = routing["fallback_admin"]
+        
+        if asset_manager:
+            group = asset_manager_groups.setdefault(asset_manager["id"], {"asset_manager": asset_manager, "assets": []})
+            group["assets"].append(asset)
+    return asset_manager_groups
+
+def build_ndc_request_dict(ndc_data: NDCRequestCreate, employee: dict, approver: dict, asset_manager: dict, asset_count: int, current_user: User) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "employee_id": ndc_data.employee_id,
+        "employee_name": employee["name"],
+        "employee_code": employee.get("employee_code", "N/A"),
+        "employee_designation": employee.get("designation"),
+        "employee_date_of_joining": employee.get("date_of_joining"),
+        "employee_location_name": employee.get("location_name"),
+        "employee_reporting_manager_name": employee.get("reporting_manager_name"),
+        
+        "resigned_on": ndc_data.resigned_on,
+        "notice_period": ndc_data.notice_period,
+        "last_working_date": ndc_data.last_working_date,
+        "separation_approved_by": ndc_data.separation_approved_by,
+        "separation_approved_by_name": approver["name"],
+        "separation_approved_on": ndc_data.separation_approved_on,
+        "separation_reason": ndc_data.separation_reason,
+        
+        "created_by": current_user.id,
+        "created_by_name": current_user.name,
+        "asset_manager_id": asset_manager["id"],
+        "asset_manager_name": asset_manager["name"],
+        "status": "Pending",
+        "pending_count": asset_count,
+        "recovered_count": 0,
+        "not_recovered_count": 0,
+        
+        "created_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
+    }
+
+def build_ndc_recovery_dicts(ndc_request_id: str, assets: List[dict], asset_types_by_id: Dict[str, dict]) -> List[dict]:
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "ndc_request_id": ndc_request_id,
+            "asset_definition_id": asset["id"],
+            "asset_code": asset["asset_code"],
+            "asset_type_name": asset_types_by_id[asset["asset_type_id"]]["name"] if asset["asset_type_id"] in asset_types_by_id else "Unknown",
+            "asset_value": asset.get("asset_value", 0),
+            "status": "Pending",
+            "updated_at": datetime.now(timezone.utc)
+        }
+        for asset in assets
+    ]
+
 @api_router.post("/ndc-requests", response_model=dict)
 async def create_ndc_request(
     ndc_data: NDCRequestCreate,
-    current_user: User = Depends(require_role([UserRole.HR_MANAGER]))
+    current_user: User = Depends(require_role([UserRole.HR_MANAGER])),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Create NDC request for employee separation"""
-    # Get employee details
-    employee = await db.users.find_one({"id": ndc_data.employee_id})
+    # Get employee, separation approver and the employee's allocated assets
+    employee, approver, assigned_assets = await asyncio.gather(
+        loaders.users.load(ndc_data.employee_id),
+        loaders.users.load(ndc_data.separation_approved_by),
+        db.asset_definitions.find({
+            "allocated_to": ndc_data.employee_id,
+            "status": "Allocated"
+        }).to_list(1000)
+    )
     if not employee:
         raise HTTPException(status_code=404, detail="Employee not found")
     
-    # Get separation approver details
-    approver = await db.users.find_one({"id": ndc_data.separation_approved_by})
     if not approver:
         raise HTTPException(status_code=404, detail="Separation approver not found")
     
-    # Get all assets assigned to the employee
-    assigned_assets = await db.asset_definitions.find({
-        "allocated_to": ndc_data.employee_id,
-        "status": "Allocated"
-    }).to_list(1000)
-    
     if not assigned_assets:
         raise HTTPException(status_code=400, detail="Employee has no allocated assets")
     
     # Group assets by Asset Manager (based on location and asset type)
-    asset_manager_groups = {}
-    
-    for asset in assigned_assets:
-        # Get asset type details
-        asset_type = await db.asset_types.find_one({"id": asset["asset_type_id"]})
-        
-        # Find Asset Manager for this asset (by location + asset type)
-        asset_manager = None
-        if asset_type and asset_type.get("assigned_asset_manager_id"):
-            # Check if Asset Manager is assigned to the employee's location
-            am_location = await db.asset_manager_locations.find_one({
-                "asset_manager_id": asset_type["assigned_asset_manager_id"],
-                "location_id": employee.get("location_id")
-            })
-            if am_location:
-                asset_manager = await db.users.find_one({"id": asset_type["assigned_asset_manager_id"]})
-        
-        # Fallback to Administrator if no Asset Manager found
-        if not asset_manager:
-            # Find an Administrator
-            admin = await db.users.find_one({"roles": {"$in": [UserRole.ADMINISTRATOR]}})
-            if admin:
-                asset_manager = admin
-        
-        if asset_manager:
-            am_id = asset_manager["id"]
-            if am_id not in asset_manager_groups:
-                asset_manager_groups[am_id] = {
-                    "asset_manager": asset_manager,
-                    "assets": []
-                }
-            asset_manager_groups[am_id]["assets"].append(asset)
-    
-    # Create NDC requests for each Asset Manager
-    created_requests = []
+    routing, reporting_manager = await asyncio.gather(
+        load_ndc_routing_data(assigned_assets, [employee.get("location_id")]),
+        loaders.users.load(employee.get("reporting_manager_id"))
+    )
+    asset_manager_groups = group_ndc_assets_by_asset_manager(assigned_assets, employee, routing)
     
-    for am_id, group_data in asset_manager_groups.items():
-        asset_manager = group_data["asset_manager"]
-        assets = group_data["assets"]
-        
-        # Create NDC request
-        ndc_request_dict = {
-            "id": str(uuid.uuid4()),
-            "employee_id": ndc_data.employee_id,
-            "employee_name": employee["name"],
-            "employee_code": employee.get("employee_code", "N/A"),
-            "employee_designation": employee.get("designation"),
-            "employee_date_of_joining": employee.get("date_of_joining"),
-            "employee_location_name": employee.get("location_name"),
-            "employee_reporting_manager_name": employee.get("reporting_manager_name"),
-            
-            "resigned_on": ndc_data.resigned_on,
-            "notice_period": ndc_data.notice_period,
-            "last_working_date": ndc_data.last_working_date,
-            "separation_approved_by": ndc_data.separation_approved_by,
-            "separation_approved_by_name": approver["name"],
-            "separation_approved_on": ndc_data.separation_approved_on,
-            "separation_reason": ndc_data.separation_reason,
-            
-            "created_by": current_user.id,
-            "created_by_name": current_user.name,
-            "asset_manager_id": asset_manager["id"],
-            "asset_manager_name": asset_manager["name"],
-            "status": "Pending",
-            
-            "created_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
-        }
-        
+    async def create_group_request(asset_manager: dict, assets: List[dict]) -> dict:
+        """Create the NDC request and recovery records for one Asset Manager and notify them"""
+        ndc_request_dict = build_ndc_request_dict(ndc_data, employee, approver, asset_manager, len(assets), current_user)
         await db.ndc_requests.insert_one(ndc_request_dict)
-        
-        # Create asset recovery records
-        for asset in assets:
-            asset_type = await db.asset_types.find_one({"id": asset["asset_type_id"]})
-            
-            recovery_dict = {
-                "id": str(uuid.uuid4()),
-                "ndc_request_id": ndc_request_dict["id"],
-                "asset_definition_id": asset["id"],
-                "asset_code": asset["asset_code"],
-                "asset_type_name": asset_type["name"] if asset_type else "Unknown",
-                "asset_value": asset.get("asset_value", 0),
-                "status": "Pending",
-                "updated_at": datetime.now(timezone.utc)
-            }
-            
-            await db.ndc_asset_recovery.insert_one(recovery_dict)
-        
-        created_requests.append({
-            "ndc_request_id": ndc_request_dict["id"],
-            "asset_manager_name": asset_manager["name"],
-            "asset_count": len(assets)
-        })
+        publish_ndc_events("created", [ndc_request_dict])
+        await db.ndc_asset_recovery.insert_many(
+            build_ndc_recovery_dicts(ndc_request_dict["id"], assets, routing["asset_types"])
+        )
         
         # Send email notification to Asset Manager
         try:
-            # Get HR managers for CC
-            hr_managers = await db.users.find({"roles": UserRole.HR_MANAGER, "is_active": True}).to_list(100)
-            reporting_manager = await db.users.find_one({"id": employee.get("reporting_manager_id")}) if employee.get("reporting_manager_id") else None
-            
             to_emails = [asset_manager["email"]]
             cc_emails = [current_user.email]  # HR Manager
             
@@ -3406,11 +6230,253 @@ async def create_ndc_request(
             )
         except Exception as e:
             logging.error(f"Failed to send NDC creation notification: {str(e)}")
+        
+        return {
+            "ndc_request_id": ndc_request_dict["id"],
+            "asset_manager_name": asset_manager["name"],
+            "asset_count": len(assets)
+        }
+    
+    # Create NDC requests for each Asset Manager concurrently
+    created_requests = await asyncio.gather(*[
+        create_group_request(group_data["asset_manager"], group_data["assets"])
+        for group_data in asset_manager_groups.values()
+    ])
     
     return {
         "message": f"NDC requests created successfully for {len(created_requests)} Asset Manager(s)",
-        "requests": created_requests
+        "requests": list(created_requests)
+    }
+
+NDC_BATCH_MAX_SEPARATIONS = 1000
+NDC_BATCH_COLUMNS = [
+    'employee_email', 'resigned_on', 'notice_period', 'last_working_date',
+    'separation_approved_by_email', 'separation_approved_on', 'separation_reason'
+]
+
+async def create_ndc_requests_batch(
+    separations: List[Tuple[str, NDCRequestCreate]],
+    errors: List[Dict[str, str]],
+    current_user: User,
+    background_tasks: BackgroundTasks
+) -> NDCBatchResult:
+    """Raise NDC requests for many separations at once.
+
+    Employees and approvers are loaded with one $in query and all allocated assets with one
+    aggregation; NDC requests and recovery rows are inserted in bulk. Each Asset Manager
+    gets one consolidated email covering all of their employees.
+    """
+    total = len(separations) + len(errors)
+    employee_ids = list({separation.employee_id for _, separation in separations})
+    user_ids = list(set(employee_ids) | {separation.separation_approved_by for _, separation in separations})
+    users, asset_groups = await asyncio.gather(
+        db.users.find({"id": {"$in": user_ids}}).to_list(None),
+        db.asset_definitions.aggregate([
+            {"$match": {"allocated_to": {"$in": employee_ids}, "status": "Allocated"}},
+            {"$project": {"_id": 0}},
+            {"$group": {"_id": "$allocated_to", "assets": {"$push": "$$ROOT"}}}
+        ]).to_list(None)
+    )
+    users_by_id = {user["id"]: user for user in users}
+    assets_by_employee = {group["_id"]: group["assets"] for group in asset_groups}
+    
+    def fail(row: str, separation: NDCRequestCreate, message: str):
+        errors.append({"row": row, "employee_id": separation.employee_id, "error": message})
+    
+    accepted = []
+    seen_employee_ids = set()
+    for row, separation in separations:
+        if separation.employee_id in seen_employee_ids:
+            fail(row, separation, "Duplicate employee in batch")
+            continue
+        seen_employee_ids.add(separation.employee_id)
+        
+        employee = users_by_id.get(separation.employee_id)
+        if not employee:
+            fail(row, separation, "Employee not found")
+        elif separation.separation_approved_by not in users_by_id:
+            fail(row, separation, "Separation approver not found")
+        elif not assets_by_employee.get(separation.employee_id):
+            fail(row, separation, "Employee has no allocated assets")
+        else:
+            accepted.append((row, separation, employee))
+    
+    all_assets = [asset for _, separation, _ in accepted for asset in assets_by_employee[separation.employee_id]]
+    routing = await load_ndc_routing_data(
+        all_assets, list({employee.get("location_id") for _, _, employee in accepted})
+    ) if accepted else None
+    
+    # Group every employee's assets by Asset Manager in memory
+    ndc_requests = []
+    recoveries = []
+    created_requests = []
+    created_employees = 0
+    asset_manager_summaries = {}
+    for row, separation, employee in accepted:
+        asset_manager_groups = group_ndc_assets_by_asset_manager(
+            assets_by_employee[separation.employee_id], employee, routing
+        )
+        if not asset_manager_groups:
+            fail(row, separation, "No Asset Manager or Administrator found to recover the assets")
+            continue
+        created_employees += 1
+        
+        for group_data in asset_manager_groups.values():
+            asset_manager = group_data["asset_manager"]
+            assets = group_data["assets"]
+            ndc_request_dict = build_ndc_request_dict(
+                separation, employee, users_by_id[separation.separation_approved_by], asset_manager,
+                len(assets), current_user
+            )
+            ndc_requests.append(ndc_request_dict)
+            recoveries.extend(build_ndc_recovery_dicts(ndc_request_dict["id"], assets, routing["asset_types"]))
+            created_requests.append({
+                "ndc_request_id": ndc_request_dict["id"],
+                "employee_name": employee["name"],
+                "asset_manager_name": asset_manager["name"],
+                "asset_count": len(assets)
+            })
+            summary = asset_manager_summaries.setdefault(asset_manager["id"], {"asset_manager": asset_manager, "employees": []})
+            summary["employees"].append({
+                "employee_name": employee["name"],
+                "employee_designation": employee.get("designation", "N/A"),
+                "last_working_date": separation.last_working_date.strftime("%Y-%m-%d"),
+                "asset_count": len(assets)
+            })
+    
+    if ndc_requests:
+        await db.ndc_requests.insert_many(ndc_requests)
+        publish_ndc_events("created", ndc_requests)
+        await db.ndc_asset_recovery.insert_many(recoveries)
+        
+        # One consolidated email per Asset Manager, sent after the response
+        notifications = [
+            {
+                "notification_type": "ndc_batch_created",
+                "to_emails": [summary["asset_manager"]["email"]],
+                "cc_emails": [current_user.email],  # HR Manager
+                "context": {
+                    "asset_manager_name": summary["asset_manager"]["name"],
+                    "employee_count": len(summary["employees"]),
+                    "asset_count": sum(employee["asset_count"] for employee in summary["employees"]),
+                    "employees": summary["employees"]
+                }
+            }
+            for summary in asset_manager_summaries.values()
+        ]
+        background_tasks.add_task(send_notification_batch, notifications)
+    
+    errors.sort(key=lambda e: int(e["row"]))
+    return NDCBatchResult(
+        success=created_employees > 0,
+        message=(
+            f"Batch NDC creation completed. {len(created_requests)} NDC requests raised for "
+            f"{created_employees} employees, {len(errors)} failed."
+        ),
+        total=total,
+        created=created_employees,
+        failed=len(errors),
+        requests=created_requests,
+        errors=errors
+    )
+
+@api_router.post("/ndc-requests/batch", response_model=NDCBatchResult)
+async def create_ndc_requests_batch_endpoint(
+    batch_data: NDCBatchCreate,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(require_role([UserRole.HR_MANAGER]))
+):
+    """Create NDC requests for a list of separations, e.g. during a restructuring.
+
+    Rows in errors are the 0-based positions in the separations list.
+    """
+    if not batch_data.separations:
+        raise HTTPException(status_code=400, detail="No separations provided")
+    if len(batch_data.separations) > NDC_BATCH_MAX_SEPARATIONS:
+        raise HTTPException(status_code=400, detail=f"At most {NDC_BATCH_MAX_SEPARATIONS} separations can be processed at once")
+    
+    separations = [(str(index), separation) for index, separation in enumerate(batch_data.separations)]
+    return await create_ndc_requests_batch(separations, [], current_user, background_tasks)
+
+@api_router.post("/ndc-requests/batch/upload", response_model=NDCBatchResult)
+async def upload_ndc_requests_batch(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    current_user: User = Depends(require_role([UserRole.HR_MANAGER]))
+):
+    """Create NDC requests from a CSV or XLSX file of separations.
+
+    Employees and approvers are identified by email. Rows in errors are file line numbers.
+    """
+    if not file.filename.endswith(('.csv', '.xlsx')):
+        raise HTTPException(status_code=400, detail="Only CSV and XLSX files are allowed")
+    
+    frames = []
+    row_count = 0
+    try:
+        async with contextlib.aclosing(iter_upload_frames(file)) as upload_frames:
+            async for df in upload_frames:
+                missing_columns = [col for col in NDC_BATCH_COLUMNS if col not in df.columns]
+                if missing_columns:
+                    raise HTTPException(status_code=400, detail=f"Missing required columns: {', '.join(missing_columns)}")
+                row_count += len(df)
+                if row_count > NDC_BATCH_MAX_SEPARATIONS:
+                    raise HTTPException(status_code=400, detail=f"At most {NDC_BATCH_MAX_SEPARATIONS} separations can be processed at once")
+                frames.append(df.astype(object).where(df.notna(), None))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
+    
+    records = [(str(index + 2), record) for df in frames for index, record in zip(df.index, df.to_dict('records'))]
+    if not records:
+        raise HTTPException(status_code=400, detail="No separations provided")
+    
+    # Resolve every email in the file with a single case-insensitive query
+    emails = {
+        email
+        for _, record in records
+        for col in ('employee_email', 'separation_approved_by_email')
+        for email in [(record.get(col) or '').strip()]
+        if email
     }
+    users = await db.users.find(
+        {"email": {"$in": list(emails)}},
+        {"_id": 0, "id": 1, "email": 1},
+        collation=EMAIL_COLLATION
+    ).to_list(None)
+    users_by_email = {user["email"].casefold(): user for user in users}
+    
+    separations = []
+    errors = []
+    for row, record in records:
+        employee_email = (record.get('employee_email') or '').strip()
+        approver_email = (record.get('separation_approved_by_email') or '').strip()
+        employee = users_by_email.get(employee_email.casefold())
+        approver = users_by_email.get(approver_email.casefold())
+        if not employee:
+            errors.append({"row": row, "employee_id": "", "error": f'Employee with email "{employee_email}" not found'})
+            continue
+        if not approver:
+            errors.append({"row": row, "employee_id": employee["id"], "error": f'Separation approver with email "{approver_email}" not found'})
+            continue
+        try:
+            separation = NDCRequestCreate(
+                employee_id=employee["id"],
+                separation_approved_by=approver["id"],
+                **{col: (record.get(col) or '').strip() for col in NDC_BATCH_COLUMNS if not col.endswith('_email')}
+            )
+        except ValidationError as e:
+            first_error = e.errors()[0]
+            errors.append({
+                "row": row,
+                "employee_id": employee["id"],
+                "error": f"Invalid {first_error['loc'][0]}: {first_error['msg']}"
+            })
+            continue
+        separations.append((row, separation))
+    
+    return await create_ndc_requests_batch(separations, errors, current_user, background_tasks)
 
 @api_router.get("/ndc-requests/{ndc_id}/assets", response_model=List[NDCAssetRecovery])
 async def get_ndc_assets(
@@ -3431,11 +6497,130 @@ async def get_ndc_assets(
     assets = await db.ndc_asset_recovery.find({"ndc_request_id": ndc_id}).to_list(1000)
     return [NDCAssetRecovery(**asset) for asset in assets]
 
+# Recovery status -> counter kept on the NDC request
+NDC_RECOVERY_COUNTERS = {
+    "Pending": "pending_count",
+    "Recovered": "recovered_count",
+    "Not Recovered": "not_recovered_count"
+}
+
+def ndc_recovery_counter_changes(transitions: List[Tuple[str, str]]) -> Dict[str, int]:
+    """Net counter $inc for a list of (old status, new status) recovery changes"""
+    changes = collections.Counter()
+    for old_status, new_status in transitions:
+        if old_status == new_status:
+            continue
+        if old_status in NDC_RECOVERY_COUNTERS:
+            changes[NDC_RECOVERY_COUNTERS[old_status]] -= 1
+        if new_status in NDC_RECOVERY_COUNTERS:
+            changes[NDC_RECOVERY_COUNTERS[new_status]] += 1
+    return {counter: delta for counter, delta in changes.items() if delta}
+
+async def send_ndc_completed_notification(ndc_request: dict, current_user: User, loaders: Loaders):
+    """Notify the employee and HR Manager that all assets of an NDC request are processed"""
+    try:
+        employee, hr_manager = await loaders.users.load_many([ndc_request["employee_id"], ndc_request["created_by"]])
+        reporting_manager = await loaders.users.load(employee.get("reporting_manager_id")) if employee else None
+        
+        if employee and hr_manager:
+            to_emails = [employee["email"], hr_manager["email"]]
+            cc_emails = []
+            if reporting_manager:
+                cc_emails.append(reporting_manager["email"])
+            
+            context = {
+                "employee_name": employee["name"],
+                "hr_manager_name": hr_manager["name"],
+                "asset_manager_name": current_user.name,
+                "total_assets": sum(ndc_request.get(counter, 0) for counter in NDC_RECOVERY_COUNTERS.values()),
+                "recovered_assets": ndc_request.get("recovered_count", 0)
+            }
+            
+            await email_service.send_notification(
+                notification_type="ndc_completed",
+                to_emails=to_emails,
+                cc_emails=cc_emails,
+                context=context
+            )
+    except Exception as e:
+        logging.error(f"Failed to send NDC completion notification: {str(e)}")
+
+async def apply_ndc_recovery_changes(
+    ndc_request_id: str, transitions: List[Tuple[str, str]], current_user: User, loaders: Loaders
+) -> Optional[dict]:
+    """Apply recovery status changes to an NDC request's counters and complete it when none are pending.
+
+    The counters are updated with one $inc and completion is read from the returned document,
+    so the recovery rows are never rescanned. The completion update is guarded on the status,
+    so only one caller marks the request Completed and sends the email.
+    """
+    update = {"$set": {"updated_at": datetime.now(timezone.utc)}}
+    counter_changes = ndc_recovery_counter_changes(transitions)
+    if counter_changes:
+        update["$inc"] = counter_changes
+    ndc_request = await db.ndc_requests.find_one_and_update(
+        {"id": ndc_request_id}, update, return_document=ReturnDocument.AFTER
+    )
+    if ndc_request and ndc_request.get("pending_count") == 0 and ndc_request["status"] != "Completed":
+        completed = await db.ndc_requests.find_one_and_update(
+            {"id": ndc_request_id, "pending_count": 0, "status": {"$ne": "Completed"}},
+            {"$set": {"status": "Completed", "updated_at": datetime.now(timezone.utc)}},
+            return_document=ReturnDocument.AFTER
+        )
+        if completed:
+            publish_ndc_events("completed", [completed])
+            await send_ndc_completed_notification(completed, current_user, loaders)
+            return completed
+    if ndc_request:
+        publish_ndc_events("updated", [ndc_request])
+    return ndc_request
+
+def ndc_recovery_asset_update(recovery_data: NDCAssetRecoveryUpdate, ndc_request: dict) -> dict:
+    """Asset definition update for a recovery decision.
+
+    Recovered assets go back to stock (Damaged if returned damaged); unrecovered ones are
+    marked Lost and linked to the employee, which also re-links an asset re-marked from Recovered.
+    """
+    if not recovery_data.recovered:
+        return {
+            "$set": {
+                "status": AssetStatus.LOST,
+                "allocated_to": ndc_request["employee_id"],
+                "allocated_to_name": ndc_request.get("employee_name"),
+                "updated_at": datetime.now(timezone.utc)
+            }
+        }
+    return {
+        "$set": {
+            "status": AssetStatus.DAMAGED if recovery_data.asset_condition == AssetCondition.DAMAGED else AssetStatus.AVAILABLE,
+            "allocated_to": None,
+            "allocated_to_name": None,
+            "allocation_date": None,
+            "allocation_id": None,
+            "updated_at": datetime.now(timezone.utc)
+        }
+    }
+
+def ndc_recovery_asset_filter(asset_id: str, employee_id: str, previous_status: str) -> dict:
+    """Asset definition filter for applying a recovery decision over a row's previous status.
+
+    Pending and Not Recovered assets are still linked to the employee. A Recovered asset was
+    released to stock, so it only follows a re-mark while it is unallocated and still in the
+    status the recovery left it in; once it has been allocated again it is no longer the
+    employee's to recover.
+    """
+    if previous_status == "Recovered":
+        return {"id": asset_id, "allocated_to": None, "status": {"$in": [AssetStatus.AVAILABLE, AssetStatus.DAMAGED]}}
+    return {"id": asset_id, "allocated_to": employee_id}
+
+NDC_RECOVERY_ASSET_MOVED = "Asset has been allocated again since it was recovered; its recovery can no longer be changed"
+
 @api_router.put("/ndc-asset-recovery/{recovery_id}", response_model=NDCAssetRecovery)
 async def update_asset_recovery(
     recovery_id: str,
     recovery_data: NDCAssetRecoveryUpdate,
-    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR]))
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR])),
+    loaders: Loaders = Depends(get_loaders)
 ):
     """Update asset recovery details by Asset Manager"""
     recovery = await db.ndc_asset_recovery.find_one({"id": recovery_id})
@@ -3448,56 +6633,153 @@ async def update_asset_recovery(
         ndc_request and ndc_request["asset_manager_id"] != current_user.id):
         raise HTTPException(status_code=403, detail="Access denied")
     
+    # A decided row can only be re-marked while the asset is still where that decision left it
+    if ndc_request and recovery["status"] != "Pending":
+        asset = await db.asset_definitions.find_one(
+            ndc_recovery_asset_filter(recovery["asset_definition_id"], ndc_request["employee_id"], recovery["status"]),
+            {"_id": 0, "id": 1}
+        )
+        if not asset:
+            raise HTTPException(status_code=409, detail=NDC_RECOVERY_ASSET_MOVED)
+    
     update_data = recovery_data.dict()
     update_data["status"] = "Recovered" if recovery_data.recovered else "Not Recovered"
     update_data["updated_by"] = current_user.id
     update_data["updated_at"] = datetime.now(timezone.utc)
     
-    await db.ndc_asset_recovery.update_one({"id": recovery_id}, {"$set": update_data})
+    # The previous status comes from the write itself so concurrent updates count once
+    previous = await db.ndc_asset_recovery.find_one_and_update({"id": recovery_id}, {"$set": update_data})
+    if not previous:
+        raise HTTPException(status_code=404, detail="Asset recovery record not found")
     
-    # Check if all assets are processed for this NDC request
+    # Move the row between the NDC request's counters; completes the request when none are pending
     if ndc_request:
-        all_assets = await db.ndc_asset_recovery.find({"ndc_request_id": ndc_request["id"]}).to_list(1000)
-        processed_assets = [asset for asset in all_assets if asset.get("recovered") is not None]
-        
-        if len(processed_assets) == len(all_assets):
-            # All assets processed, update NDC request status
-            await db.ndc_requests.update_one(
-                {"id": ndc_request["id"]},
-                {"$set": {"status": "Completed", "updated_at": datetime.now(timezone.utc)}}
-            )
-            
-            # Send completion notification
-            try:
-                employee = await db.users.find_one({"id": ndc_request["employee_id"]})
-                hr_manager = await db.users.find_one({"id": ndc_request["created_by"]})
-                reporting_manager = await db.users.find_one({"id": employee.get("reporting_manager_id")}) if employee and employee.get("reporting_manager_id") else None
-                
-                if employee and hr_manager:
-                    to_emails = [employee["email"], hr_manager["email"]]
-                    cc_emails = []
-                    if reporting_manager:
-                        cc_emails.append(reporting_manager["email"])
-                    
-                    context = {
-                        "employee_name": employee["name"],
-                        "hr_manager_name": hr_manager["name"],
-                        "asset_manager_name": current_user.name,
-                        "total_assets": len(all_assets),
-                        "recovered_assets": len([a for a in all_assets if a.get("recovered") == True])
-                    }
-                    
-                    await email_service.send_notification(
-                        notification_type="ndc_completed",
-                        to_emails=to_emails,
-                        cc_emails=cc_emails,
-                        context=context
-                    )
-            except Exception as e:
-                logging.error(f"Failed to send NDC completion notification: {str(e)}")
+        await asyncio.gather(
+            db.asset_definitions.update_one(
+                ndc_recovery_asset_filter(previous["asset_definition_id"], ndc_request["employee_id"], previous["status"]),
+                ndc_recovery_asset_update(recovery_data, ndc_request)
+            ),
+            apply_ndc_recovery_changes(ndc_request["id"], [(previous["status"], update_data["status"])], current_user, loaders)
+        )
+        await bump_collection_versions("asset_definitions")
+    
+    return NDCAssetRecovery(**{**previous, **update_data})
+
+@api_router.put("/ndc-requests/{ndc_id}/recoveries", response_model=NDCBulkRecoveryResult)
+async def bulk_update_asset_recoveries(
+    ndc_id: str,
+    bulk_update: NDCBulkRecoveryUpdate,
+    current_user: User = Depends(require_role([UserRole.ASSET_MANAGER, UserRole.ADMINISTRATOR])),
+    loaders: Loaders = Depends(get_loaders)
+):
+    """Record recovery decisions for many assets of an NDC request at once.
+
+    Recovery rows and asset definitions are written with one bulk_write each, and the NDC
+    counters and completion are evaluated once at the end.
+    """
+    ndc_request = await db.ndc_requests.find_one({"id": ndc_id})
+    if not ndc_request:
+        raise HTTPException(status_code=404, detail="NDC request not found")
     
-    updated = await db.ndc_asset_recovery.find_one({"id": recovery_id})
-    return NDCAssetRecovery(**updated)
+    if UserRole.ASSET_MANAGER in current_user.roles and ndc_request["asset_manager_id"] != current_user.id:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    items = bulk_update.recoveries
+    if not items:
+        raise HTTPException(status_code=400, detail="No recoveries provided")
+    recovery_ids = [item.recovery_id for item in items]
+    if len(set(recovery_ids)) != len(recovery_ids):
+        raise HTTPException(status_code=400, detail="Each recovery can only appear once")
+    
+    recoveries = await db.ndc_asset_recovery.find(
+        {"ndc_request_id": ndc_id, "id": {"$in": recovery_ids}}, {"_id": 0}
+    ).to_list(None)
+    recoveries_by_id = {recovery["id"]: recovery for recovery in recoveries}
+    errors = [
+        {"recovery_id": item.recovery_id, "error": "Asset recovery record not found for this NDC request"}
+        for item in items if item.recovery_id not in recoveries_by_id
+    ]
+    items = [item for item in items if item.recovery_id in recoveries_by_id]
+    
+    # Re-marked rows only apply while the asset is still where the earlier decision left it
+    remarked = [recoveries_by_id[item.recovery_id] for item in items if recoveries_by_id[item.recovery_id]["status"] != "Pending"]
+    if remarked:
+        followable = await db.asset_definitions.find(
+            {"$or": [
+                ndc_recovery_asset_filter(recovery["asset_definition_id"], ndc_request["employee_id"], recovery["status"])
+                for recovery in remarked
+            ]},
+            {"_id": 0, "id": 1}
+        ).to_list(None)
+        followable_ids = {asset["id"] for asset in followable}
+        moved = {recovery["id"] for recovery in remarked if recovery["asset_definition_id"] not in followable_ids}
+        errors.extend({"recovery_id": recovery_id, "error": NDC_RECOVERY_ASSET_MOVED} for recovery_id in moved)
+        items = [item for item in items if item.recovery_id not in moved]
+    
+    updated_at = datetime.now(timezone.utc)
+    updates = {}
+    operations = []
+    for item in items:
+        update_data = item.dict(exclude={"recovery_id"})
+        update_data["status"] = "Recovered" if item.recovered else "Not Recovered"
+        update_data["updated_by"] = current_user.id
+        update_data["updated_at"] = updated_at
+        updates[item.recovery_id] = update_data
+        # Guard on the status read above so the counter change matches what was overwritten
+        operations.append(UpdateOne(
+            {"id": item.recovery_id, "status": recoveries_by_id[item.recovery_id]["status"]},
+            {"$set": update_data}
+        ))
+    
+    applied = items
+    if operations:
+        result = await db.ndc_asset_recovery.bulk_write(operations, ordered=False)
+        if result.matched_count != len(operations):
+            # Some rows changed in between; keep only the ones this request wrote
+            written = await db.ndc_asset_recovery.find(
+                {"id": {"$in": list(updates)}, "updated_by": current_user.id, "updated_at": updated_at},
+                {"_id": 0, "id": 1}
+            ).to_list(None)
+            written_ids = {recovery["id"] for recovery in written}
+            errors.extend(
+                {"recovery_id": item.recovery_id, "error": "Asset recovery record was updated concurrently, please retry"}
+                for item in items if item.recovery_id not in written_ids
+            )
+            applied = [item for item in items if item.recovery_id in written_ids]
+    
+    if applied:
+        await db.asset_definitions.bulk_write([
+            UpdateOne(
+                ndc_recovery_asset_filter(
+                    recoveries_by_id[item.recovery_id]["asset_definition_id"],
+                    ndc_request["employee_id"],
+                    recoveries_by_id[item.recovery_id]["status"]
+                ),
+                ndc_recovery_asset_update(item, ndc_request)
+            )
+            for item in applied
+        ], ordered=False)
+        await bump_collection_versions("asset_definitions")
+        ndc_request = await apply_ndc_recovery_changes(
+            ndc_id,
+            [(recoveries_by_id[item.recovery_id]["status"], updates[item.recovery_id]["status"]) for item in applied],
+            current_user,
+            loaders
+        ) or ndc_request
+    
+    return NDCBulkRecoveryResult(
+        success=len(applied) > 0,
+        message=f"Recovery update completed. {len(applied)} updated, {len(errors)} failed.",
+        total=len(recovery_ids),
+        updated=len(applied),
+        failed=len(errors),
+        ndc_status=ndc_request["status"],
+        recoveries=[
+            NDCAssetRecovery(**{**recoveries_by_id[item.recovery_id], **updates[item.recovery_id]})
+            for item in applied
+        ],
+        errors=errors
+    )
 
 @api_router.post("/ndc-requests/{ndc_id}/revoke")
 async def revoke_ndc_request(
@@ -3514,16 +6796,15 @@ async def revoke_ndc_request(
         raise HTTPException(status_code=400, detail="Cannot revoke completed NDC request")
     
     # Update NDC request status
-    await db.ndc_requests.update_one(
-        {"id": ndc_id},
-        {"$set": {
-            "status": "Revoked",
-            "revoke_reason": revoke_data.reason,
-            "revoked_by": current_user.id,
-            "revoked_at": datetime.now(timezone.utc),
-            "updated_at": datetime.now(timezone.utc)
-        }}
-    )
+    revoke_update = {
+        "status": "Revoked",
+        "revoke_reason": revoke_data.reason,
+        "revoked_by": current_user.id,
+        "revoked_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
+    }
+    await db.ndc_requests.update_one({"id": ndc_id}, {"$set": revoke_update})
+    publish_ndc_events("revoked", [{**ndc_request, **revoke_update}])
     
     # Update all associated asset recovery records
     await db.ndc_asset_recovery.update_many(
@@ -3533,6 +6814,14 @@ async def revoke_ndc_request(
     
     return {"message": "NDC request revoked successfully"}
 
+@api_router.post("/admin/rebuild-user-hierarchy")
+async def rebuild_user_hierarchy_endpoint(
+    current_user: User = Depends(require_role([UserRole.ADMINISTRATOR]))
+):
+    """Rebuild the reporting hierarchy from every user's reporting manager"""
+    links = await rebuild_user_hierarchy()
+    return {"message": "User hierarchy rebuilt successfully", "links": links}
+
 @api_router.post("/admin/reset-asset-system")
 async def reset_asset_system(
     current_user: User = Depends(require_role([UserRole.ADMINISTRATOR]))
@@ -3567,14 +6856,17 @@ async def reset_asset_system(
         deletion_summary["asset_retrievals"] = asset_retrievals_result.deleted_count
         
         # 3. Delete asset allocations
+        await record_deletions("asset_allocations", await db.asset_allocations.distinct("id"))
         asset_allocations_result = await db.asset_allocations.delete_many({})
         deletion_summary["asset_allocations"] = asset_allocations_result.deleted_count
         
         # 4. Delete asset requisitions
+        await record_deletions("asset_requisitions", await db.asset_requisitions.distinct("id"))
         asset_requisitions_result = await db.asset_requisitions.delete_many({})
         deletion_summary["asset_requisitions"] = asset_requisitions_result.deleted_count
         
         # 5. Delete asset definitions
+        await record_deletions("asset_definitions", await db.asset_definitions.distinct("id"))
         asset_definitions_result = await db.asset_definitions.delete_many({})
         deletion_summary["asset_definitions"] = asset_definitions_result.deleted_count
         
@@ -3595,6 +6887,7 @@ async def reset_asset_system(
             }}
         )
         deletion_summary["user_asset_assignments_cleared"] = user_update_result.modified_count
+        await bump_collection_versions("asset_definitions", "asset_types", "users")
         
         # Log the deletion for audit trail
         logging.info(f"Asset system reset performed by user {current_user.id} ({current_user.name})")
@@ -3614,6 +6907,57 @@ async def reset_asset_system(
         logging.error(f"Error during asset system reset: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to reset asset system: {str(e)}")
 
+# Live Update Event Stream
+async def get_event_stream_user(request: Request, token: Optional[str] = None) -> User:
+    """Authenticate from the bearer header, or a token query parameter since EventSource cannot set headers"""
+    authorization = request.headers.get("authorization", "")
+    session_token = authorization[7:] if authorization.lower().startswith("bearer ") else token
+    if not session_token:
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    user = await db.users.find_one({"session_token": session_token, "is_active": True})
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid authentication credentials")
+    return User(**user)
+
+def format_server_sent_event(event: dict) -> str:
+    data = json.dumps(jsonable_encoder(event["data"]))
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+@api_router.get("/events/stream")
+async def stream_events(
+    request: Request,
+    current_user: User = Depends(get_event_stream_user)
+):
+    """Server-sent events for requisitions, allocations and NDC requests relevant to the current user.
+
+    A resync event means updates were missed; reload the lists (or delta sync with updated_since).
+    """
+    subscriber = event_bus.subscribe(current_user, request.headers.get("last-event-id"))
+    
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                if subscriber.needs_resync:
+                    subscriber.needs_resync = False
+                    yield "event: resync\ndata: {}\n\n"
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), EVENT_STREAM_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_server_sent_event(event)
+        finally:
+            event_bus.unsubscribe(subscriber)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -3623,6 +6967,7 @@ app.add_middleware(
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Total-Count"],
 )
 
 # Configure logging
@@ -3632,6 +6977,173 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+async def create_asset_code_index():
+    """Make asset_code unique so concurrent imports cannot both insert the same code.
+
+    Codes that are already duplicated are left for an administrator to resolve: they are
+    logged and the plain index is kept until the next startup finds none.
+    """
+    duplicates = await db.asset_definitions.aggregate([
+        {"$group": {"_id": "$asset_code", "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$limit": 100}
+    ]).to_list(None)
+    if duplicates:
+        logging.error(
+            "Duplicate asset codes found, asset_code index is not unique until they are resolved: "
+            + ", ".join(str(duplicate["_id"]) for duplicate in duplicates)
+        )
+        await db.asset_definitions.create_index("asset_code")
+        return
+    existing_indexes = await db.asset_definitions.index_information()
+    if "asset_code_1" in existing_indexes and not existing_indexes["asset_code_1"].get("unique"):
+        await db.asset_definitions.drop_index("asset_code_1")
+    await db.asset_definitions.create_index("asset_code", unique=True)
+
+async def fail_orphaned_import_jobs():
+    """Fail import jobs left Queued or Running by a previous process and remove their files.
+
+    Jobs run as in-process background tasks, so none of them survive a restart; without
+    this they would report Running forever and the frontend would never stop polling.
+    """
+    orphaned = await db.import_jobs.find(
+        {"status": {"$in": [ImportJobStatus.QUEUED, ImportJobStatus.RUNNING]}},
+        {"_id": 0, "id": 1, "file_path": 1}
+    ).to_list(None)
+    if not orphaned:
+        return
+    now = datetime.now(timezone.utc)
+    await db.import_jobs.update_many(
+        {"id": {"$in": [job["id"] for job in orphaned]}},
+        {"$set": {
+            "status": ImportJobStatus.FAILED,
+            "message": "Import was interrupted by a server restart; rows already imported are kept",
+            "completed_at": now,
+            "updated_at": now
+        }}
+    )
+    for job in orphaned:
+        if job.get("file_path"):
+            # XLSX imports also leave the CSV they were converted to
+            for path in [job["file_path"], f"{job['file_path']}.csv"]:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    logging.warning(f"Marked {len(orphaned)} interrupted import job(s) as failed")
+
+@app.on_event("startup")
+async def create_indexes():
+    """Create the indexes the bulk and lookup paths rely on"""
+    await create_asset_code_index()
+    await db.asset_definitions.create_index("allocation_id", sparse=True)
+    await db.import_jobs.create_index("id", unique=True)
+    await fail_orphaned_import_jobs()
+    await db.asset_reservations.create_index("asset_definition_id", unique=True)
+    await db.asset_reservations.create_index("expires_at", expireAfterSeconds=0)
+    for queue_field in ["assigned_to", "location_id"]:
+        await db.asset_requisitions.create_index(
+            [(queue_field, 1), ("status", 1)] + ALLOCATION_QUEUE_SORT
+        )
+    # Requisitions created before queue ordering existed
+    await db.asset_requisitions.update_many(
+        {"queue_due_date": {"$exists": False}},
+        [{"$set": {"queue_due_date": {"$ifNull": ["$required_by_date", QUEUE_NO_DUE_DATE]}}}]
+    )
+    # Requisitions created before location_id was stamped join their requester's location queue
+    requester_ids = await db.asset_requisitions.distinct("requested_by", {"location_id": {"$exists": False}})
+    if requester_ids:
+        requesters = await db.users.find(
+            {"id": {"$in": requester_ids}}, {"_id": 0, "id": 1, "location_id": 1}
+        ).to_list(None)
+        if requesters:
+            await db.asset_requisitions.bulk_write([
+                UpdateMany(
+                    {"requested_by": requester["id"], "location_id": {"$exists": False}},
+                    {"$set": {"location_id": requester.get("location_id")}}
+                )
+                for requester in requesters
+            ], ordered=False)
+    # Requisitions created before requested_for_name was stored
+    await db.asset_requisitions.update_many(
+        {"requested_for_name": {"$exists": False}},
+        [{"$set": {"requested_for_name": {"$cond": [
+            {"$eq": ["$request_for", RequestFor.TEAM_MEMBER]}, "$team_member_name", "$requested_by_name"
+        ]}}}]
+    )
+    await db.name_propagation_jobs.create_index("created_at")
+    # Delta sync: updated_at on every synced collection and tombstones for deletions
+    for collection in ["asset_definitions", "asset_requisitions", "asset_allocations"]:
+        await db[collection].update_many(
+            {"updated_at": {"$exists": False}},
+            [{"$set": {"updated_at": {"$ifNull": ["$created_at", "$$NOW"]}}}]
+        )
+        await db[collection].create_index("updated_at")
+    await db.asset_requisitions.create_index([("requested_by", 1), ("updated_at", 1)])
+    await db.asset_requisitions.create_index([("manager_id", 1), ("updated_at", 1)])
+    await db.deleted_documents.create_index([("collection", 1), ("deleted_at", 1)])
+    # Requisition list filters and sorts; requisitions used to be stored without a status
+    await db.asset_requisitions.update_many({"status": {"$exists": False}}, {"$set": {"status": RequisitionStatus.PENDING}})
+    # Every sort has id as its tie-breaker, so the sort indexes end in id to avoid in-memory sorts
+    existing_indexes = await db.asset_requisitions.index_information()
+    for superseded in ["requested_by_1_status_1_created_at_-1", "manager_id_1_status_1_created_at_-1",
+                       "status_1_created_at_-1", "asset_type_id_1_created_at_-1",
+                       "assigned_to_1_created_at_-1", "required_by_date_1"]:
+        if superseded in existing_indexes:
+            await db.asset_requisitions.drop_index(superseded)
+    for scope_field in ["requested_by", "manager_id"]:
+        await db.asset_requisitions.create_index([(scope_field, 1), ("created_at", -1), ("id", -1)])
+        await db.asset_requisitions.create_index([(scope_field, 1), ("status", 1), ("created_at", -1), ("id", -1)])
+    await db.asset_requisitions.create_index([("created_at", -1), ("id", -1)])
+    await db.asset_requisitions.create_index([("status", 1), ("created_at", -1), ("id", -1)])
+    await db.asset_requisitions.create_index([("asset_type_id", 1), ("created_at", -1), ("id", -1)])
+    await db.asset_requisitions.create_index([("assigned_to", 1), ("created_at", -1), ("id", -1)])
+    await db.asset_requisitions.create_index([("required_by_date", 1), ("id", 1)])
+    # Requisitions created before the search keys existed
+    await refresh_requisition_search_terms({"search_terms": {"$exists": False}})
+    await db.asset_requisitions.create_index("search_terms")
+    await db.asset_definitions.create_index(
+        [(field, "text") for field in ASSET_SEARCH_TEXT_FIELDS],
+        weights=ASSET_SEARCH_TEXT_FIELDS,
+        name="asset_definitions_text"
+    )
+    await db.deleted_documents.create_index("deleted_at", expireAfterSeconds=DELTA_SYNC_TOMBSTONE_DAYS * 24 * 3600)
+    await db.users.create_index("search_terms")
+    await db.users.create_index("email", collation=EMAIL_COLLATION, name="email_case_insensitive")
+    # Users created before the typeahead keys existed
+    users_without_terms = await db.users.find(
+        {"search_terms": {"$exists": False}}, {"_id": 0, "id": 1, "name": 1, "email": 1}
+    ).to_list(None)
+    if users_without_terms:
+        await db.users.bulk_write([
+            UpdateOne({"id": user["id"]}, {"$set": {"search_terms": user_search_terms(user.get("name"), user.get("email"))}})
+            for user in users_without_terms
+        ])
+    await db.user_hierarchy.create_index([("ancestor_id", 1), ("descendant_id", 1)], unique=True)
+    await db.user_hierarchy.create_index("descendant_id")
+    await db.asset_requisitions.create_index("manager_id")
+    # Build the reporting hierarchy the first time it is needed
+    if not await db.user_hierarchy.find_one({}) and await db.users.find_one({"reporting_manager_id": {"$nin": [None, ""]}}):
+        await rebuild_user_hierarchy()
+    # NDC requests created before recovery counters existed
+    legacy_ndc_ids = await db.ndc_requests.distinct("id", {"pending_count": {"$exists": False}})
+    if legacy_ndc_ids:
+        status_counts = await db.ndc_asset_recovery.aggregate([
+            {"$match": {"ndc_request_id": {"$in": legacy_ndc_ids}}},
+            {"$group": {"_id": {"ndc_request_id": "$ndc_request_id", "status": "$status"}, "count": {"$sum": 1}}}
+        ]).to_list(None)
+        counters = {ndc_id: dict.fromkeys(NDC_RECOVERY_COUNTERS.values(), 0) for ndc_id in legacy_ndc_ids}
+        for status_count in status_counts:
+            counter = NDC_RECOVERY_COUNTERS.get(status_count["_id"]["status"])
+            if counter:
+                counters[status_count["_id"]["ndc_request_id"]][counter] = status_count["count"]
+        await db.ndc_requests.bulk_write([
+            UpdateOne({"id": ndc_id, "pending_count": {"$exists": False}}, {"$set": ndc_counters})
+            for ndc_id, ndc_counters in counters.items()
+        ])
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+    if import_process_pool is not None:
+        import_process_pool.shutdown(cancel_futures=True)
\ No newline at end of file
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark API latency while a large bulk import is running.
+
+Measures GET /api/asset-types latency on its own and while a 50k-row asset definition
+CSV is being imported, and prints p50/p95/p99/max for both phases. Run it against the
+server before and after a change to compare how much the import stalls other requests.
+
+Usage: python bulk_import_latency_benchmark.py [base_url] [rows]
+"""
+
+import requests
+import sys
+import threading
+import time
+import uuid
+
+
+class BulkImportLatencyBenchmark:
+    def __init__(self, base_url="http://localhost:8001", rows=50000):
+        self.base_url = base_url
+        self.api_url = f"{base_url}/api"
+        self.rows = rows
+        self.headers = {}
+
+    def login_admin(self):
+        """Login as administrator"""
+        print("🔐 Logging in as Administrator...")
+        response = requests.post(
+            f"{self.api_url}/auth/login",
+            json={"email": "admin@company.com", "password": "password123"},
+            timeout=10
+        )
+        if response.status_code != 200:
+            print(f"❌ Administrator login failed: {response.status_code}")
+            return False
+        self.headers = {'Authorization': f"Bearer {response.json()['session_token']}"}
+        print("✅ Administrator login successful")
+        return True
+
+    def ensure_asset_type(self):
+        """Create the asset type used by the generated rows if it does not exist"""
+        response = requests.get(f"{self.api_url}/asset-types", headers=self.headers, timeout=10)
+        if any(at["code"] == "BENCH" for at in response.json()):
+            return
+        requests.post(
+            f"{self.api_url}/asset-types",
+            json={"code": "BENCH", "name": "Benchmark Asset", "depreciation_applicable": False},
+            headers=self.headers,
+            timeout=10
+        )
+
+    def build_csv(self):
+        """Generate a CSV with unique asset codes for this run"""
+        run_id = uuid.uuid4().hex[:8]
+        lines = ["asset_type_code,asset_code,asset_description,asset_details,asset_value,status"]
+        lines.extend(
+            f"BENCH,BENCH-{run_id}-{i},Benchmark laptop {i},Dell Latitude 5420 i7 16GB,{50000 + i % 1000},Available"
+            for i in range(self.rows)
+        )
+        return ("\n".join(lines) + "\n").encode()
+
+    def probe(self):
+        """Time a single lightweight API request in milliseconds"""
+        start = time.perf_counter()
+        requests.get(f"{self.api_url}/asset-types", headers=self.headers, timeout=120)
+        return (time.perf_counter() - start) * 1000
+
+    @staticmethod
+    def percentile(samples, pct):
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def report(self, label, samples):
+        print(
+            f"   {label:<16} n={len(samples):<5} "
+            f"p50={self.percentile(samples, 50):8.1f}ms "
+            f"p95={self.percentile(samples, 95):8.1f}ms "
+            f"p99={self.percentile(samples, 99):8.1f}ms "
+            f"max={max(samples):8.1f}ms"
+        )
+
+    def run(self):
+        if not self.login_admin():
+            return False
+        self.ensure_asset_type()
+
+        print("\n🔍 Measuring idle latency...")
+        idle = [self.probe() for _ in range(200)]
+
+        csv_bytes = self.build_csv()
+        print(f"\n🔍 Importing {self.rows} rows ({len(csv_bytes) / 1024 / 1024:.1f} MB) while probing...")
+        import_result = {}
+
+        def do_import():
+            start = time.perf_counter()
+            response = requests.post(
+                f"{self.api_url}/asset-definitions/bulk-import",
+                files={"file": ("benchmark.csv", csv_bytes, "text/csv")},
+                headers=self.headers,
+                timeout=3600
+            )
+            import_result["seconds"] = time.perf_counter() - start
+            import_result["status_code"] = response.status_code
+            import_result["body"] = response.json() if response.status_code == 200 else response.text
+
+        importer = threading.Thread(target=do_import)
+        importer.start()
+        time.sleep(0.2)  # Let the upload start before probing
+        under_import = []
+        while importer.is_alive():
+            under_import.append(self.probe())
+        importer.join()
+
+        print("\n📊 Results")
+        self.report("idle", idle)
+        if under_import:
+            self.report("during import", under_import)
+        body = import_result.get("body")
+        if isinstance(body, dict):
+            print(f"   import took {import_result['seconds']:.1f}s: {body.get('message')}")
+        else:
+            print(f"❌ Import failed ({import_result.get('status_code')}): {body}")
+        return True
+
+
+if __name__ == "__main__":
+    base_url = sys.argv[1] if len(sys.argv) > 1 else "http://localhost:8001"
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    benchmark = BulkImportLatencyBenchmark(base_url, rows)
+    sys.exit(0 if benchmark.run() else 1)
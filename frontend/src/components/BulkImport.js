@@ -23,16 +23,16 @@ const BulkImport = () => {
   const [selectedFile, setSelectedFile] = useState(null);
   const [uploading, setUploading] = useState(false);
   const [importResult, setImportResult] = useState(null);
-  const [uploadProgress, setUploadProgress] = useState(0);
+  const [importJob, setImportJob] = useState(null);
 
   const handleFileSelect = (event) => {
     const file = event.target.files[0];
     if (file) {
-      if (file.name.endsWith('.csv')) {
+      if (file.name.endsWith('.csv') || file.name.endsWith('.xlsx')) {
         setSelectedFile(file);
         setImportResult(null);
       } else {
-        toast.error('Please select a CSV file');
+        toast.error('Please select a CSV or XLSX file');
         event.target.value = '';
       }
     }
@@ -60,6 +60,24 @@ const BulkImport = () => {
     }
   };
 
+  const pollImportJob = (jobId) => new Promise((resolve, reject) => {
+    const poll = async () => {
+      try {
+        const response = await axios.get(`${API}/import-jobs/${jobId}`);
+        const job = response.data;
+        setImportJob(job);
+        if (['Completed', 'Failed', 'Cancelled'].includes(job.status)) {
+          resolve(job);
+        } else {
+          setTimeout(poll, 1500);
+        }
+      } catch (error) {
+        reject(error);
+      }
+    };
+    poll();
+  });
+
   const handleUpload = async () => {
     if (!selectedFile) {
       toast.error('Please select a file to upload');
@@ -67,36 +85,31 @@ const BulkImport = () => {
     }
 
     setUploading(true);
-    setUploadProgress(0);
+    setImportJob(null);
     
     const formData = new FormData();
     formData.append('file', selectedFile);
 
     try {
-      // Simulate progress updates
-      const progressInterval = setInterval(() => {
-        setUploadProgress(prev => {
-          if (prev >= 90) {
-            clearInterval(progressInterval);
-            return prev;
-          }
-          return prev + 10;
-        });
-      }, 200);
-
+      // The import runs as a background job on the server; poll it for progress
       const response = await axios.post(`${API}/asset-definitions/bulk-import`, formData, {
         headers: {
           'Content-Type': 'multipart/form-data',
         },
+        params: { run_in_background: true },
       });
 
-      clearInterval(progressInterval);
-      setUploadProgress(100);
+      setImportJob(response.data);
+      const job = await pollImportJob(response.data.id);
       
-      setImportResult(response.data);
+      setImportResult(job);
       
-      if (response.data.success) {
-        toast.success(`Import completed! ${response.data.successful_imports} assets imported successfully.`);
+      if (job.status === 'Failed') {
+        toast.error(job.message || 'Import failed');
+      } else if (job.status === 'Cancelled') {
+        toast.info(job.message);
+      } else if (job.success) {
+        toast.success(`Import completed! ${job.successful_imports} assets imported successfully.`);
       } else {
         toast.error('Import completed with errors. Please check the results below.');
       }
@@ -112,7 +125,18 @@ const BulkImport = () => {
       setImportResult(null);
     } finally {
       setUploading(false);
-      setUploadProgress(0);
+      setImportJob(null);
+    }
+  };
+
+  const handleCancel = async () => {
+    if (!importJob) return;
+    try {
+      await axios.post(`${API}/import-jobs/${importJob.id}/cancel`);
+      toast.info('Cancelling import...');
+    } catch (error) {
+      console.error('Error cancelling import:', error);
+      toast.error(error.response?.data?.detail || 'Failed to cancel import');
     }
   };
 
@@ -198,15 +222,15 @@ const BulkImport = () => {
       {/* File Upload */}
       <Card>
         <CardHeader>
-          <CardTitle>Step 2: Upload Your CSV File</CardTitle>
+          <CardTitle>Step 2: Upload Your CSV or XLSX File</CardTitle>
         </CardHeader>
         <CardContent className="space-y-4">
           <div>
-            <Label htmlFor="file-upload">Choose CSV File</Label>
+            <Label htmlFor="file-upload">Choose CSV or XLSX File</Label>
             <Input
               id="file-upload"
               type="file"
-              accept=".csv"
+              accept=".csv,.xlsx"
               onChange={handleFileSelect}
               className="mt-1"
             />
@@ -245,11 +269,19 @@ const BulkImport = () => {
 
           {uploading && (
             <div className="space-y-2">
-              <div className="flex justify-between text-sm text-gray-600">
-                <span>Uploading and processing...</span>
-                <span>{uploadProgress}%</span>
+              <div className="flex justify-between items-center text-sm text-gray-600">
+                <span>
+                  {importJob
+                    ? `${importJob.status}: ${importJob.total_rows} rows processed (${importJob.successful_imports} imported, ${importJob.failed_imports} failed)`
+                    : 'Uploading...'}
+                </span>
+                {importJob && !importJob.cancel_requested && (
+                  <Button onClick={handleCancel} variant="outline" size="sm">
+                    Cancel Import
+                  </Button>
+                )}
               </div>
-              <Progress value={uploadProgress} className="w-full" />
+              <Progress value={100} className="w-full animate-pulse" />
             </div>
           )}
         </CardContent>
@@ -266,6 +266,62 @@ class NDCFocusedTester:
             print(f"   ❌ Backend still cannot detect allocated assets")
             return False
 
+    def test_ndc_recovery_remark(self):
+        """Test re-marking a recovery keeps the asset in step with the recovery row"""
+        print(f"\n🔁 Testing NDC Recovery Re-mark")
+        
+        ndc_request_id = self.test_data.get('ndc_request_id')
+        if not ndc_request_id:
+            print("❌ No NDC request available for re-mark test")
+            return False
+        
+        success, assets_response = self.run_test(
+            "Get Asset Recovery Records",
+            "GET",
+            f"ndc-requests/{ndc_request_id}/assets",
+            200,
+            user_role="Administrator"
+        )
+        if not success or not assets_response:
+            return False
+        
+        recovery = assets_response[0]
+        # Recovered -> Not Recovered -> Recovered (Damaged); the asset must follow every step
+        for recovery_update, expected_status, expect_employee in [
+            ({"recovered": True, "asset_condition": "Good"}, "Available", False),
+            ({"recovered": False, "asset_condition": "Lost"}, "Lost", True),
+            ({"recovered": True, "asset_condition": "Damaged"}, "Damaged", False)
+        ]:
+            success, response = self.run_test(
+                f"Mark Recovery {'Recovered' if recovery_update['recovered'] else 'Not Recovered'} ({recovery_update['asset_condition']})",
+                "PUT",
+                f"ndc-asset-recovery/{recovery['id']}",
+                200,
+                data=recovery_update,
+                user_role="Administrator"
+            )
+            if not success:
+                return False
+            
+            success, asset = self.run_test(
+                "Verify Asset Follows Recovery",
+                "GET",
+                f"asset-definitions/{recovery['asset_definition_id']}",
+                200,
+                user_role="Administrator"
+            )
+            if not success:
+                return False
+            
+            allocated_to = asset.get('allocated_to')
+            print(f"   Asset status: {asset.get('status')}, allocated_to: {allocated_to}")
+            if asset.get('status') != expected_status or bool(allocated_to) != expect_employee:
+                print(f"   ❌ Asset did not follow the re-mark (expected {expected_status})")
+                return False
+        
+        print(f"   ✅ Asset followed every recovery re-mark")
+        return True
+
     def test_ndc_edge_cases(self):
         """Test NDC Edge Cases"""
         print(f"\n⚠️ Testing NDC Edge Cases")
@@ -383,6 +439,10 @@ class NDCFocusedTester:
         print("-" * 40)
         bug_fix_success = self.test_ndc_critical_bug_fix()
         
+        print(f"\n🔁 RECOVERY RE-MARK TESTING")
+        print("-" * 30)
+        self.test_ndc_recovery_remark()
+        
         print(f"\n⚠️ EDGE CASES TESTING")
         print("-" * 25)
         edge_cases_success = self.test_ndc_edge_cases()